@@ -0,0 +1,318 @@
+"""
+Benchmarks for django-managerie's discovery, admin index augmentation, form building and execution overhead.
+
+A synthetic project with many apps and commands is generated into a temporary directory,
+and the results are written as JSON, e.g.
+
+    python benchmarks/bench_managerie.py --apps 300 --commands-per-app 10 --output before.json
+    python benchmarks/bench_managerie.py --apps 300 --commands-per-app 10 --compare before.json
+
+This is not part of the test suite.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, cast
+
+# Benchmark the working tree's django_managerie (even if another version is installed).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NOOP_COMMAND = """
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Does nothing (app {app_index}, command {command_index})."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flag", action="store_true")
+        parser.add_argument("--count", type=int, default=1)
+        parser.add_argument("--name", default="nothing")
+
+    def handle(self, **options):
+        pass
+"""
+
+CHOICES_COMMAND = """
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Has an option with a huge number of choices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--choice", choices=[f"choice-{{i}}" for i in range({n_choices})], default="choice-0")
+
+    def handle(self, **options):
+        pass
+"""
+
+OUTPUT_COMMAND = """
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Writes a lot of output."
+
+    def handle(self, **options):
+        line = "x" * 99
+        for _ in range({n_output_lines}):
+            self.stdout.write(line)
+"""
+
+URLS_MODULE = """
+from django.contrib import admin
+from django.urls import path
+
+from django_managerie import Managerie
+
+managerie = Managerie(admin.site)
+managerie.patch()
+
+urlpatterns = [path("admin/", admin.site.urls)]
+"""
+
+
+def _write(path: str, content: str = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def generate_project(
+    root: str,
+    *,
+    n_apps: int,
+    commands_per_app: int,
+    n_choices: int,
+    n_output_lines: int,
+) -> List[str]:
+    """
+    Generate the synthetic apps into `root`; return their module names.
+
+    The first app also gets the `bench_choices` and `bench_output` commands.
+    """
+    app_names = []
+    for app_index in range(n_apps):
+        app_name = f"bench_app_{app_index:04d}"
+        app_names.append(app_name)
+        commands_dir = os.path.join(root, app_name, "management", "commands")
+        for init_dir in (os.path.join(root, app_name), os.path.join(root, app_name, "management"), commands_dir):
+            _write(os.path.join(init_dir, "__init__.py"))
+        for command_index in range(commands_per_app):
+            content = NOOP_COMMAND.format(app_index=app_index, command_index=command_index)
+            _write(os.path.join(commands_dir, f"bench_noop_{command_index:03d}.py"), content)
+    commands_dir = os.path.join(root, app_names[0], "management", "commands")
+    _write(os.path.join(commands_dir, "bench_choices.py"), CHOICES_COMMAND.format(n_choices=n_choices))
+    _write(os.path.join(commands_dir, "bench_output.py"), OUTPUT_COMMAND.format(n_output_lines=n_output_lines))
+    _write(os.path.join(root, "bench_urls.py"), URLS_MODULE)
+    return app_names
+
+
+def setup_django(app_names: List[str]) -> None:
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY="benchmark",
+        ALLOWED_HOSTS=["*"],
+        INSTALLED_APPS=[
+            "django.contrib.admin",
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django.contrib.messages",
+            "django_managerie",
+            *app_names,
+        ],
+        ROOT_URLCONF="bench_urls",
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "APP_DIRS": True,
+                "OPTIONS": {
+                    "context_processors": [
+                        "django.template.context_processors.request",
+                        "django.contrib.auth.context_processors.auth",
+                    ],
+                },
+            },
+        ],
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+def measure(func: Callable[[], Any], *, rounds: int, setup: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """
+    Time `func` (after calling `setup`, untimed) `rounds` times; return statistics in seconds.
+    """
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    return {
+        "rounds": rounds,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+    }
+
+
+def run_benchmarks(app_names: List[str], *, rounds: int) -> Dict[str, Dict[str, Any]]:
+    import bench_urls  # type: ignore[import-not-found]
+    from django.apps import apps
+    from django.contrib.auth.models import User
+    from django.http import HttpRequest
+    from django.template.response import TemplateResponse
+    from django.test import RequestFactory
+
+    from django_managerie import Managerie
+    from django_managerie.commands import discovery, get_commands
+    from django_managerie.forms import ArgumentParserForm, get_command_schema, schema_cache
+    from django_managerie.views import ManagerieCommandView
+
+    managerie: Managerie = bench_urls.managerie
+
+    class StaticManagerie(Managerie):
+        static_discovery = True
+
+    static_managerie = StaticManagerie(managerie.admin_site)
+    request_factory = RequestFactory()
+    user = User(username="bench", is_active=True, is_staff=True, is_superuser=True)
+
+    def make_request(method: str = "get", path: str = "/", data: Optional[Dict[str, Any]] = None) -> HttpRequest:
+        request = getattr(request_factory, method)(path, data or {})
+        request.user = user
+        request._dont_enforce_csrf_checks = True
+        return request
+
+    results = {}
+    results["get_commands_cold"] = measure(get_commands, setup=discovery.invalidate, rounds=rounds)
+    results["get_commands_check"] = measure(
+        get_commands,
+        setup=lambda: setattr(discovery, "_last_check", 0),
+        rounds=rounds,
+    )
+    results["get_commands_warm"] = measure(get_commands, rounds=rounds)
+    results["registry_build"] = measure(managerie.registry.rebuild, rounds=rounds)
+    results["registry_build_static"] = measure(static_managerie.registry.rebuild, rounds=rounds)
+
+    app_list: List[Dict[str, Any]] = [
+        {"app_label": app_config.label, "name": app_config.verbose_name, "models": []}
+        for app_config in apps.get_app_configs()
+    ]
+    request = make_request()
+    results["augment_app_list"] = measure(
+        lambda: managerie._augment_app_list(request, [dict(app, models=[]) for app in app_list]),
+        rounds=rounds,
+    )
+
+    choices_command = managerie.registry.entries[f"{app_names[0]}.bench_choices"].command
+    results["form_build_choices_cold"] = measure(
+        lambda: ArgumentParserForm(schema=get_command_schema(choices_command)),
+        setup=schema_cache.invalidate,
+        rounds=rounds,
+    )
+    results["form_build_choices_warm"] = measure(
+        lambda: ArgumentParserForm(schema=get_command_schema(choices_command)),
+        rounds=rounds,
+    )
+
+    view = ManagerieCommandView.as_view(managerie=managerie)
+
+    def post_command(command_name: str, data: Dict[str, Any]) -> None:
+        path = f"/admin/managerie/{app_names[0]}/{command_name}/"
+        request = make_request("post", path, {"skip_checks": "on", **data})
+        response = cast(TemplateResponse, view(request, app_label=app_names[0], command=command_name))
+        response.render()
+        assert response.status_code == 200, response.content
+
+    results["execute_noop"] = measure(
+        lambda: post_command("bench_noop_000", {"count": "1", "name": "x"}),
+        rounds=rounds,
+    )
+    results["execute_large_output"] = measure(lambda: post_command("bench_output", {}), rounds=rounds)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<28} {'baseline':>12} {'current':>12} {'ratio':>8}", file=sys.stderr)
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["median"], stats["median"]
+        ratio = after / before if before else float("inf")
+        print(f"{name:<28} {before * 1000:>10.3f}ms {after * 1000:>10.3f}ms {ratio:>7.2f}x", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=200, help="Number of synthetic apps")
+    parser.add_argument("--commands-per-app", type=int, default=10, help="Number of no-op commands per app")
+    parser.add_argument("--choices", type=int, default=10000, help="Number of choices for the choices command")
+    parser.add_argument("--output-lines", type=int, default=20000, help="Lines written by the output command")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of timed rounds per benchmark")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="Compare the results against a previous JSON results file")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="managerie-bench-")
+    try:
+        app_names = generate_project(
+            root,
+            n_apps=args.apps,
+            commands_per_app=args.commands_per_app,
+            n_choices=args.choices,
+            n_output_lines=args.output_lines,
+        )
+        sys.path.insert(0, root)
+        setup_django(app_names)
+        results = run_benchmarks(app_names, rounds=args.rounds)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    import django
+
+    import django_managerie
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "django_managerie": django_managerie.__version__,
+            "platform": platform.platform(),
+        },
+        "parameters": {
+            "apps": args.apps,
+            "commands_per_app": args.commands_per_app,
+            "choices": args.choices,
+            "output_lines": args.output_lines,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
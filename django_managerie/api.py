@@ -0,0 +1,441 @@
+import functools
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from django import forms
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views import View
+
+from django_managerie.commands import ManagementCommand
+from django_managerie.concurrency import ConcurrencyLimitReached
+from django_managerie.execution import ExecutionResult, prepare_execution
+from django_managerie.forms import ArgumentParserForm, FormSchema, get_command_schema
+from django_managerie.jobs import Job, JobQueueFull
+from django_managerie.streaming import format_ndjson, stream_command_output
+from django_managerie.views import ManagerieBaseMixin, StaffRequiredMixin, get_artifact_url, get_job_for_request
+
+FIELD_TYPES = {
+    forms.BooleanField: "boolean",
+    forms.IntegerField: "integer",
+    forms.FloatField: "number",
+    forms.ChoiceField: "choice",
+}
+
+
+class LenientJSONEncoder(DjangoJSONEncoder):
+    """
+    A JSON encoder that stringifies values it doesn't otherwise know how to encode (e.g. argument defaults).
+    """
+
+    def default(self, o: Any) -> Any:
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+class APIError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def get_options_form(command: ManagementCommand, options: Dict[str, Any]) -> ArgumentParserForm:
+    """
+    Get a bound form for validating the given options (as in the command's HTML form) for the command.
+
+    Options not given default to the argument parser's defaults.
+    """
+    schema = get_command_schema(command)
+    data = {spec.name: spec.field_kwargs.get("initial") for spec in schema}
+    data = {name: value for (name, value) in data.items() if value is not None}
+    data.update(options)
+    return ArgumentParserForm(schema=schema, data=data)
+
+
+def get_result_json(result: ExecutionResult) -> Dict[str, Any]:
+    return {
+        "status": result.status,
+        "duration": result.duration,
+        "exit_code": result.exit_code,
+        "error": (str(result.error) if result.error else None),
+        "error_tb": result.error_tb,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "stdout_log_url": get_artifact_url(result.stdout_log),
+        "stderr_log_url": get_artifact_url(result.stderr_log),
+    }
+
+
+def get_schema_json(command: ManagementCommand, schema: FormSchema) -> Dict[str, Any]:
+    """
+    Describe the command's arguments (as derived for `ArgumentParserForm`) as JSON-serializable data.
+    """
+    command_class = command.get_command_class()
+    arguments = []
+    for spec in schema:
+        kwargs = spec.field_kwargs
+        arguments.append(
+            {
+                "name": spec.name,
+                "type": FIELD_TYPES.get(spec.field_class, "string"),
+                "label": kwargs.get("label"),
+                "help": kwargs.get("help_text"),
+                "required": bool(kwargs.get("required")),
+                "default": kwargs.get("initial"),
+                "choices": ([value for (value, _) in kwargs["choices"]] if "choices" in kwargs else None),
+            },
+        )
+    return {
+        "command": command.full_name,
+        "title": command.full_title,
+        "help": command_class.help,
+        "accepts_stdin": bool(getattr(command_class, "managerie_accepts_stdin", False)),
+        "arguments": arguments,
+    }
+
+
+def parse_json_body(request: HttpRequest) -> Dict[str, Any]:
+    try:
+        data = json.loads(request.body)
+    except ValueError as ve:
+        raise APIError(f"Invalid JSON: {ve}") from ve
+    if not isinstance(data, dict):
+        raise APIError("Expected a JSON object")
+    return data
+
+
+class ManagerieAPIMixin(ManagerieBaseMixin):
+    def dispatch(self, request: HttpRequest, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+        except APIError as ae:
+            return JsonResponse({"error": str(ae)}, status=ae.status)
+
+    def get_allowed_command(self, full_name: str) -> ManagementCommand:
+        """
+        Get a command by full name (`app_label.command_name`), if it's allowed for the request.
+        """
+        assert self.managerie
+        app_label, _, command_name = str(full_name).rpartition(".")
+        command = self.managerie.get_commands_for_app_label(request=self.request, app_label=app_label).get(
+            command_name,
+        )
+        if not command:
+            raise APIError(f"Command {full_name} not found (or you don't have permission to run it)", status=404)
+        return command
+
+    def get_url_command(self) -> ManagementCommand:
+        return self.get_allowed_command(f"{self.kwargs['app_label']}.{self.kwargs['command']}")
+
+
+class ManagerieAPIListView(ManagerieAPIMixin, StaffRequiredMixin, View):
+    """
+    List the commands allowed for the request.
+    """
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        commands = [
+            {
+                "command": command.full_name,
+                "app_label": app_config.label,
+                "name": command.name,
+                "title": command.full_title,
+                "schema_url": self._reverse("managerie_api_schema", command),
+                "execute_url": self._reverse("managerie_api_execute", command),
+            }
+            for (app_config, app_commands) in self.get_command_map().items()
+            for command in app_commands.values()
+        ]
+        return JsonResponse({"commands": sorted(commands, key=lambda c: c["command"])})
+
+    def _reverse(self, url_name: str, command: ManagementCommand) -> str:
+        assert self.managerie
+        return reverse(
+            f"admin:{url_name}",
+            kwargs={"app_label": command.app_config.label, "command": command.name},
+            current_app=self.managerie.admin_site.name,
+        )
+
+
+class ManagerieAPISchemaView(ManagerieAPIMixin, StaffRequiredMixin, View):
+    """
+    Describe a command's arguments.
+
+    The response has `ETag` and `Last-Modified` (the command module's modification time) headers,
+    and conditional requests are answered with 304 Not Modified.
+    """
+
+    def get(self, request: HttpRequest, app_label: str, command: str) -> HttpResponseBase:
+        command_obj = self.get_url_command()
+        content = json.dumps(get_schema_json(command_obj, get_command_schema(command_obj)), cls=LenientJSONEncoder)
+        etag = quote_etag(hashlib.sha1(content.encode()).hexdigest())
+        last_modified = self._get_last_modified(command_obj)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        response = not_modified or HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def _get_last_modified(self, command: ManagementCommand) -> Optional[int]:
+        try:
+            return int(os.path.getmtime(command.source_path))
+        except OSError:
+            return None
+
+
+class ManagerieAPIJobView(ManagerieAPIMixin, StaffRequiredMixin, View):
+    """
+    Get a background job's status and progress, and its output after the offsets (in characters)
+    given as `stdout_offset` and/or `stderr_offset` query parameters.
+
+    Without offsets, no output is read, which makes polling the status cheap.
+
+    DELETE cancels the job (see `JobManager.cancel`).
+    """
+
+    def get_job(self) -> Job:
+        assert self.managerie
+        job = get_job_for_request(self.managerie, self.request, self.kwargs["job_id"])
+        if not job:
+            raise APIError("Job not found", status=404)
+        return job
+
+    def delete(self, request: HttpRequest, job_id: str) -> JsonResponse:
+        assert self.managerie
+        job = self.get_job()
+        if not self.managerie.jobs.cancel(job):
+            raise APIError("The job has already finished", status=409)
+        return JsonResponse({"id": job.id, "status": job.status, "cancel_requested": True}, status=202)
+
+    def get(self, request: HttpRequest, job_id: str) -> JsonResponse:
+        managerie = self.managerie
+        assert managerie
+        job = self.get_job()
+        data: Dict[str, Any] = {
+            "id": job.id,
+            "command": job.command.full_name,
+            "status": job.status,
+            "finished": job.is_finished,
+            "duration": job.duration,
+        }
+        progress = managerie.jobs.get_progress(job)
+        data["progress"] = progress.to_json() if progress else None
+        for stream in ("stdout", "stderr"):
+            offset_param = request.GET.get(f"{stream}_offset")
+            if offset_param is None:
+                continue
+            try:
+                offset = max(0, int(offset_param))
+            except ValueError as ve:
+                raise APIError(f"Invalid {stream}_offset") from ve
+            output, new_offset = managerie.jobs.read_output(job, stream, offset)
+            data[stream] = {"data": output, "offset": new_offset}
+        if job.is_finished and job.result:
+            data["error"] = str(job.result.error) if job.result.error else None
+            data["exit_code"] = job.result.exit_code
+        return JsonResponse(data)
+
+
+class ManagerieAPIExecuteView(ManagerieAPIMixin, StaffRequiredMixin, View):
+    """
+    Execute a command, and return its result as JSON.
+
+    The request body is a JSON object with
+
+    * `options`: the command's options, as they would be submitted in its form,
+    * `stdin` (optional): text to pass as standard input (for commands that accept it), and
+    * `stream` (optional): whether to stream output as newline-delimited JSON objects while it's written.
+
+    Commands that run in the background are submitted as jobs; the response (202 Accepted) has the job's ID.
+    """
+
+    def post(self, request: HttpRequest, app_label: str, command: str) -> HttpResponseBase:
+        managerie = self.managerie
+        assert managerie
+        command_obj = self.get_url_command()
+        data = parse_json_body(request)
+        options = data.get("options") or {}
+        if not isinstance(options, dict):
+            raise APIError("`options` must be an object")
+        form = get_options_form(command_obj, options)
+        if not form.is_valid():
+            return JsonResponse({"status": "invalid", "errors": form.errors.get_json_data()}, status=400)
+        cleaned_data = dict(form.cleaned_data)
+        if data.get("stdin") and getattr(command_obj.get_command_class(), "managerie_accepts_stdin", False):
+            cleaned_data["_managerie_stdin_content"] = str(data["stdin"])
+        args, options, stdin_binary = prepare_execution(
+            cleaned_data,
+            stdin_encoding=managerie.get_stdin_encoding(command_obj),
+        )
+        if managerie.should_run_in_background(command_obj):
+            try:
+                job = managerie.jobs.submit(
+                    command_obj,
+                    args=args,
+                    options=options,
+                    stdin_binary=stdin_binary,
+                    request=request,
+                )
+            except JobQueueFull as jqf:
+                raise APIError(str(jqf), status=503) from jqf
+            job_url = reverse(
+                "admin:managerie_api_job",
+                kwargs={"job_id": job.id},
+                current_app=managerie.admin_site.name,
+            )
+            return JsonResponse({"status": job.status, "job_id": job.id, "job_url": job_url}, status=202)
+        if data.get("stream") and not managerie.should_isolate(command_obj):
+            items = stream_command_output(
+                command_obj,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=request,
+                on_result=functools.partial(self._finish_streamed_run, command_obj, options),
+                execute=managerie.execute_streamed,
+            )
+            response = StreamingHttpResponse(format_ndjson(items), content_type="application/x-ndjson")
+            response["X-Accel-Buffering"] = "no"
+            return response
+        try:
+            result = managerie.execute(
+                command_obj,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=request,
+            )
+        except ConcurrencyLimitReached as clr:
+            raise APIError(str(clr), status=429) from clr
+        return JsonResponse(
+            {"command": command_obj.full_name, **get_result_json(result)},
+            status=(400 if result.error else 200),
+        )
+
+    def _finish_streamed_run(
+        self,
+        command: ManagementCommand,
+        options: Dict[str, Any],
+        result: ExecutionResult,
+    ) -> None:
+        assert self.managerie
+        self.managerie.on_run_finished(command, options=options, result=result, request=self.request)
+
+
+@dataclass
+class BatchItem:
+    index: int
+    command: ManagementCommand
+    form: ArgumentParserForm
+
+
+class ManagerieBatchView(ManagerieAPIMixin, StaffRequiredMixin, View):
+    """
+    Run many commands (or one command with many sets of options) in one request, in parallel.
+
+    The request body is a JSON object with either
+
+    * `items`: a list of `{"command": "app_label.command_name", "options": {...}}` objects, or
+    * `command` and `option_sets`: a command name and a list of options objects,
+
+    and optionally `parallelism` (limited by `Managerie.batch_max_parallelism`).
+
+    Options are given as they would be submitted in the command's form, and are validated the same way;
+    if any item is invalid, nothing is run.
+    """
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        managerie = self.managerie
+        assert managerie
+        data = parse_json_body(request)
+        raw_items = self._get_raw_items(data)
+        if len(raw_items) > managerie.batch_max_items:
+            raise APIError(f"Too many items (the maximum is {managerie.batch_max_items})")
+        try:
+            parallelism = max(1, min(int(data.get("parallelism", 1)), managerie.batch_max_parallelism))
+        except (TypeError, ValueError) as exc:
+            raise APIError("Invalid parallelism") from exc
+
+        items = []
+        for index, (full_name, options) in enumerate(raw_items):
+            command = self.get_allowed_command(full_name)
+            items.append(BatchItem(index=index, command=command, form=get_options_form(command, options)))
+        invalid = [item for item in items if not item.form.is_valid()]
+        if invalid:
+            return JsonResponse(
+                {
+                    "status": "invalid",
+                    "items": [
+                        {
+                            "index": item.index,
+                            "command": item.command.full_name,
+                            "errors": item.form.errors.get_json_data(),
+                        }
+                        for item in invalid
+                    ],
+                },
+                status=400,
+            )
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="managerie-batch") as executor:
+            results = list(executor.map(self._run_item, items))
+        return JsonResponse(
+            {
+                "status": ("succeeded" if all(result.succeeded for result in results) else "failed"),
+                "duration": time.perf_counter() - t0,
+                "items": [
+                    {"index": item.index, "command": item.command.full_name, **get_result_json(result)}
+                    for (item, result) in zip(items, results)
+                ],
+            },
+        )
+
+    def _get_raw_items(self, data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        if "items" in data:
+            raw_items = data["items"]
+            if not isinstance(raw_items, list) or not all(isinstance(item, dict) for item in raw_items):
+                raise APIError("`items` must be a list of objects")
+            pairs = [(item.get("command"), item.get("options") or {}) for item in raw_items]
+        elif "command" in data and "option_sets" in data:
+            if not isinstance(data["option_sets"], list):
+                raise APIError("`option_sets` must be a list of objects")
+            pairs = [(data["command"], options) for options in data["option_sets"]]
+        else:
+            raise APIError("Either `items`, or `command` and `option_sets` are required")
+        if not all(isinstance(name, str) and isinstance(options, dict) for (name, options) in pairs):
+            raise APIError("Each item must have a command name and an options object")
+        return pairs
+
+    def _run_item(self, item: BatchItem) -> ExecutionResult:
+        managerie = self.managerie
+        assert managerie
+        args, options, stdin_binary = prepare_execution(item.form.cleaned_data)
+        # Pool threads aren't covered by Django's request lifecycle signals.
+        close_old_connections()
+        try:
+            return managerie.execute(
+                item.command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=self.request,
+            )
+        except ConcurrencyLimitReached as clr:
+            return ExecutionResult(stdout="", stderr="", duration=0, error=clr)
+        finally:
+            close_old_connections()
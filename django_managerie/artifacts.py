@@ -0,0 +1,63 @@
+import os
+import re
+import time
+import uuid
+from typing import IO, Optional, Tuple
+
+from django_managerie.runtime_dir import create_private_file, get_runtime_dir
+
+#: Artifacts older than this (in seconds) are deleted when new artifacts are created.
+ARTIFACT_MAX_AGE = 24 * 60 * 60
+
+ARTIFACT_NAME_RE = re.compile(r"^[0-9a-f]{32}\.(log|prof)$")
+
+_last_prune = 0.0
+
+
+def get_artifact_dir() -> str:
+    """
+    Get the directory artifacts (e.g. full output logs) are stored in, as files named by a random token.
+
+    Since the name is all that's needed to find an artifact, they can be shared between processes.
+    The directory is private to the current user (see `get_runtime_dir`).
+    """
+    return get_runtime_dir("artifacts")
+
+
+def prune_artifacts(max_age: float = ARTIFACT_MAX_AGE) -> None:
+    """
+    Delete artifacts older than `max_age` seconds.
+    """
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(get_artifact_dir()))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if ARTIFACT_NAME_RE.match(entry.name) and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except FileNotFoundError:  # Pruned by someone else
+            pass
+
+
+def create_artifact(extension: str, mode: str = "w+b", **kwargs) -> Tuple[str, IO]:
+    """
+    Create a new artifact file; return its name and the open file.
+    """
+    global _last_prune
+    if time.time() - _last_prune > 60:
+        _last_prune = time.time()
+        prune_artifacts()
+    name = f"{uuid.uuid4().hex}.{extension}"
+    return (name, create_private_file(os.path.join(get_artifact_dir(), name), mode, **kwargs))
+
+
+def get_artifact_path(name: str) -> Optional[str]:
+    """
+    Get the path of an existing artifact, or None if the name is invalid or the artifact doesn't exist.
+    """
+    if not ARTIFACT_NAME_RE.match(name):
+        return None
+    path = os.path.join(get_artifact_dir(), name)
+    return path if os.path.isfile(path) else None
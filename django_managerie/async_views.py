@@ -0,0 +1,114 @@
+import asyncio
+import functools
+from typing import Any, AsyncIterator, Iterator, Optional, cast
+
+from django.db import close_old_connections
+from django.http import HttpRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+
+from django_managerie.api import (
+    ManagerieAPIExecuteView,
+    ManagerieAPIJobView,
+    ManagerieAPIListView,
+    ManagerieAPISchemaView,
+    ManagerieBatchView,
+)
+from django_managerie.managerie import Managerie
+from django_managerie.views import ManagerieCommandView, ManagerieJobView, ManagerieListView
+
+_EXHAUSTED = object()
+
+
+def _call_with_fresh_connections(func, *args, **kwargs):
+    # Executor threads aren't covered by Django's request lifecycle signals,
+    # so we need to take care of stale/expired database connections ourselves.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_managerie_executor(managerie: Managerie, func, *args, **kwargs) -> Any:
+    """
+    Run a synchronous function in the Managerie's async executor, without blocking the event loop
+    (or the thread shared by Django's thread-sensitive sync views).
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(_call_with_fresh_connections, func, *args, **kwargs)
+    return await loop.run_in_executor(managerie.async_executor, call)
+
+
+async def _iterate_in_executor(managerie: Managerie, iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    while (chunk := await run_in_managerie_executor(managerie, next, iterator, _EXHAUSTED)) is not _EXHAUSTED:
+        yield chunk
+
+
+class AsyncManagerieViewMixin:
+    """
+    Makes a Managerie view natively asynchronous.
+
+    The synchronous view logic (permission checks, command discovery, form handling and command execution)
+    runs in the Managerie's async executor, so a slow command doesn't block the event loop or the
+    thread shared by the other (synchronous) views of the site.
+    """
+
+    managerie: Optional[Managerie]
+    view_is_async = True
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:  # type: ignore[override]
+        managerie = self.managerie
+        assert managerie
+        response = await run_in_managerie_executor(
+            managerie,
+            super().dispatch,  # type: ignore[misc]
+            request,
+            *args,
+            **kwargs,
+        )
+        if asyncio.iscoroutine(response):  # e.g. `View.options()` for async views
+            response = await response
+        if isinstance(response, StreamingHttpResponse) and not response.is_async:
+            # Avoid Django having to consume the whole synchronous iterator before serving it.
+            response.streaming_content = _iterate_in_executor(
+                managerie,
+                cast(Iterator[bytes], response.streaming_content),
+            )
+        return response
+
+
+class AsyncManagerieListView(AsyncManagerieViewMixin, ManagerieListView):  # type: ignore[misc]
+    pass
+
+
+class AsyncManagerieCommandView(AsyncManagerieViewMixin, ManagerieCommandView):  # type: ignore[misc]
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:  # type: ignore[override]
+        return await super().dispatch(request, *args, **kwargs)
+
+    # Like `ManagerieCommandView.dispatch`, which (run in the executor) applies CSRF protection itself,
+    # after changing the upload handlers.
+    dispatch.csrf_exempt = True  # type: ignore[attr-defined]
+
+
+class AsyncManagerieJobView(AsyncManagerieViewMixin, ManagerieJobView):  # type: ignore[misc]
+    pass
+
+
+class AsyncManagerieBatchView(AsyncManagerieViewMixin, ManagerieBatchView):  # type: ignore[misc]
+    pass
+
+
+class AsyncManagerieAPIJobView(AsyncManagerieViewMixin, ManagerieAPIJobView):  # type: ignore[misc]
+    pass
+
+
+class AsyncManagerieAPIListView(AsyncManagerieViewMixin, ManagerieAPIListView):  # type: ignore[misc]
+    pass
+
+
+class AsyncManagerieAPISchemaView(AsyncManagerieViewMixin, ManagerieAPISchemaView):  # type: ignore[misc]
+    pass
+
+
+class AsyncManagerieAPIExecuteView(AsyncManagerieViewMixin, ManagerieAPIExecuteView):  # type: ignore[misc]
+    pass
@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from django.core.management import BaseCommand
+
+
+class RunCancelled(Exception):
+    """
+    Raised (e.g. by `check_cancelled`) to stop a command run that has been cancelled.
+    """
+
+    def __init__(self, message: str = "The run was cancelled") -> None:
+        super().__init__(message)
+
+
+class CancelFlag:
+    """
+    A flag that is set when a command run is cancelled.
+
+    Commands run by Managerie have one as `self._managerie_cancel`; long-running commands should check it
+    every now and then with `is_cancelled(self)` or `check_cancelled(self)`.
+
+    If `poll` is given, it's called (at most every `poll_interval` seconds) to check whether cancellation
+    has been requested elsewhere (e.g. by another process).
+    """
+
+    def __init__(self, poll: Optional[Callable[[], bool]] = None, poll_interval: float = 1.0) -> None:
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self._event = threading.Event()
+        self._last_poll = time.monotonic()
+
+    def set(self) -> None:
+        self._event.set()
+
+    def is_set(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.poll and time.monotonic() - self._last_poll >= self.poll_interval:
+            self._last_poll = time.monotonic()
+            if self.poll():
+                self._event.set()
+        return self._event.is_set()
+
+
+def is_cancelled(command: BaseCommand) -> bool:
+    """
+    Return True if the command's run (under Managerie) has been cancelled.
+
+    Outside Managerie, this is always False.
+    """
+    flag = getattr(command, "_managerie_cancel", None)
+    return bool(flag and flag.is_set())
+
+
+def check_cancelled(command: BaseCommand) -> None:
+    """
+    Raise `RunCancelled` if the command's run (under Managerie) has been cancelled.
+    """
+    if is_cancelled(command):
+        raise RunCancelled()
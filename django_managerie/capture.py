@@ -0,0 +1,103 @@
+import io
+from collections import deque
+from dataclasses import dataclass
+from typing import IO, Deque, Optional
+
+from django_managerie.artifacts import create_artifact
+
+
+@dataclass(frozen=True)
+class OutputLimits:
+    """
+    How much of a command's output (in characters) to keep in memory.
+    """
+
+    head_size: int = 64 * 1024
+    tail_size: int = 64 * 1024
+
+
+class BoundedCapture(io.TextIOBase):
+    """
+    A write-only text stream that keeps only the first `head_size` and the last `tail_size` characters
+    written to it in memory.
+
+    Once the output exceeds that, all of it is also spilled to an artifact file (see `log_name`),
+    so the complete output can still be downloaded.
+    """
+
+    def __init__(self, limits: OutputLimits) -> None:
+        super().__init__()
+        self.limits = limits
+        self.size = 0
+        self._head = io.StringIO()
+        self._head_size = 0
+        self._tail: Deque[str] = deque()
+        self._tail_size = 0
+        self.log_name: Optional[str] = None
+        self._log_file: Optional[IO[str]] = None
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def truncated(self) -> bool:
+        return self.size > self.limits.head_size + self.limits.tail_size
+
+    def write(self, s: str) -> int:
+        n = len(s)
+        if not n:
+            return 0
+        self.size += n
+        if self._log_file:
+            self._log_file.write(s)
+        elif self.truncated:
+            self._start_spilling(s)
+        head_room = self.limits.head_size - self._head_size
+        if head_room > 0:
+            self._head.write(s[:head_room])
+            self._head_size += min(n, head_room)
+            s = s[head_room:]
+        if s:
+            self._append_tail(s)
+        return n
+
+    def _start_spilling(self, s: str) -> None:
+        # Up until now, nothing has been dropped, so the head and tail buffers hold everything written so far.
+        self.log_name, self._log_file = create_artifact("log", mode="w", encoding="utf-8", errors="replace")
+        self._log_file.write(self._head.getvalue())
+        self._log_file.writelines(self._tail)
+        self._log_file.write(s)
+
+    def _append_tail(self, s: str) -> None:
+        tail_size = self.limits.tail_size
+        if len(s) >= tail_size:
+            self._tail.clear()
+            s = s[-tail_size:] if tail_size else ""
+            self._tail_size = 0
+        self._tail.append(s)
+        self._tail_size += len(s)
+        while self._tail_size > tail_size:
+            excess = self._tail_size - tail_size
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_size -= len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_size -= excess
+
+    def close(self) -> None:
+        if self._log_file:
+            self._log_file.close()
+        super().close()
+
+    def getvalue(self) -> str:
+        """
+        Get the captured output; if it has been truncated, the omitted part is replaced by a marker.
+        """
+        head = self._head.getvalue()
+        tail = "".join(self._tail)
+        if not self.truncated:
+            return head + tail
+        omitted = self.size - len(head) - len(tail)
+        return f"{head}\n\n[... {omitted} characters omitted ...]\n\n{tail}"
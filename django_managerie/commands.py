@@ -1,18 +1,26 @@
 import os
+import threading
+import time
 from collections import OrderedDict, defaultdict
-from functools import lru_cache
 from importlib import import_module
+from typing import Any, Dict, NamedTuple, Optional
 
 from django.apps import apps
 from django.core.management import find_commands
 from django.urls import reverse
 
+from django_managerie.static_discovery import read_command_metadata_from_file
+
+_UNSET = object()
+
 
 class ManagementCommand:
     def __init__(self, app_config, name):
         self.app_config = app_config
         self.name = name
         self.title = self.name.replace("_", " ").title()
+        self.resolved_command_class = None
+        self._static_metadata = _UNSET
 
     @property
     def url(self):
@@ -21,9 +29,29 @@ class ManagementCommand:
             kwargs={"app_label": self.app_config.label, "command": self.name},
         )
 
+    @property
+    def module_name(self):
+        return f"{self.app_config.name}.management.commands.{self.name}"
+
     def get_command_class(self):
-        mname = f"{self.app_config.name}.management.commands.{self.name}"
-        return import_module(mname).Command
+        if self.resolved_command_class is None:
+            self.resolved_command_class = import_module(self.module_name).Command
+        return self.resolved_command_class
+
+    @property
+    def source_path(self):
+        return os.path.join(self.app_config.path, "management", "commands", f"{self.name}.py")
+
+    def get_static_metadata(self) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata about the command class (`help`, `disable_managerie`, `managerie_accepts_stdin`)
+        by reading the command module's source, without importing it.
+
+        Returns None if the metadata can't be determined that way.
+        """
+        if self._static_metadata is _UNSET:
+            self._static_metadata = read_command_metadata_from_file(self.source_path)
+        return self._static_metadata  # type: ignore[return-value]
 
     def get_command_instance(self):
         cls = self.get_command_class()
@@ -38,16 +66,99 @@ class ManagementCommand:
         return f"{self.app_config.label}.{self.name}"
 
 
-@lru_cache(maxsize=None)
-def get_commands():
+#: How often (in seconds) command discovery checks whether apps or their command directories have changed.
+#: None disables checking (commands are discovered only once).
+DISCOVERY_CHECK_INTERVAL: Optional[float] = 5.0
+
+
+class _AppCommands(NamedTuple):
+    app_config: Any
+    mtime_ns: Optional[int]
+    commands: Dict[str, ManagementCommand]
+
+
+def _get_mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _find_app_commands(app_config, mtime_ns: Optional[int]) -> _AppCommands:
     # Logic filched from django.core.management.get_commands(), but expressed in a saner way.
-    apps_to_commands = defaultdict(OrderedDict)
-
-    for app_config in apps.get_app_configs():
-        path = os.path.join(app_config.path, "management")
-        for command_name in find_commands(path):
-            apps_to_commands[app_config][command_name] = ManagementCommand(
-                app_config=app_config,
-                name=command_name,
-            )
-    return apps_to_commands
+    path = os.path.join(app_config.path, "management")
+    commands = OrderedDict(
+        (command_name, ManagementCommand(app_config=app_config, name=command_name))
+        for command_name in find_commands(path)
+    )
+    return _AppCommands(app_config=app_config, mtime_ns=mtime_ns, commands=commands)
+
+
+class CommandDiscovery:
+    """
+    Discovers the management commands of all apps, and keeps track of changes.
+
+    At most every `check_interval` seconds, the modification times of the apps' command directories
+    are checked, and only apps whose command directories have changed (or apps that have been added)
+    are rescanned.  `generation` is incremented whenever the set of commands changes.
+    """
+
+    def __init__(self, check_interval: Optional[float] = DISCOVERY_CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._apps: Dict[str, _AppCommands] = {}
+        self._commands: Optional[Dict[Any, Dict[str, ManagementCommand]]] = None
+        self._last_check = 0.0
+
+    def get_commands(self) -> Dict[Any, Dict[str, ManagementCommand]]:
+        """
+        Get a map of app configs to maps of command names to commands.
+        """
+        commands = self._commands
+        if commands is None or self._is_check_due():
+            with self._lock:
+                if self._commands is None or self._is_check_due():
+                    self._refresh()
+                commands = self._commands
+        assert commands is not None
+        return commands
+
+    def _is_check_due(self) -> bool:
+        return self.check_interval is not None and time.monotonic() - self._last_check >= self.check_interval
+
+    def _refresh(self) -> None:
+        app_configs = list(apps.get_app_configs())
+        changed = self._commands is None or len(app_configs) != len(self._apps)
+        new_apps = {}
+        for app_config in app_configs:
+            mtime_ns = _get_mtime_ns(os.path.join(app_config.path, "management", "commands"))
+            app_commands = self._apps.get(app_config.label)
+            if not (app_commands and app_commands.app_config is app_config and app_commands.mtime_ns == mtime_ns):
+                app_commands = _find_app_commands(app_config, mtime_ns)
+                changed = True
+            new_apps[app_config.label] = app_commands
+        if changed:
+            self._apps = new_apps
+            apps_to_commands: Dict[Any, Dict[str, ManagementCommand]] = defaultdict(OrderedDict)
+            for app_commands in new_apps.values():
+                if app_commands.commands:
+                    apps_to_commands[app_commands.app_config] = app_commands.commands
+            self._commands = apps_to_commands
+            self.generation += 1
+        self._last_check = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Have all apps rescanned on next access.
+        """
+        with self._lock:
+            self._apps = {}
+            self._commands = None
+
+
+discovery = CommandDiscovery()
+
+
+def get_commands() -> Dict[Any, Dict[str, ManagementCommand]]:
+    return discovery.get_commands()
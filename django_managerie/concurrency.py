@@ -0,0 +1,100 @@
+import os
+import re
+import time
+import warnings
+from contextlib import ExitStack, contextmanager
+from typing import IO, Iterator, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from django_managerie.runtime_dir import get_runtime_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+#: How often (in seconds) to retry acquiring a slot while waiting for one.
+POLL_INTERVAL = 0.1
+
+
+class ConcurrencyLimitReached(Exception):
+    pass
+
+
+def _try_lock(path: str) -> Optional[IO]:
+    lock_file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), "r+")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _unlock(lock_file: IO) -> None:
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def get_default_namespace() -> str:
+    """
+    Get the default namespace for concurrency limits: the settings module, so projects on the same host
+    don't share limits.
+    """
+    return settings.SETTINGS_MODULE or "default"
+
+
+def _try_acquire_slot(lock_dir: str, name: str, limit: int) -> Optional[IO]:
+    safe_name = _safe_name(name)
+    for index in range(limit):
+        lock_file = _try_lock(os.path.join(lock_dir, f"{safe_name}.{index}.lock"))
+        if lock_file:
+            return lock_file
+    return None
+
+
+@contextmanager
+def concurrency_slots(
+    limits: Sequence[Tuple[str, int, str]],
+    *,
+    timeout: Optional[float] = 0,
+    namespace: Optional[str] = None,
+) -> Iterator[None]:
+    """
+    Hold a slot in each of the given `(name, limit, description)` limits for the duration of the `with` block.
+
+    If a limit's slots are all taken, wait up to `timeout` seconds (indefinitely if None) for one to become free,
+    then raise `ConcurrencyLimitReached`.  Slots are acquired in the given order.
+
+    Limits are only shared by holders in the same `namespace` (by default, see `get_default_namespace`).
+
+    Slots are `flock()`ed lock files in the `locks` subdirectory of the (private) runtime directory
+    (see `get_runtime_dir`), so they work across the user's processes on the same host,
+    and are released automatically if a process dies.
+    """
+    if not limits:
+        yield
+        return
+    if fcntl is None:
+        warnings.warn("Concurrency limits are not supported on this platform")
+        yield
+        return
+    lock_dir = get_runtime_dir("locks", _safe_name(namespace or get_default_namespace()))
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with ExitStack() as stack:
+        for name, limit, description in limits:
+            while (lock_file := _try_acquire_slot(lock_dir, name, limit)) is None:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise ConcurrencyLimitReached(
+                        f"Too many concurrent runs of {description} (max {limit}); try again later",
+                    )
+                time.sleep(POLL_INTERVAL)
+            stack.callback(_unlock, lock_file)
+        yield
@@ -0,0 +1,189 @@
+import io
+import sys
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Optional, Sequence, TextIO, Tuple, Union
+
+from django.core.management import BaseCommand
+from django.http import HttpRequest
+
+from django_managerie.cancellation import CancelFlag, RunCancelled
+from django_managerie.capture import BoundedCapture, OutputLimits
+from django_managerie.commands import ManagementCommand
+from django_managerie.progress import ProgressReporter
+from django_managerie.stdin import open_uploaded_stdin
+from django_managerie.stdio import capture_stdio
+
+
+@contextmanager
+def redirect_stdin_binary(input_bin_stream: BinaryIO):
+    # Process-global; kept for backwards compatibility. See `capture_stdio` for the context-local version.
+    old_stdin = sys.stdin
+    try:
+        sys.stdin = io.TextIOWrapper(input_bin_stream, encoding="UTF-8")
+        assert sys.stdin.buffer is input_bin_stream
+        yield
+    finally:
+        sys.stdin = old_stdin
+
+
+@dataclass
+class ExecutionResult:
+    stdout: str
+    stderr: str
+    duration: float
+    error: Optional[Exception] = None
+    error_tb: Optional[str] = None
+    #: The code passed to `sys.exit()`, if the command called it.
+    exit_code: Any = None
+    #: Whether the command called `sys.exit()`.
+    exited: bool = False
+    #: If the output was truncated, the artifact names of the complete output logs.
+    stdout_log: Optional[str] = None
+    stderr_log: Optional[str] = None
+    #: If the result was served from the result cache, when it was originally computed (a timestamp).
+    cached_at: Optional[float] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    @property
+    def cancelled(self) -> bool:
+        return isinstance(self.error, RunCancelled)
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return "cancelled"
+        if self.error:
+            return "failed"
+        if self.exited:
+            return f"exit: {self.exit_code}"
+        return "succeeded"
+
+
+def prepare_execution(
+    cleaned_data: Dict[str, Any],
+    *,
+    stdin_encoding: str = "utf-8",
+    stdin_mmap: bool = False,
+) -> Tuple[Sequence[Any], Dict[str, Any], BinaryIO]:
+    """
+    Convert a command form's cleaned data into positional args, options and a binary stdin stream.
+
+    Uploaded files are used as-is (or memory-mapped, if `stdin_mmap` is set) without copying them;
+    pasted text is encoded with `stdin_encoding`.
+    """
+    # This mimics BaseCommand.run_from_argv():
+    options = dict(cleaned_data)
+    # "Move positional args out of options to mimic legacy optparse"
+    args = options.pop("args", ())
+
+    # Handle input
+    stdin_binary: BinaryIO
+    stdin_file = options.pop("_managerie_stdin_file", None)
+    stdin_content = options.pop("_managerie_stdin_content", None)
+    if stdin_file:
+        stdin_binary = open_uploaded_stdin(stdin_file, use_mmap=stdin_mmap)
+    elif stdin_content:
+        stdin_binary = io.BytesIO(stdin_content.encode(stdin_encoding))
+    else:
+        stdin_binary = io.BytesIO()
+    return (args, options, stdin_binary)
+
+
+def execute_command(
+    command: ManagementCommand,
+    *,
+    args: Sequence[Any],
+    options: Dict[str, Any],
+    stdin_binary: BinaryIO,
+    request: Optional[HttpRequest] = None,
+    instance: Optional[BaseCommand] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+    output_limits: Optional[OutputLimits] = None,
+    stdin_encoding: str = "utf-8",
+    cancel_flag: Optional[CancelFlag] = None,
+    progress: Optional[ProgressReporter] = None,
+) -> ExecutionResult:
+    """
+    Execute a management command, capturing its output.
+
+    If `instance` is not given, a new instance of the command is created.
+
+    If `stdout` and/or `stderr` are given, output is written to them instead of being
+    captured in memory; the respective fields of the result will then be empty.
+
+    `sys.stdin` will decode `stdin_binary` using `stdin_encoding`; `sys.stdin.buffer` is `stdin_binary` itself.
+
+    If `output_limits` is given, only the beginning and end of the output are kept in memory;
+    the complete output is spilled to log artifacts (see `ExecutionResult.stdout_log`).
+
+    The command can check `cancel_flag` (as `self._managerie_cancel`) to stop early when the run is cancelled,
+    and report its progress to `progress` (as `self._managerie_progress`; see `report_progress`).
+    """
+    captured_stdout = _create_capture(output_limits) if stdout is None else None
+    captured_stderr = _create_capture(output_limits) if stderr is None else None
+    stdout_stream: TextIO = stdout or captured_stdout  # type: ignore[assignment]
+    stderr_stream: TextIO = stderr or captured_stderr  # type: ignore[assignment]
+    error = None
+    error_tb = None
+    exit_code = None
+    exited = False
+    t0 = time.perf_counter()
+    stdin = io.TextIOWrapper(stdin_binary, encoding=stdin_encoding)
+    with capture_stdio(stdin=stdin, stdout=stdout_stream, stderr=stderr_stream):
+        options = {
+            **options,
+            "traceback": True,
+            "no_color": True,
+            "force_color": False,
+            "stdout": stdout_stream,
+            "stderr": stderr_stream,
+        }
+        cmd: BaseCommand = instance or command.get_command_instance()
+        try:
+            cmd._managerie_request = request  # type: ignore[attr-defined]
+            cmd._managerie_cancel = cancel_flag or CancelFlag()  # type: ignore[attr-defined]
+            cmd._managerie_progress = progress  # type: ignore[attr-defined]
+            cmd.execute(*args, **options)
+        except SystemExit as se:  # We don't want any stray sys.exit()s to quit the app server
+            stderr_stream.write(f"<exit: {se}>")
+            exit_code = se.code
+            exited = True
+        except Exception as exc:
+            error = exc
+            error_tb = traceback.format_exc()
+    if error is None and not exited and cancel_flag and cancel_flag.is_set():
+        error = RunCancelled()  # The command stopped early by itself
+    stdout_value, stdout_log = _finish_capture(captured_stdout)
+    stderr_value, stderr_log = _finish_capture(captured_stderr)
+    return ExecutionResult(
+        stdout=stdout_value,
+        stderr=stderr_value,
+        duration=(time.perf_counter() - t0),
+        error=error,
+        error_tb=error_tb,
+        exit_code=exit_code,
+        exited=exited,
+        stdout_log=stdout_log,
+        stderr_log=stderr_log,
+    )
+
+
+def _create_capture(output_limits: Optional[OutputLimits]) -> Union[io.StringIO, BoundedCapture]:
+    if output_limits:
+        return BoundedCapture(output_limits)
+    return io.StringIO()
+
+
+def _finish_capture(capture: Union[io.StringIO, BoundedCapture, None]) -> Tuple[str, Optional[str]]:
+    if capture is None:
+        return ("", None)
+    value = capture.getvalue()
+    capture.close()
+    return (value, getattr(capture, "log_name", None))
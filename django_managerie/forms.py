@@ -1,10 +1,19 @@
 import argparse
+import threading
 import warnings
-from typing import Any, Mapping, Optional, Type
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Type
 
 from django import forms
 from django.contrib.admin.widgets import AdminRadioSelect
 
+from django_managerie.commands import ManagementCommand
+
+try:
+    from django.utils.choices import BaseChoiceIterator
+except ImportError:  # pragma: no cover - Django < 5.0
+    BaseChoiceIterator = object  # type: ignore[assignment,misc]
+
 BOOLEAN_ACTIONS = (
     argparse._StoreTrueAction,
     argparse._StoreFalseAction,
@@ -18,6 +27,44 @@ FIELD_CLASS_MAP: Mapping[Any, Type[forms.Field]] = {
 }
 
 
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    A precomputed description of a form field derived from an `argparse` action.
+    """
+
+    name: str
+    field_class: Type[forms.Field]
+    field_kwargs: Mapping[str, Any]
+
+    def create_field(self) -> forms.Field:
+        return self.field_class(**self.field_kwargs)
+
+
+FormSchema = Tuple[FieldSpec, ...]
+
+
+class PrecomputedChoices(BaseChoiceIterator):
+    """
+    Choices that are already normalized (a list of `(value, label)` pairs).
+
+    Django uses these as-is for fields and their widgets (callables are wrapped lazily on Django < 5.0),
+    so building a field from a cached schema doesn't do work proportional to the number of choices.
+    """
+
+    def __init__(self, choices: Sequence[Tuple[str, str]]) -> None:
+        self.choices = choices
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self.choices)
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def __call__(self) -> Sequence[Tuple[str, str]]:
+        return self.choices
+
+
 class ArgumentParserForm(forms.Form):
     IGNORED_DESTS = {
         "force_color",
@@ -27,17 +74,36 @@ class ArgumentParserForm(forms.Form):
         "traceback",
     }
 
-    def __init__(self, *, parser: argparse.ArgumentParser, **kwargs) -> None:
+    def __init__(
+        self,
+        *,
+        parser: Optional[argparse.ArgumentParser] = None,
+        schema: Optional[FormSchema] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(**kwargs)
         self.parser = parser
-        for action in self.parser._actions:
-            self._process_action(action)
+        if schema is None:
+            if parser is None:
+                raise ValueError("Either `parser` or `schema` is required")
+            schema = self.build_schema(parser)
+        for spec in schema:
+            self.fields[spec.name] = spec.create_field()
 
-    def _process_action(self, action: argparse.Action) -> None:
+    @classmethod
+    def build_schema(cls, parser: argparse.ArgumentParser) -> FormSchema:
+        """
+        Introspect the parser's actions into a reusable form schema.
+        """
+        specs = (cls._process_action(action) for action in parser._actions)
+        return tuple(spec for spec in specs if spec)
+
+    @classmethod
+    def _process_action(cls, action: argparse.Action) -> Optional[FieldSpec]:
         if isinstance(action, argparse._HelpAction):
-            return
-        if action.dest in self.IGNORED_DESTS:
-            return
+            return None
+        if action.dest in cls.IGNORED_DESTS:
+            return None
         field_cls: Optional[Type[forms.Field]] = None
         field_kwargs = dict(
             initial=action.default,
@@ -57,10 +123,58 @@ class ArgumentParserForm(forms.Form):
                         field_kwargs["widget"] = AdminRadioSelect
                 except Exception:  # Might not be len-able, so don't crash
                     pass
-                field_kwargs["choices"] = [(str(c), str(c)) for c in action.choices]
+                field_kwargs["choices"] = PrecomputedChoices([(str(c), str(c)) for c in action.choices])
             else:
                 field_cls = FIELD_CLASS_MAP.get(action.type, forms.Field)
         if field_cls:
-            self.fields[action.dest] = field_cls(**field_kwargs)
+            return FieldSpec(name=action.dest, field_class=field_cls, field_kwargs=field_kwargs)
 
         # TODO: Probably support for more fields :)
+        return None
+
+
+class FormSchemaCache:
+    """
+    A cache of form schemas, keyed by command class.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._schemas: Dict[type, FormSchema] = {}
+
+    def get(self, command_class: type, build: Callable[[], FormSchema]) -> FormSchema:
+        schema = self._schemas.get(command_class)
+        if schema is None:
+            schema = build()
+            with self._lock:
+                schema = self._schemas.setdefault(command_class, schema)
+        return schema
+
+    def invalidate(self, command_class: Optional[type] = None) -> None:
+        """
+        Forget the cached schema for the given command class, or all of them if no class is given.
+        """
+        with self._lock:
+            if command_class is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(command_class, None)
+
+    def __contains__(self, command_class: type) -> bool:
+        return command_class in self._schemas
+
+
+schema_cache = FormSchemaCache()
+
+
+def get_command_schema(command: ManagementCommand) -> FormSchema:
+    """
+    Get the (cached) form schema for the given management command.
+    """
+    command_class = command.get_command_class()
+
+    def build() -> FormSchema:
+        parser = command_class().create_parser("django", command.name)
+        return ArgumentParserForm.build_schema(parser)
+
+    return schema_cache.get(command_class, build)
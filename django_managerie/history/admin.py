@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.contrib import admin
+from django.utils import timezone
+
+from django_managerie.history.models import CommandRun
+
+
+class StatusListFilter(admin.SimpleListFilter):
+    """
+    Filter runs by status, with fixed choices (instead of a DISTINCT query over all runs).
+    """
+
+    title = "status"
+    parameter_name = "status"
+
+    def lookups(self, request, model_admin):
+        return [
+            ("succeeded", "succeeded"),
+            ("failed", "failed"),
+            ("cancelled", "cancelled"),
+            ("exited", "exited (with an exit code)"),
+        ]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value == "exited":
+            return queryset.filter(status__startswith="exit: ")
+        if value:
+            return queryset.filter(status=value)
+        return queryset
+
+
+class CommandListFilter(admin.SimpleListFilter):
+    """
+    Filter runs by command, with choices from the admin site's Managerie's command registry
+    (instead of a DISTINCT query over all runs).
+    """
+
+    title = "command"
+    parameter_name = "command"
+
+    def lookups(self, request, model_admin):
+        managerie = getattr(model_admin.admin_site, "managerie", None)
+        if not managerie:
+            return []
+        return [(full_name, full_name) for full_name in sorted(managerie.registry.entries)]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        return queryset.filter(command=value) if value else queryset
+
+
+class StartedAtListFilter(admin.SimpleListFilter):
+    """
+    Filter runs by when they started, with fixed time ranges.
+    """
+
+    title = "started"
+    parameter_name = "started_within"
+
+    ranges = {
+        "hour": ("Last hour", timedelta(hours=1)),
+        "day": ("Last 24 hours", timedelta(days=1)),
+        "week": ("Last 7 days", timedelta(days=7)),
+        "month": ("Last 30 days", timedelta(days=30)),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for (key, (label, _)) in self.ranges.items()]
+
+    def queryset(self, request, queryset):
+        if self.value() in self.ranges:
+            _, delta = self.ranges[self.value()]
+            return queryset.filter(started_at__gte=timezone.now() - delta)
+        return queryset
+
+
+@admin.register(CommandRun)
+class CommandRunAdmin(admin.ModelAdmin):
+    list_display = ("started_at", "command", "user", "status", "duration")
+    list_filter = (StartedAtListFilter, StatusListFilter, CommandListFilter)
+    search_fields = ("command",)
+    list_select_related = ("user",)
+    show_full_result_count = False  # Counting millions of rows is slow
+    readonly_fields = [field.name for field in CommandRun._meta.get_fields()]
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.core.signals import request_finished
+
+
+class ManagerieHistoryConfig(AppConfig):
+    name = "django_managerie.history"
+    label = "managerie_history"
+    verbose_name = "Managerie History"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self) -> None:
+        from django_managerie.history.recorder import flush_on_request_finished
+
+        # Runs recorded during a request are written after the response has been sent.
+        request_finished.connect(flush_on_request_finished, dispatch_uid="managerie_history_flush")
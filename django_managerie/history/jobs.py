@@ -0,0 +1,218 @@
+import io
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, cast
+
+from django_managerie.cancellation import RunCancelled
+from django_managerie.commands import ManagementCommand
+from django_managerie.execution import ExecutionResult
+from django_managerie.history.models import JobOutputChunk, JobRecord
+from django_managerie.jobs import CANCELLED, FAILED, SUCCEEDED, Job, JobStore
+
+STREAMS = ("stdout", "stderr")
+
+
+class StoredJobError(Exception):
+    """
+    An error raised by a job, as loaded from the database (only its message and traceback are kept).
+    """
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp is not None else None
+
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+class ChunkWriter(io.TextIOBase):
+    """
+    A text stream that appends what's written to it to the database as `JobOutputChunk`s.
+
+    To keep the number of queries down, writes are buffered, and flushed as a chunk once `chunk_size`
+    characters have accumulated or `flush_interval` seconds have passed since the last flush.
+    Output beyond `max_size` characters is dropped.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        stream: str,
+        *,
+        chunk_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        max_size: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.job_id = job_id
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.offset = 0
+        self.truncated = False
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            self._buffer.append(s)
+            self._buffered += len(s)
+            due = self._buffered >= self.chunk_size or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if self.closed:
+            return
+        with self._lock:
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            self._last_flush = time.monotonic()
+            if self.max_size is not None and self.offset + len(data) > self.max_size:
+                data = data[: max(0, self.max_size - self.offset)]
+                if not self.truncated:
+                    self.truncated = True
+                    data += "\n<output truncated>\n"
+            if not data:
+                return
+            JobOutputChunk.objects.create(
+                job_id=self.job_id,
+                stream=self.stream,
+                offset=self.offset,
+                end_offset=self.offset + len(data),
+                data=data,
+            )
+            self.offset += len(data)
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class DatabaseJobStore(JobStore):
+    """
+    Stores job state and output in the database (as `JobRecord`s and `JobOutputChunk`s).
+
+    Polling a job's status is a single primary key lookup; output is read incrementally by offset.
+    `get_command` resolves a command's full name to the command (e.g. from a Managerie's registry).
+    """
+
+    def __init__(
+        self,
+        get_command: Callable[[str], Optional[ManagementCommand]],
+        *,
+        chunk_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        max_output_size: Optional[int] = 10 * 1024 * 1024,
+    ) -> None:
+        self.get_command = get_command
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.max_output_size = max_output_size
+        self._lock = threading.Lock()
+        self._writers: Dict[str, Dict[str, ChunkWriter]] = {}
+
+    def _create_writer(self, job_id: str, stream: str) -> ChunkWriter:
+        return ChunkWriter(
+            job_id,
+            stream,
+            chunk_size=self.chunk_size,
+            flush_interval=self.flush_interval,
+            max_size=self.max_output_size,
+        )
+
+    def job_submitted(self, job: Job) -> None:
+        JobRecord.objects.create(
+            id=job.id,
+            command=job.command.full_name,
+            user_id=job.user_id,
+            node=socket.gethostname(),
+            status=job.status,
+            submitted_at=datetime.fromtimestamp(job.submitted_at, tz=timezone.utc),
+        )
+
+    def job_started(self, job: Job) -> Dict[str, TextIO]:
+        JobRecord.objects.filter(pk=job.id).update(status=job.status, started_at=_to_datetime(job.started_at))
+        writers = {stream: self._create_writer(job.id, stream) for stream in STREAMS}
+        with self._lock:
+            self._writers[job.id] = writers
+        return cast(Dict[str, TextIO], dict(writers))
+
+    def job_finished(self, job: Job) -> None:
+        with self._lock:
+            writers = self._writers.pop(job.id, {})
+        result = job.result
+        for stream in STREAMS:
+            writer = writers.get(stream) or self._create_writer(job.id, stream)
+            # Output that wasn't written to the stream (e.g. from a worker process) is in the result.
+            if result and getattr(result, stream):
+                writer.write(getattr(result, stream))
+            writer.close()
+        JobRecord.objects.filter(pk=job.id).update(
+            status=job.status,
+            finished_at=_to_datetime(job.finished_at),
+            duration=(result.duration if result else None),
+            exit_code=(result.exit_code if result else None),
+            exited=bool(result and result.exited),
+            error=(str(result.error) if result and result.error else ""),
+            error_tb=((result.error_tb or "") if result else ""),
+        )
+
+    def load(self, job_id: str, *, with_output: bool = False) -> Optional[Job]:
+        record = JobRecord.objects.filter(pk=job_id).first()
+        command = self.get_command(record.command) if record else None
+        if not (record and command):
+            return None
+        job = Job(
+            command=command,
+            user_id=record.user_id,
+            id=record.id,
+            status=record.status,
+            submitted_at=record.submitted_at.timestamp(),
+            started_at=_to_timestamp(record.started_at),
+            finished_at=_to_timestamp(record.finished_at),
+        )
+        if record.status in (SUCCEEDED, FAILED, CANCELLED):
+            job.result = ExecutionResult(
+                stdout=(self.read_output(job_id, "stdout", 0)[0] if with_output else ""),
+                stderr=(self.read_output(job_id, "stderr", 0)[0] if with_output else ""),
+                duration=(record.duration or 0),
+                error=self._get_error(record),
+                error_tb=(record.error_tb or None),
+                exit_code=record.exit_code,
+                exited=record.exited,
+            )
+        return job
+
+    def _get_error(self, record: JobRecord) -> Optional[Exception]:
+        if record.status == CANCELLED:
+            return RunCancelled(record.error)
+        if record.status == FAILED:
+            return StoredJobError(record.error)
+        return None
+
+    def request_cancel(self, job_id: str) -> None:
+        JobRecord.objects.filter(pk=job_id).update(cancel_requested=True)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return JobRecord.objects.filter(pk=job_id, cancel_requested=True).exists()
+
+    def read_output(self, job_id: str, stream: str, offset: int) -> Tuple[str, int]:
+        chunks = (
+            JobOutputChunk.objects.filter(job_id=job_id, stream=stream, end_offset__gt=offset)
+            .order_by("end_offset")
+            .values_list("offset", "data")
+        )
+        data = "".join(chunk_data[max(0, offset - chunk_offset) :] for (chunk_offset, chunk_data) in chunks)
+        return data, offset + len(data)
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from django_managerie.history.models import CommandRun, JobOutputChunk, JobRecord
+
+
+class Command(BaseCommand):
+    help = "Delete old command runs (and stored background jobs) from the Managerie execution history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=float, help="Delete runs started more than this many days ago")
+        parser.add_argument("--keep", type=int, help="Delete all but this many of the latest runs")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Delete this many runs per query")
+
+    def handle(self, *, older_than_days=None, keep=None, batch_size, **options):
+        if older_than_days is None and keep is None:
+            raise CommandError("Specify --older-than-days and/or --keep")
+        condition = Q(pk__in=[])
+        if older_than_days is not None:
+            condition |= Q(started_at__lt=timezone.now() - timedelta(days=older_than_days))
+        if keep is not None:
+            # IDs increase with time, so everything up to the ID just past the ones to keep goes.
+            boundary = CommandRun.objects.order_by("-pk").values_list("pk", flat=True)[keep : keep + 1].first()
+            if boundary is not None:
+                condition |= Q(pk__lte=boundary)
+        runs = CommandRun.objects.filter(condition)
+        deleted = 0
+        # Delete in bounded batches to avoid long-running transactions and locks.
+        # (There are no relations to runs, so each batch is a single DELETE query.)
+        while pks := list(runs.order_by("pk").values_list("pk", flat=True)[:batch_size]):
+            deleted += CommandRun.objects.filter(pk__in=pks).delete()[0]
+        self.stdout.write(f"Deleted {deleted} command runs.")
+        if older_than_days is not None:
+            jobs = JobRecord.objects.filter(submitted_at__lt=timezone.now() - timedelta(days=older_than_days))
+            deleted_jobs = 0
+            while job_ids := list(jobs.order_by("pk").values_list("pk", flat=True)[:batch_size]):
+                JobOutputChunk.objects.filter(job_id__in=job_ids).delete()
+                deleted_jobs += JobRecord.objects.filter(pk__in=job_ids).delete()[0]
+            self.stdout.write(f"Deleted {deleted_jobs} stored jobs.")
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:50
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommandRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "command",
+                    models.CharField(help_text="The full name (app label and name) of the command", max_length=200),
+                ),
+                (
+                    "options",
+                    models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("duration", models.FloatField()),
+                ("status", models.CharField(max_length=64)),
+                ("stdout", models.TextField(blank=True)),
+                ("stderr", models.TextField(blank=True)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-started_at",),
+                "indexes": [
+                    models.Index(fields=["started_at"], name="managerie_run_started_idx"),
+                    models.Index(fields=["command", "started_at"], name="managerie_run_command_idx"),
+                    models.Index(fields=["user", "started_at"], name="managerie_run_user_idx"),
+                ],
+            },
+        ),
+    ]
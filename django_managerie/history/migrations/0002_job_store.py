@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:11
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("managerie_history", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobRecord",
+            fields=[
+                ("id", models.CharField(max_length=32, primary_key=True, serialize=False)),
+                (
+                    "command",
+                    models.CharField(help_text="The full name (app label and name) of the command", max_length=200),
+                ),
+                ("node", models.CharField(blank=True, help_text="The host running the job", max_length=255)),
+                ("status", models.CharField(max_length=16)),
+                ("submitted_at", models.DateTimeField()),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("duration", models.FloatField(blank=True, null=True)),
+                (
+                    "exit_code",
+                    models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+                ),
+                ("exited", models.BooleanField(default=False)),
+                ("error", models.TextField(blank=True)),
+                ("error_tb", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobOutputChunk",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("stream", models.CharField(max_length=8)),
+                ("offset", models.PositiveBigIntegerField()),
+                ("end_offset", models.PositiveBigIntegerField()),
+                ("data", models.TextField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="output_chunks",
+                        to="managerie_history.jobrecord",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="jobrecord",
+            index=models.Index(fields=["submitted_at"], name="managerie_job_submitted_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="joboutputchunk",
+            index=models.Index(fields=["job", "stream", "end_offset"], name="managerie_job_output_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("managerie_history", "0002_job_store"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobrecord",
+            name="cancel_requested",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CommandRun(models.Model):
+    command = models.CharField(max_length=200, help_text="The full name (app label and name) of the command")
+    options = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        db_constraint=False,
+    )
+    started_at = models.DateTimeField()
+    duration = models.FloatField()
+    status = models.CharField(max_length=64)
+    stdout = models.TextField(blank=True)
+    stderr = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ("-started_at",)
+        indexes = [
+            models.Index(fields=["started_at"], name="managerie_run_started_idx"),
+            models.Index(fields=["command", "started_at"], name="managerie_run_command_idx"),
+            models.Index(fields=["user", "started_at"], name="managerie_run_user_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.command} at {self.started_at:%Y-%m-%d %H:%M:%S} ({self.status})"
+
+
+class JobRecord(models.Model):
+    """
+    The state of a background job, so that any process can serve it (see `DatabaseJobStore`).
+    """
+
+    id = models.CharField(max_length=32, primary_key=True)
+    command = models.CharField(max_length=200, help_text="The full name (app label and name) of the command")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        db_constraint=False,
+    )
+    node = models.CharField(max_length=255, blank=True, help_text="The host running the job")
+    status = models.CharField(max_length=16)
+    submitted_at = models.DateTimeField()
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True)
+    exit_code = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    exited = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+    error_tb = models.TextField(blank=True)
+    cancel_requested = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["submitted_at"], name="managerie_job_submitted_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.command} job {self.id} ({self.status})"
+
+
+class JobOutputChunk(models.Model):
+    job = models.ForeignKey(JobRecord, on_delete=models.CASCADE, related_name="output_chunks")
+    stream = models.CharField(max_length=8)
+    #: The offset (in characters) of the chunk's data within the stream's output.
+    offset = models.PositiveBigIntegerField()
+    #: The offset just past the chunk's data; chunks after a reader's offset are found with this.
+    end_offset = models.PositiveBigIntegerField()
+    data = models.TextField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["job", "stream", "end_offset"], name="managerie_job_output_idx"),
+        ]
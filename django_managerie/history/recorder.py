@@ -0,0 +1,82 @@
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from django_managerie.commands import ManagementCommand
+from django_managerie.execution import ExecutionResult
+from django_managerie.history.models import CommandRun
+
+log = logging.getLogger(__name__)
+
+
+class RunRecorder:
+    """
+    Buffers command runs and writes them to the database in bulk.
+
+    The buffer is flushed when it reaches `batch_size` runs, when a request finishes
+    (i.e. after its response has been sent), or when `flush()` is called.
+    """
+
+    def __init__(self, batch_size: int = 100) -> None:
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._buffer: List[CommandRun] = []
+
+    def record(self, run: CommandRun) -> None:
+        with self._lock:
+            self._buffer.append(run)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            runs, self._buffer = self._buffer, []
+        if not runs:
+            return
+        try:
+            CommandRun.objects.bulk_create(runs, batch_size=self.batch_size)
+        except Exception:
+            log.exception("Failed to record %d command runs", len(runs))
+
+
+recorder = RunRecorder()
+
+
+def flush_on_request_finished(**kwargs) -> None:
+    recorder.flush()
+
+
+def _to_json(options: Dict[str, Any]) -> Dict[str, Any]:
+    # Options may contain things that aren't JSON serializable; stringify those.
+    return json.loads(json.dumps(options, cls=DjangoJSONEncoder, default=str))
+
+
+def record_run(
+    command: ManagementCommand,
+    *,
+    options: Dict[str, Any],
+    result: ExecutionResult,
+    user_id: Optional[Any] = None,
+) -> None:
+    """
+    Record a command run (deferred; see `RunRecorder`).
+    """
+    finished_at = datetime.now(tz=timezone.utc)
+    recorder.record(
+        CommandRun(
+            command=command.full_name,
+            options=_to_json(options),
+            user_id=user_id,
+            started_at=finished_at - timedelta(seconds=result.duration),
+            duration=result.duration,
+            status=result.status,
+            stdout=result.stdout,
+            stderr=result.stderr,
+            error=(result.error_tb or ""),
+        ),
+    )
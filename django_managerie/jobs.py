@@ -0,0 +1,250 @@
+import abc
+import functools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Optional, Sequence, TextIO, Tuple
+
+from django.db import close_old_connections
+from django.http import HttpRequest
+
+from django_managerie.cancellation import CancelFlag, RunCancelled
+from django_managerie.commands import ManagementCommand
+from django_managerie.execution import ExecutionResult, execute_command
+from django_managerie.progress import Progress, ProgressStore
+from django_managerie.stdin import detach_stdin
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    command: ManagementCommand
+    user_id: Any
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = PENDING
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[ExecutionResult] = None
+    cancel_flag: CancelFlag = field(default_factory=CancelFlag, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED, CANCELLED)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobStore(abc.ABC):
+    """
+    Persists job state and output, so that any process (e.g. on another node behind a load balancer)
+    can serve them.  See `django_managerie.history.jobs.DatabaseJobStore`.
+    """
+
+    @abc.abstractmethod
+    def job_submitted(self, job: Job) -> None: ...
+
+    @abc.abstractmethod
+    def job_started(self, job: Job) -> Dict[str, TextIO]:
+        """
+        Record that the job has started; return streams (keyed `stdout` and `stderr`) for its output, if any.
+        """
+
+    @abc.abstractmethod
+    def job_finished(self, job: Job) -> None:
+        """
+        Record the job's result (and close the streams returned by `job_started`).
+        """
+
+    @abc.abstractmethod
+    def load(self, job_id: str, *, with_output: bool = False) -> Optional[Job]:
+        """
+        Load a job.  Unless `with_output` is set, the output of the job's result is left empty.
+        """
+
+    @abc.abstractmethod
+    def read_output(self, job_id: str, stream: str, offset: int) -> Tuple[str, int]:
+        """
+        Read the output written to the job's `stream` after `offset` (in characters); return it and the new offset.
+        """
+
+    @abc.abstractmethod
+    def request_cancel(self, job_id: str) -> None: ...
+
+    @abc.abstractmethod
+    def is_cancel_requested(self, job_id: str) -> bool: ...
+
+
+class JobManager:
+    """
+    Runs commands in a bounded background thread pool, and keeps track of their results.
+
+    Commands are run with the `execute` callable (by default, in-process with `execute_command`).
+
+    At most `max_workers` jobs run at once, and at most `max_pending` jobs may be waiting
+    to run; submitting more raises `JobQueueFull`.  Only the `max_retained` most recently
+    submitted jobs are kept in memory.
+
+    If a `store` is given, job state and output are also persisted there, and jobs not known to
+    this process are looked up in it.  Progress reported by jobs (see `report_progress`) is kept
+    in `progress_store`.
+    """
+
+    def __init__(
+        self,
+        *,
+        execute: Callable[..., ExecutionResult] = execute_command,
+        max_workers: int = 4,
+        max_pending: int = 100,
+        max_retained: int = 200,
+        store: Optional[JobStore] = None,
+        progress_store: Optional[ProgressStore] = None,
+    ) -> None:
+        self.execute = execute
+        self.store = store
+        self.progress_store = progress_store or ProgressStore()
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="managerie-job")
+        return self._executor
+
+    def submit(
+        self,
+        command: ManagementCommand,
+        *,
+        args: Sequence[Any],
+        options: Dict[str, Any],
+        stdin_binary: BinaryIO,
+        request: HttpRequest,
+    ) -> Job:
+        job = Job(command=command, user_id=request.user.pk)
+        with self._lock:
+            self._check_capacity()  # Don't bother detaching stdin for a job that would be rejected
+        stdin_binary = detach_stdin(stdin_binary)
+        try:
+            with self._lock:
+                self._check_capacity()
+                if self.store:
+                    self.store.job_submitted(job)
+                    # Cancellation may be requested through another process.
+                    job.cancel_flag = CancelFlag(poll=functools.partial(self.store.is_cancel_requested, job.id))
+                self._jobs[job.id] = job
+                self._evict()
+                self._get_executor().submit(
+                    self._run,
+                    job,
+                    args=args,
+                    options=options,
+                    stdin_binary=stdin_binary,
+                    request=request,
+                )
+        except BaseException:
+            stdin_binary.close()
+            raise
+        return job
+
+    def _check_capacity(self) -> None:
+        if sum(1 for j in self._jobs.values() if j.status == PENDING) >= self.max_pending:
+            raise JobQueueFull(f"Too many pending jobs (max {self.max_pending}), try again later")
+
+    def _evict(self) -> None:
+        # Forget the oldest finished jobs beyond `max_retained`.
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        for job_id in [job_id for (job_id, job) in self._jobs.items() if job.is_finished][:excess]:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job, **kwargs) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        close_old_connections()
+        try:
+            if job.cancel_flag.is_set():
+                raise RunCancelled("The job was cancelled before it started")
+            streams = self.store.job_started(job) if self.store else {}
+            job.result = self.execute(
+                job.command,
+                cancel_flag=job.cancel_flag,
+                progress=self.progress_store.get_reporter(job.id),
+                **streams,
+                **kwargs,
+            )
+        except Exception as exc:  # e.g. `ConcurrencyLimitReached`
+            job.result = ExecutionResult(stdout="", stderr="", duration=0, error=exc)
+        finally:
+            job.finished_at = time.time()
+            if job.result and job.result.cancelled:
+                job.status = CANCELLED
+            else:
+                job.status = SUCCEEDED if (job.result and job.result.succeeded) else FAILED
+            try:
+                if self.store:
+                    self.store.job_finished(job)
+            finally:
+                close_old_connections()
+
+    def get(self, job_id: str, *, with_output: bool = False) -> Optional[Job]:
+        """
+        Get a job (from the store, if it's not running or retained in this process).
+        """
+        job = self._jobs.get(job_id)
+        if job is None and self.store:
+            job = self.store.load(job_id, with_output=with_output)
+        return job
+
+    def cancel(self, job: Job) -> bool:
+        """
+        Cancel the job (see `CancelFlag`); return False if it has already finished.
+
+        Pending jobs are cancelled before they start.
+        """
+        if job.is_finished:
+            return False
+        job.cancel_flag.set()
+        if self.store:
+            self.store.request_cancel(job.id)
+        return True
+
+    def get_progress(self, job: Job) -> Optional[Progress]:
+        return self.progress_store.get(job.id)
+
+    def read_output(self, job: Job, stream: str, offset: int) -> Tuple[str, int]:
+        """
+        Read the output the job has written to `stream` (`stdout` or `stderr`) after `offset` (in characters).
+
+        Without a store, output is only available once the job has finished.
+        """
+        if self.store:
+            return self.store.read_output(job.id, stream, offset)
+        output = getattr(job.result, stream, "") if job.result else ""
+        return output[offset:], max(offset, len(output))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
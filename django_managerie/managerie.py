@@ -1,14 +1,32 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Dict, List
+from typing import Any, BinaryIO, ContextManager, Dict, List, Optional, Sequence, TextIO, Type
 
+from django.apps import apps
 from django.apps.config import AppConfig
 from django.contrib.admin.sites import AdminSite
+from django.core.cache import caches
+from django.core.management import BaseCommand
 from django.http import HttpRequest
 from django.urls import URLPattern, path, reverse
+from django.views import View
 
+from django_managerie import metrics
 from django_managerie.blocklist import COMMAND_BLOCKLIST
-from django_managerie.commands import ManagementCommand, get_commands
+from django_managerie.cancellation import CancelFlag
+from django_managerie.capture import OutputLimits
+from django_managerie.commands import ManagementCommand
+from django_managerie.concurrency import ConcurrencyLimitReached, concurrency_slots, get_default_namespace
+from django_managerie.execution import ExecutionResult, execute_command
+from django_managerie.forms import get_command_schema, schema_cache
+from django_managerie.jobs import JobManager, JobStore
+from django_managerie.progress import ProgressReporter, ProgressStore
+from django_managerie.registry import CommandRegistry, RegistryEntry
+from django_managerie.result_cache import ResultCache
+from django_managerie.static_discovery import STATIC_ATTRIBUTES
 from django_managerie.types import CommandMap
+from django_managerie.workers import WorkerPool
 
 
 def user_is_superuser(request: HttpRequest) -> bool:
@@ -24,8 +42,385 @@ class Managerie:
         "django.contrib.staticfiles",
     }
 
+    #: If set, command metadata (e.g. `disable_managerie`) is read from the command modules' source
+    #: where possible, instead of importing them.  The modules are imported only when a command's page
+    #: is opened or the command is executed.
+    static_discovery = False
+
+    #: Whether commands run as background jobs by default.
+    #: Commands can override this with a `managerie_background` class attribute.
+    background_by_default = False
+    #: The maximum number of background jobs running at once.
+    background_max_workers = 4
+    #: The maximum number of background jobs waiting to run.
+    background_max_pending = 100
+    #: Whether background job state and output are stored in the database, so that any process
+    #: (e.g. on another node behind a load balancer) can serve them.
+    #: This requires `django_managerie.history` to be in `INSTALLED_APPS`.
+    store_jobs_in_database = False
+    #: The Django cache in which background jobs' progress (see `report_progress`) is stored.
+    #: For jobs in worker processes, or with `store_jobs_in_database`, it must be shared between processes.
+    progress_cache_alias = "default"
+    #: How often (at most, in seconds) a job's progress is stored.
+    progress_interval = 0.5
+
+    #: Whether command output is streamed to the browser as it is written by default.
+    #: Commands can override this with a `managerie_streaming` class attribute.
+    streaming_by_default = False
+
+    #: Whether commands run in separate, pre-started worker processes by default.
+    #: Commands can override this with a `managerie_isolated` class attribute.
+    #: Isolated commands don't have access to the request (`_managerie_request` is None), and
+    #: their output can't be streamed.
+    isolated_by_default = False
+    #: The number of worker processes for isolated commands.
+    worker_pool_size = 2
+    #: The wall-clock timeout (in seconds) for isolated command runs; runaway workers are killed.
+    worker_timeout: Optional[float] = None
+    #: The address space limit (in bytes) for worker processes (where supported).
+    worker_memory_limit: Optional[int] = None
+    #: How long (in seconds) a cancelled command in a worker process gets to stop by itself
+    #: before the worker is killed.
+    cancel_grace_period = 10.0
+
+    #: How much command output to keep in memory; output beyond that is spilled to a downloadable log file.
+    #: Set to None to keep all output in memory.
+    output_limits: Optional[OutputLimits] = OutputLimits()
+
+    #: The encoding of standard input for commands that accept it.
+    #: Commands can override this with a `managerie_stdin_encoding` class attribute.
+    stdin_encoding = "utf-8"
+
+    #: Whether to use natively asynchronous views (for ASGI deployments).
+    async_views = False
+    #: The maximum number of threads used by the asynchronous views to run synchronous code (e.g. commands).
+    async_executor_max_workers = 8
+
+    #: The maximum number of items in a batch (see `ManagerieBatchView`).
+    batch_max_items = 100
+    #: The maximum number of batch items run in parallel.
+    batch_max_parallelism = 4
+
+    #: How long (in seconds) the lists of commands allowed for each user (as shown in the admin index and
+    #: sidebar) are cached in Django's cache framework.  None disables caching.  See `get_command_cache_key`.
+    command_cache_timeout: Optional[int] = None
+    #: The Django cache to use for the command lists.
+    command_cache_alias = "default"
+    #: Bump this to invalidate all cached command lists, e.g. when `is_command_allowed` has been changed.
+    command_cache_version = 1
+
+    #: The maximum number of commands running at once across the site (in all processes on the host).
+    #: None for no limit.
+    max_concurrent_runs: Optional[int] = None
+    #: Per-command concurrency limits, by full name (e.g. `{"myapp.rebuild_index": 1}`).
+    #: Commands can also declare their limit with a `managerie_max_concurrency` class attribute.
+    concurrency_limits: Dict[str, int] = {}
+    #: How long (in seconds) a run waits for a concurrency slot to become free before being rejected;
+    #: 0 rejects right away, and None waits indefinitely.
+    #: Commands can override this with a `managerie_concurrency_wait` class attribute.
+    concurrency_wait: Optional[float] = 0
+    #: The namespace of the concurrency limits' locks, so that limits aren't shared with other projects
+    #: (or admin sites) on the host.  None for the settings module and the admin site's name.
+    concurrency_namespace: Optional[str] = None
+
+    #: The Django cache in which command results are cached.
+    #: Commands opt in to result caching with a `managerie_cache_ttl` class attribute (in seconds).
+    result_cache_alias = "default"
+    #: Results with more output than this (in characters) aren't cached.
+    result_cache_max_size = 1024 * 1024
+
+    #: Whether command runs are recorded in the execution history.
+    #: This requires `django_managerie.history` to be in `INSTALLED_APPS`.
+    record_runs = True
+
     def __init__(self, admin_site: AdminSite) -> None:
         self.admin_site = admin_site
+        self.registry = CommandRegistry(is_enabled=self.is_command_enabled)
+        self.jobs = JobManager(
+            execute=self.execute_job,
+            max_workers=self.background_max_workers,
+            max_pending=self.background_max_pending,
+            store=self.get_job_store(),
+            progress_store=ProgressStore(alias=self.progress_cache_alias, interval=self.progress_interval),
+        )
+        self.result_cache = ResultCache(alias=self.result_cache_alias, max_size=self.result_cache_max_size)
+        self._worker_pool: Optional[WorkerPool] = None
+        self._async_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def async_executor(self) -> ThreadPoolExecutor:
+        """
+        The executor used by the asynchronous views to run discovery, permission checks and commands.
+        """
+        if self._async_executor is None:
+            self._async_executor = ThreadPoolExecutor(
+                max_workers=self.async_executor_max_workers,
+                thread_name_prefix="managerie-async",
+            )
+        return self._async_executor
+
+    @property
+    def worker_pool(self) -> WorkerPool:
+        """
+        The worker process pool for isolated commands.
+
+        The pool is created on first access; call `worker_pool.start()` at startup
+        to have the workers warm up before the first isolated command is run.
+        """
+        if self._worker_pool is None:
+            self._worker_pool = WorkerPool(
+                size=self.worker_pool_size,
+                timeout=self.worker_timeout,
+                memory_limit=self.worker_memory_limit,
+            )
+        return self._worker_pool
+
+    def execute(
+        self,
+        command: ManagementCommand,
+        *,
+        args: Sequence[Any],
+        options: Dict[str, Any],
+        stdin_binary: BinaryIO,
+        request: Optional[HttpRequest] = None,
+        instance: Optional[BaseCommand] = None,
+        isolate: Optional[bool] = None,
+        refresh_cache: bool = False,
+        use_result_cache: bool = True,
+        cancel_flag: Optional[CancelFlag] = None,
+        progress: Optional[ProgressReporter] = None,
+    ) -> ExecutionResult:
+        """
+        Execute the command, either in-process or in a worker process if it should be isolated.
+
+        `isolate` overrides `should_isolate()` for this run.
+
+        Setting `cancel_flag` cancels the run (see `CancelFlag`); commands in worker processes that don't
+        stop by themselves are killed after `cancel_grace_period` seconds.
+
+        Progress reported by the command (see `report_progress`) goes to `progress`.
+
+        Raises `ConcurrencyLimitReached` if the command's (or the site's) concurrency limit is reached
+        (see `limit_concurrency`).
+
+        If the command opts in to result caching (see `get_result_cache_ttl`), a cached result may be
+        returned instead (unless `refresh_cache` is set).  With `use_result_cache` unset, the cache is neither
+        read nor written (e.g. for profiled runs).
+        """
+        cache_ttl = self.get_result_cache_ttl(command) if use_result_cache else None
+        cache_key = None
+        if cache_ttl:
+            cache_key = self.result_cache.get_key(command, args=args, options=options, stdin_binary=stdin_binary)
+            cached_result = self.result_cache.get(cache_key) if (cache_key and not refresh_cache) else None
+            if cached_result:
+                metrics.cache_hits_total.inc(command=command.full_name)
+                return cached_result
+        with self.limit_concurrency(command):
+            result = self._execute(
+                command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=request,
+                instance=instance,
+                isolate=isolate,
+                cancel_flag=cancel_flag,
+                progress=progress,
+            )
+        if cache_key and cache_ttl:
+            self.result_cache.set(cache_key, result, timeout=cache_ttl)
+        return result
+
+    def _execute(
+        self,
+        command: ManagementCommand,
+        *,
+        args: Sequence[Any],
+        options: Dict[str, Any],
+        stdin_binary: BinaryIO,
+        request: Optional[HttpRequest],
+        instance: Optional[BaseCommand],
+        isolate: Optional[bool],
+        cancel_flag: Optional[CancelFlag],
+        progress: Optional[ProgressReporter],
+    ) -> ExecutionResult:
+        if isolate is None:
+            isolate = self.should_isolate(command)
+        if isolate:
+            result = self.worker_pool.run(
+                command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                output_limits=self.output_limits,
+                stdin_encoding=self.get_stdin_encoding(command),
+                cancel_flag=cancel_flag,
+                cancel_grace_period=self.cancel_grace_period,
+                progress=progress,
+            )
+        else:
+            result = execute_command(
+                command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=request,
+                instance=instance,
+                output_limits=self.output_limits,
+                stdin_encoding=self.get_stdin_encoding(command),
+                cancel_flag=cancel_flag,
+                progress=progress,
+            )
+        self.on_run_finished(command, options=options, result=result, request=request)
+        return result
+
+    def on_run_finished(
+        self,
+        command: ManagementCommand,
+        *,
+        options: Dict[str, Any],
+        result: ExecutionResult,
+        request: Optional[HttpRequest] = None,
+    ) -> None:
+        """
+        Called when a command run has finished (however it was run), to record metrics and history.
+        """
+        self.record_metrics(command, result=result)
+        self.record_run(command, options=options, result=result, request=request)
+
+    def record_metrics(self, command: ManagementCommand, *, result: ExecutionResult) -> None:
+        labels = {"command": command.full_name}
+        metrics.execution_seconds.observe(result.duration, **labels)
+        metrics.runs_total.inc(**labels)
+        if result.error:
+            metrics.failures_total.inc(**labels)
+        if result.exited:
+            metrics.exits_total.inc(**labels)
+
+    def execute_job(
+        self,
+        command: ManagementCommand,
+        *,
+        stdout: Optional[TextIO] = None,
+        stderr: Optional[TextIO] = None,
+        **kwargs,
+    ) -> ExecutionResult:
+        """
+        Execute a background job's command (see `JobManager`).
+
+        If the job store gives output streams, in-process runs write their output to them as it is written.
+        """
+        if stdout is None or stderr is None or self.should_isolate(command):
+            return self.execute(command, **kwargs)
+        result = self.execute_streamed(command, stdout=stdout, stderr=stderr, **kwargs)
+        self.on_run_finished(command, options=kwargs["options"], result=result, request=kwargs.get("request"))
+        return result
+
+    def get_job_store(self) -> Optional[JobStore]:
+        """
+        Get the store for background job state and output (see `store_jobs_in_database`), if any.
+        """
+        if not (self.store_jobs_in_database and apps.is_installed("django_managerie.history")):
+            return None
+        from django_managerie.history.jobs import DatabaseJobStore
+
+        return DatabaseJobStore(get_command=self._get_registered_command)
+
+    def _get_registered_command(self, full_name: str) -> Optional[ManagementCommand]:
+        entry = self.registry.get(full_name)
+        return entry.command if entry else None
+
+    def execute_streamed(
+        self,
+        command: ManagementCommand,
+        *,
+        stdout: TextIO,
+        stderr: TextIO,
+        **kwargs,
+    ) -> ExecutionResult:
+        """
+        Execute the command in-process, writing its output to the given streams (see `stream_command_output`).
+
+        If the concurrency limit is reached, the result has a `ConcurrencyLimitReached` error.
+        """
+        try:
+            with self.limit_concurrency(command):
+                result = execute_command(
+                    command,
+                    stdout=stdout,
+                    stderr=stderr,
+                    stdin_encoding=self.get_stdin_encoding(command),
+                    **kwargs,
+                )
+        except ConcurrencyLimitReached as exc:
+            return ExecutionResult(stdout="", stderr="", duration=0, error=exc)
+        return result
+
+    def limit_concurrency(self, command: ManagementCommand) -> ContextManager[None]:
+        """
+        Get a context manager that holds a slot in the command's and the site's concurrency limits (if any).
+
+        Slots are file locks, so limits apply across processes on the same host.
+        """
+        limits = []
+        command_limit = self.get_command_attribute(
+            command,
+            "managerie_max_concurrency",
+            self.concurrency_limits.get(command.full_name),
+        )
+        if command_limit:
+            limits.append((f"command.{command.full_name}", command_limit, command.full_name))
+        if self.max_concurrent_runs:
+            limits.append(("site", self.max_concurrent_runs, "commands"))
+        timeout = self.get_command_attribute(command, "managerie_concurrency_wait", self.concurrency_wait)
+        return concurrency_slots(limits, timeout=timeout, namespace=self.get_concurrency_namespace())
+
+    def get_concurrency_namespace(self) -> str:
+        if self.concurrency_namespace:
+            return self.concurrency_namespace
+        return f"{get_default_namespace()}.{self.admin_site.name}"
+
+    def record_run(
+        self,
+        command: ManagementCommand,
+        *,
+        options: Dict[str, Any],
+        result: ExecutionResult,
+        request: Optional[HttpRequest] = None,
+    ) -> None:
+        """
+        Record a command run in the execution history, if enabled.
+
+        The run is written to the database later, in bulk (see `django_managerie.history.recorder`).
+        """
+        if not (self.record_runs and apps.is_installed("django_managerie.history")):
+            return
+        from django_managerie.history.recorder import record_run
+
+        user = getattr(request, "user", None)
+        user_id = user.pk if (user is not None and user.is_authenticated) else None
+        record_run(command, options=options, result=result, user_id=user_id)
+
+    def rebuild_registry(self) -> None:
+        """
+        Rebuild the command registry (e.g. after commands have been added or removed at runtime).
+        """
+        self.registry.rebuild()
+        schema_cache.invalidate()
+
+    def warm_form_schemas(self) -> None:
+        """
+        Precompute the form schemas of all enabled commands, e.g. at startup.
+
+        Note that this imports all enabled command modules.
+        """
+        for entry in self.registry.entries.values():
+            if not entry.enabled:
+                continue
+            try:
+                get_command_schema(entry.command)
+            except Exception as exc:
+                warnings.warn(f"Could not build form schema for {entry.full_name}: {exc!r}")
 
     def patch(self) -> None:
         if hasattr(self.admin_site, "patched_by_managerie"):
@@ -47,6 +442,7 @@ class Managerie:
         self.admin_site.get_app_list = patched_get_app_list  # type: ignore[assignment]
         self.admin_site.get_urls = patched_get_urls  # type: ignore[assignment]
         self.admin_site.patched_by_managerie = True  # type: ignore[attr-defined]
+        self.admin_site.managerie = self  # type: ignore[attr-defined]
 
     def is_command_allowed(
         self,
@@ -56,12 +452,12 @@ class Managerie:
         """
         Return True if the command is allowed to be run in the current request.
 
-        The default implementation checks if the command is enabled and then
-        whether the user is a superuser.
+        The default implementation checks if the command is enabled
+        (as precomputed in the registry) and then whether the user is a superuser.
 
         This can be overridden to implement per-command permissions.
         """
-        if not self.is_command_enabled(command):
+        if not self.registry.is_enabled(command):
             return False
         return user_is_superuser(request)
 
@@ -69,37 +465,144 @@ class Managerie:
         """
         Return True if the command is enabled (not blocklisted or opt-outed).
 
-        This is only called by `is_command_allowed` as a pre-check before
+        This is called once per command when the registry is built;
+        the result is then used by `is_command_allowed` as a pre-check before
         checking for per-request permissions.
         """
         if command.full_name in COMMAND_BLOCKLIST:
             return False
-        if getattr(command.get_command_class(), "disable_managerie", False):
+        return not self.get_command_attribute(command, "disable_managerie", False)
+
+    def should_run_in_background(self, command: ManagementCommand) -> bool:
+        """
+        Return True if the command should be run as a background job instead of within the request.
+        """
+        return bool(self.get_command_attribute(command, "managerie_background", self.background_by_default))
+
+    def should_stream_output(self, command: ManagementCommand) -> bool:
+        """
+        Return True if the command's output should be streamed to the client as it is written.
+        """
+        if self.should_isolate(command):
             return False
-        return True
+        return bool(self.get_command_attribute(command, "managerie_streaming", self.streaming_by_default))
+
+    def should_isolate(self, command: ManagementCommand) -> bool:
+        """
+        Return True if the command should be run in a separate worker process.
+        """
+        return bool(self.get_command_attribute(command, "managerie_isolated", self.isolated_by_default))
+
+    def get_result_cache_ttl(self, command: ManagementCommand) -> Optional[float]:
+        """
+        Get how long (in seconds) the command's results may be cached, or None if they shouldn't be.
+        """
+        return self.get_command_attribute(command, "managerie_cache_ttl", None)
+
+    def get_stdin_encoding(self, command: ManagementCommand) -> str:
+        return self.get_command_attribute(command, "managerie_stdin_encoding", self.stdin_encoding)
+
+    def get_command_attribute(self, command: ManagementCommand, name: str, default: Any = None) -> Any:
+        """
+        Get a class attribute of the command's class.
+
+        If `static_discovery` is enabled and the attribute is one of those that can be
+        read statically, the command's module is not imported.
+        """
+        if self.static_discovery and name in STATIC_ATTRIBUTES:
+            metadata = command.get_static_metadata()
+            if metadata is not None:
+                return metadata.get(name, default)
+        return getattr(command.get_command_class(), name, default)
 
     def get_commands(
         self,
         request: HttpRequest,
     ) -> Dict[AppConfig, CommandMap]:
-        command_map: Dict[AppConfig, CommandMap] = {}
-        for app_config, commands in get_commands().items():
-            command_map[app_config] = {
-                command_name: command
-                for (command_name, command) in commands.items()
-                if self.is_command_allowed(command=command, request=request)
+        """
+        Get the commands allowed for the request, for all apps.
+
+        The result may come from the cache (see `command_cache_timeout`).
+        """
+        allowed_names = self.get_allowed_command_names(request)
+        return {
+            app_config: {
+                command_name: entries[command_name].command
+                for command_name in allowed_names.get(app_config.label, ())
+                if command_name in entries
             }
-        return command_map
+            for (app_config, entries) in self.registry.get_by_app().items()
+        }
+
+    def get_allowed_command_names(self, request: HttpRequest) -> Dict[str, List[str]]:
+        """
+        Get the names of the commands allowed for the request, by app label.
+
+        If `command_cache_timeout` is set and `get_command_cache_key` returns a key for the request,
+        the result is cached in Django's cache framework.
+        """
+        cache_key = None
+        if self.command_cache_timeout is not None:
+            key = self.get_command_cache_key(request)
+            if key is not None:
+                # The registry fingerprint changes whenever commands are added, removed, enabled or disabled.
+                cache_key = f"managerie:commands:{self.admin_site.name}:{self.registry.fingerprint}:{key}"
+        command_cache = caches[self.command_cache_alias]
+        if cache_key:
+            allowed_names = command_cache.get(cache_key, version=self.command_cache_version)
+            if allowed_names is not None:
+                return allowed_names
+        allowed_names = {
+            app_config.label: list(self._filter_allowed(request, entries))
+            for (app_config, entries) in self.registry.get_by_app().items()
+        }
+        if cache_key:
+            command_cache.set(
+                cache_key,
+                allowed_names,
+                timeout=self.command_cache_timeout,
+                version=self.command_cache_version,
+            )
+        return allowed_names
+
+    def get_command_cache_key(self, request: HttpRequest) -> Optional[str]:
+        """
+        Get the key under which the commands allowed for the request are cached, or None to not cache them.
+
+        The key must identify everything `is_command_allowed` depends on.  The default implementation
+        (matching the default `is_command_allowed`) uses the user's ID and active/staff/superuser flags;
+        override this if you override `is_command_allowed` (e.g. to return a key based on the user's permissions).
+        """
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        flags = "".join(
+            str(int(bool(getattr(user, flag, False)))) for flag in ("is_active", "is_staff", "is_superuser")
+        )
+        return f"user:{user.pk}:{flags}"
 
     def get_commands_for_app_label(
         self,
         request: HttpRequest,
         app_label: str,
     ) -> CommandMap:
-        for app_config, commands in self.get_commands(request).items():
-            if app_config.label == app_label:
-                return commands
-        return {}
+        """
+        Get the commands allowed for the request in an app.
+
+        This is never cached, since it's used for checking whether a command may be run.
+        """
+        return self._filter_allowed(request, self.registry.get_app_entries(app_label))
+
+    def _filter_allowed(
+        self,
+        request: HttpRequest,
+        entries: Dict[str, RegistryEntry],
+    ) -> CommandMap:
+        return {
+            command_name: entry.command
+            for (command_name, entry) in entries.items()
+            if entry.enabled and self.is_command_allowed(command=entry.command, request=request)
+        }
 
     def _augment_app_list(
         self,
@@ -108,12 +611,13 @@ class Managerie:
     ):
         # TODO: apps without models won't have their commands shown here since they
         #       don't show up in the app_list. We should probably show them anyway.
-        all_commands: Dict[str, CommandMap] = {
-            app_config.label: commands for (app_config, commands) in self.get_commands(request).items()
-        }
-        for app in app_list:
-            if all_commands.get(app["app_label"]):  # Has commands?
-                app.setdefault("models", []).append(self._make_app_command(app))
+        with metrics.app_list_seconds.time():
+            all_commands: Dict[str, CommandMap] = {
+                app_config.label: commands for (app_config, commands) in self.get_commands(request).items()
+            }
+            for app in app_list:
+                if all_commands.get(app["app_label"]):  # Has commands?
+                    app.setdefault("models", []).append(self._make_app_command(app))
 
     def _make_app_command(self, app):
         return {
@@ -127,23 +631,107 @@ class Managerie:
             "object_name": "_ManagerieCommands_",
         }
 
+    def _get_view_classes(self) -> "Dict[str, Type[View[Any]]]":
+        if self.async_views:
+            from django_managerie.async_views import (
+                AsyncManagerieAPIExecuteView,
+                AsyncManagerieAPIJobView,
+                AsyncManagerieAPIListView,
+                AsyncManagerieAPISchemaView,
+                AsyncManagerieBatchView,
+                AsyncManagerieCommandView,
+                AsyncManagerieJobView,
+                AsyncManagerieListView,
+            )
+
+            return {
+                "api_execute": AsyncManagerieAPIExecuteView,
+                "api_job": AsyncManagerieAPIJobView,
+                "api_list": AsyncManagerieAPIListView,
+                "api_schema": AsyncManagerieAPISchemaView,
+                "batch": AsyncManagerieBatchView,
+                "command": AsyncManagerieCommandView,
+                "job": AsyncManagerieJobView,
+                "list": AsyncManagerieListView,
+            }
+        from django_managerie.api import (
+            ManagerieAPIExecuteView,
+            ManagerieAPIJobView,
+            ManagerieAPIListView,
+            ManagerieAPISchemaView,
+            ManagerieBatchView,
+        )
+        from django_managerie.views import ManagerieCommandView, ManagerieJobView, ManagerieListView
+
+        return {
+            "api_execute": ManagerieAPIExecuteView,
+            "api_job": ManagerieAPIJobView,
+            "api_list": ManagerieAPIListView,
+            "api_schema": ManagerieAPISchemaView,
+            "batch": ManagerieBatchView,
+            "command": ManagerieCommandView,
+            "job": ManagerieJobView,
+            "list": ManagerieListView,
+        }
+
     def _get_urls(self) -> List[URLPattern]:
-        from django_managerie.views import ManagerieCommandView, ManagerieListView
+        from django_managerie.views import ManagerieArtifactView, ManagerieMetricsView
 
+        views = self._get_view_classes()
         return [
+            path(
+                "managerie/-/metrics/",
+                ManagerieMetricsView.as_view(),
+                name="managerie_metrics",
+            ),
+            path(
+                "managerie/-/artifacts/<name>",
+                ManagerieArtifactView.as_view(),
+                name="managerie_artifact",
+            ),
+            path(
+                "managerie/-/jobs/<job_id>/",
+                views["job"].as_view(managerie=self),
+                name="managerie_job",
+            ),
+            path(
+                "managerie/-/api/jobs/<job_id>/",
+                views["api_job"].as_view(managerie=self),
+                name="managerie_api_job",
+            ),
+            path(
+                "managerie/-/batch/",
+                views["batch"].as_view(managerie=self),
+                name="managerie_batch",
+            ),
+            path(
+                "managerie/-/api/commands/",
+                views["api_list"].as_view(managerie=self),
+                name="managerie_api_list",
+            ),
+            path(
+                "managerie/-/api/commands/<app_label>/<command>/schema/",
+                views["api_schema"].as_view(managerie=self),
+                name="managerie_api_schema",
+            ),
+            path(
+                "managerie/-/api/commands/<app_label>/<command>/execute/",
+                views["api_execute"].as_view(managerie=self),
+                name="managerie_api_execute",
+            ),
             path(
                 "managerie/<app_label>/<command>/",
-                ManagerieCommandView.as_view(managerie=self),
+                views["command"].as_view(managerie=self),
                 name="managerie_command",
             ),
             path(
                 "managerie/<app_label>/",
-                ManagerieListView.as_view(managerie=self),
+                views["list"].as_view(managerie=self),
                 name="managerie_list",
             ),
             path(
                 "managerie/",
-                ManagerieListView.as_view(managerie=self),
+                views["list"].as_view(managerie=self),
                 name="managerie_list_all",
             ),
         ]
@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+#: The default histogram buckets (in seconds).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float("inf"))
+
+#: A hook is called with the metric, the value (an increment or an observation) and the labels
+#: whenever a metric is updated, e.g. to forward metrics to StatsD.
+MetricHook = Callable[["Metric", float, Dict[str, str]], None]
+
+LabelValues = Tuple[str, ...]
+
+log = logging.getLogger(__name__)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for (name, value) in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, label_names: Sequence[str]) -> None:
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _get_label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self.registry.call_hooks(self, amount, labels)
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._get_label_values(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != float("inf"):
+            self.buckets += (float("inf"),)
+        # label values -> (per-bucket counts (not cumulative), sum)
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        index = next(i for (i, bound) in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+        self.registry.call_hooks(self, value, labels)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observe the (monotonic) time taken by the body of the `with` block, in seconds.
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def get_count(self, **labels: str) -> int:
+        counts, _ = self._values.get(self._get_label_values(labels), ([], 0.0))
+        return sum(counts)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for (key, (counts, total)) in self._values.items())
+        for label_values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.label_names + ("le",), label_values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A collection of (in-process) metrics that can be rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+        self.hooks: List[MetricHook] = []
+
+    def counter(self, name: str, help: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(self, name, help, label_names, buckets=buckets))
+
+    def _register(self, metric):  # type: ignore[no-untyped-def]
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add_hook(self, hook: MetricHook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: MetricHook) -> None:
+        self.hooks.remove(hook)
+
+    def call_hooks(self, metric: Metric, value: float, labels: Dict[str, str]) -> None:
+        for hook in self.hooks:
+            try:
+                hook(metric, value, labels)
+            except Exception:  # A broken hook mustn't break (or skip) the code being measured
+                log.exception("Metric hook %r failed for %s", hook, metric.name)
+
+    def render(self) -> str:
+        return "".join(f"{line}\n" for metric in self.metrics.values() for line in metric.render())
+
+
+registry = MetricsRegistry()
+
+discovery_seconds = registry.histogram(
+    "managerie_discovery_seconds",
+    "Time spent discovering management commands and building the command registry.",
+)
+app_list_seconds = registry.histogram(
+    "managerie_app_list_seconds",
+    "Time spent adding commands to the admin app list.",
+)
+form_build_seconds = registry.histogram(
+    "managerie_form_build_seconds",
+    "Time spent building command forms.",
+    ["command"],
+)
+execution_seconds = registry.histogram(
+    "managerie_execution_seconds",
+    "Command execution time.",
+    ["command"],
+)
+runs_total = registry.counter("managerie_runs_total", "Command runs.", ["command"])
+failures_total = registry.counter("managerie_failures_total", "Command runs that raised an exception.", ["command"])
+exits_total = registry.counter("managerie_exits_total", "Command runs that called sys.exit().", ["command"])
+cache_hits_total = registry.counter("managerie_cache_hits_total", "Command results served from the cache.", ["command"])
@@ -0,0 +1,102 @@
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from django_managerie.artifacts import create_artifact
+
+PROFILE_CPU = "cpu"
+PROFILE_CPU_MEMORY = "cpu+memory"
+
+PROFILE_CHOICES = [
+    ("", "Off"),
+    (PROFILE_CPU, "CPU (cProfile)"),
+    (PROFILE_CPU_MEMORY, "CPU and memory allocations (cProfile and tracemalloc; slow)"),
+]
+
+# Only one profiler can be active per process on Python 3.12+ (and tracemalloc is process-wide anyway).
+_profiling_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """
+    Raised when a run can't be profiled because another profiler is active in the process.
+    """
+
+    def __init__(self, message: str = "Another run is being profiled; try again later") -> None:
+        super().__init__(message)
+
+
+@dataclass
+class ProfileReport:
+    #: The top functions by cumulative time, as formatted by `pstats`.
+    functions: str
+    #: The top allocation sites (if memory allocations were traced).
+    allocations: Optional[str]
+    #: The name of the `.prof` artifact (loadable with `pstats`, snakeviz, etc.).
+    prof_name: str
+
+
+class Profiler:
+    """
+    A context manager that profiles the code run within it (in the current thread only).
+
+    After the block, `report` holds a `ProfileReport` with the top `limit` functions
+    (and allocation sites, if `trace_memory` is set).
+
+    Profiled runs are serialized per process; entering raises `ProfilerBusy` if another profiler is active.
+    """
+
+    def __init__(self, *, trace_memory: bool = False, limit: int = 30) -> None:
+        self.trace_memory = trace_memory
+        self.limit = limit
+        self.report: Optional[ProfileReport] = None
+        self._profile = cProfile.Profile()
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        if not _profiling_lock.acquire(blocking=False):
+            raise ProfilerBusy()
+        try:
+            self._profile.enable()
+        except ValueError as ve:  # Another profiler (e.g. a developer's) is active on Python 3.12+
+            _profiling_lock.release()
+            raise ProfilerBusy(f"Another profiler is active: {ve}") from ve
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            self._profile.disable()
+            allocations = None
+            if self.trace_memory:
+                allocations = self._format_allocations(tracemalloc.take_snapshot())
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+        finally:
+            _profiling_lock.release()
+        self._profile.create_stats()
+        prof_name, prof_file = create_artifact("prof")
+        with prof_file:
+            marshal.dump(self._profile.stats, prof_file)  # type: ignore[attr-defined]
+        self.report = ProfileReport(
+            functions=self._format_functions(),
+            allocations=allocations,
+            prof_name=prof_name,
+        )
+
+    def _format_functions(self) -> str:
+        buf = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=buf)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.limit)
+        return buf.getvalue().strip()
+
+    def _format_allocations(self, snapshot: tracemalloc.Snapshot) -> str:
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        return "\n".join(str(stat) for stat in snapshot.statistics("lineno")[: self.limit])
@@ -0,0 +1,126 @@
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from django.core.cache import caches
+from django.core.management import BaseCommand
+
+
+@dataclass
+class Progress:
+    done: float
+    total: Optional[float]
+    message: str
+    started_at: float
+    updated_at: float
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.total:
+            return None
+        return min(1.0, max(0.0, self.done / self.total))
+
+    @property
+    def rate(self) -> Optional[float]:
+        """
+        The throughput (units done per second).
+        """
+        elapsed = self.updated_at - self.started_at
+        return (self.done / elapsed) if elapsed > 0 else None
+
+    @property
+    def eta(self) -> Optional[float]:
+        """
+        The estimated time remaining (in seconds), based on the average throughput so far.
+        """
+        rate = self.rate
+        if not (self.total and rate):
+            return None
+        return max(0.0, (self.total - self.done) / rate)
+
+    def to_json(self) -> Dict[str, Any]:
+        fraction = self.fraction
+        return {
+            **asdict(self),
+            "percent": (round(fraction * 100, 1) if fraction is not None else None),
+            "rate": self.rate,
+            "eta": self.eta,
+        }
+
+
+class ProgressStore:
+    """
+    Stores runs' progress in Django's cache framework, so any process sharing the cache can read it.
+
+    Reading a run's progress is a single cache lookup.
+    """
+
+    def __init__(
+        self,
+        *,
+        alias: str = "default",
+        interval: float = 0.5,
+        timeout: int = 24 * 60 * 60,
+        key_prefix: str = "managerie:progress:",
+    ) -> None:
+        self.alias = alias
+        self.interval = interval
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def get(self, run_id: str) -> Optional[Progress]:
+        data = caches[self.alias].get(f"{self.key_prefix}{run_id}")
+        return Progress(**data) if data else None
+
+    def set(self, run_id: str, progress: Progress) -> None:
+        caches[self.alias].set(f"{self.key_prefix}{run_id}", asdict(progress), timeout=self.timeout)
+
+    def get_reporter(self, run_id: str) -> "ProgressReporter":
+        return ProgressReporter(self, run_id)
+
+
+class ProgressReporter:
+    """
+    Reports a run's progress to a `ProgressStore`, at most once per the store's `interval`
+    (the first and final reports are always stored).
+
+    Commands run by Managerie have one as `self._managerie_progress`; see `report_progress`.
+    """
+
+    def __init__(self, store: ProgressStore, run_id: str) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.started_at = time.time()
+        self._last_report = 0.0
+
+    def report(self, done: float, total: Optional[float] = None, message: str = "") -> None:
+        now = time.time()
+        finished = total is not None and done >= total
+        if now - self._last_report < self.store.interval and not finished:
+            return
+        self._last_report = now
+        self.store.set(
+            self.run_id,
+            Progress(done=done, total=total, message=message, started_at=self.started_at, updated_at=now),
+        )
+
+
+def report_progress(command: BaseCommand, done: float, total: Optional[float] = None, message: str = "") -> None:
+    """
+    Report the progress of the command's run (under Managerie), e.g. `report_progress(self, 1000, 50000, "rows")`.
+
+    Outside Managerie (or for runs whose progress isn't tracked), this does nothing.
+    """
+    reporter = getattr(command, "_managerie_progress", None)
+    if reporter:
+        reporter.report(done, total, message)
+
+
+class ProgressMixin:
+    """
+    A mixin for management commands that adds `self.managerie_progress(done, total, message)`
+    (see `report_progress`).
+    """
+
+    def managerie_progress(self, done: float, total: Optional[float] = None, message: str = "") -> None:
+        report_progress(self, done, total, message)  # type: ignore[arg-type]
@@ -0,0 +1,127 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, NamedTuple, Optional
+
+from django.apps.config import AppConfig
+
+from django_managerie import metrics
+from django_managerie.commands import ManagementCommand, discovery
+
+
+@dataclass(frozen=True)
+class RegistryEntry:
+    command: ManagementCommand
+    enabled: bool
+
+    @property
+    def full_name(self) -> str:
+        return self.command.full_name
+
+    @property
+    def title(self) -> str:
+        return self.command.title
+
+    @property
+    def command_class(self) -> Optional[type]:
+        """
+        The command class, if it has already been resolved (imported).
+        """
+        return self.command.resolved_command_class
+
+
+class _RegistryState(NamedTuple):
+    entries: Dict[str, RegistryEntry]
+    by_app: Dict[AppConfig, Dict[str, RegistryEntry]]
+    by_app_label: Dict[str, Dict[str, RegistryEntry]]
+    generation: int
+    fingerprint: str
+
+
+def _get_fingerprint(entries: Dict[str, RegistryEntry]) -> str:
+    data = "\n".join(f"{full_name}:{int(entry.enabled)}" for (full_name, entry) in entries.items())
+    return hashlib.sha1(data.encode()).hexdigest()[:16]
+
+
+class CommandRegistry:
+    """
+    A precomputed map of all management commands, keyed by full name.
+
+    The registry is built lazily on first access, and rebuilt when command discovery
+    notices that commands have been added or removed (see `CommandDiscovery`);
+    call `rebuild()` to refresh it immediately.
+
+    The `is_enabled` callable is used to compute the (request-independent)
+    enabled flag for each command at build time.
+    """
+
+    def __init__(self, is_enabled: Callable[[ManagementCommand], bool]) -> None:
+        self._is_enabled = is_enabled
+        self._lock = threading.Lock()
+        self._state: Optional[_RegistryState] = None
+
+    def _build(self) -> _RegistryState:
+        with metrics.discovery_seconds.time():
+            return self._build_state()
+
+    def _build_state(self) -> _RegistryState:
+        # Read before discovering commands, so concurrent changes cause another rebuild rather than being missed.
+        generation = discovery.generation
+        entries: Dict[str, RegistryEntry] = OrderedDict()
+        by_app: Dict[AppConfig, Dict[str, RegistryEntry]] = OrderedDict()
+        for app_config, commands in discovery.get_commands().items():
+            app_entries = by_app.setdefault(app_config, OrderedDict())
+            for command_name, command in commands.items():
+                entry = RegistryEntry(command=command, enabled=self._is_enabled(command))
+                entries[command.full_name] = app_entries[command_name] = entry
+        by_app_label = {app_config.label: app_entries for (app_config, app_entries) in by_app.items()}
+        return _RegistryState(
+            entries=entries,
+            by_app=by_app,
+            by_app_label=by_app_label,
+            generation=generation,
+            fingerprint=_get_fingerprint(entries),
+        )
+
+    @property
+    def state(self) -> _RegistryState:
+        discovery.get_commands()  # Cheap, unless it's time to check for changes
+        state = self._state
+        if state is None or state.generation != discovery.generation:
+            with self._lock:
+                if self._state is None or self._state.generation != discovery.generation:
+                    self._state = self._build()
+                state = self._state
+        return state
+
+    def rebuild(self) -> None:
+        """
+        Discard the current registry contents and build them anew.
+        """
+        with self._lock:
+            self._state = self._build()
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A digest of the registry's contents (command names and enabled flags); stable across processes.
+        """
+        return self.state.fingerprint
+
+    @property
+    def entries(self) -> Dict[str, RegistryEntry]:
+        return self.state.entries
+
+    def get(self, full_name: str) -> Optional[RegistryEntry]:
+        return self.state.entries.get(full_name)
+
+    def is_enabled(self, command: ManagementCommand) -> bool:
+        entry = self.get(command.full_name)
+        return bool(entry and entry.enabled)
+
+    def get_by_app(self) -> Dict[AppConfig, Dict[str, RegistryEntry]]:
+        return self.state.by_app
+
+    def get_app_entries(self, app_label: str) -> Dict[str, RegistryEntry]:
+        return self.state.by_app_label.get(app_label, {})
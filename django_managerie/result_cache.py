@@ -0,0 +1,84 @@
+import dataclasses
+import hashlib
+import io
+import json
+import time
+from typing import Any, BinaryIO, Dict, Optional, Sequence
+
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from django_managerie.commands import ManagementCommand
+from django_managerie.execution import ExecutionResult
+
+#: Options that don't affect a command's result.
+IGNORED_OPTIONS = {"stdout", "stderr", "no_color", "force_color", "traceback"}
+
+
+def _hash_stdin(stdin_binary: BinaryIO) -> Optional[str]:
+    # Hash the stream's contents without reading it all into memory, and rewind it for the command.
+    try:
+        position = stdin_binary.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    digest = hashlib.sha256()
+    while chunk := stdin_binary.read(1024 * 1024):
+        digest.update(chunk)
+    stdin_binary.seek(position)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Caches successful command results in Django's cache framework.
+
+    Results are keyed by the command's full name, its normalized arguments and options, and a hash of standard input.
+    Results with more than `max_size` characters of output, or whose output was truncated, aren't cached.
+    """
+
+    def __init__(self, *, alias: str = "default", max_size: int = 1024 * 1024, key_prefix: str = "managerie") -> None:
+        self.alias = alias
+        self.max_size = max_size
+        self.key_prefix = key_prefix
+
+    def get_key(
+        self,
+        command: ManagementCommand,
+        *,
+        args: Sequence[Any],
+        options: Dict[str, Any],
+        stdin_binary: BinaryIO,
+    ) -> Optional[str]:
+        """
+        Get the cache key for a run, or None if the run can't be cached (i.e. standard input can't be rewound).
+        """
+        stdin_hash = _hash_stdin(stdin_binary)
+        if stdin_hash is None:
+            return None
+        normalized_options = {name: value for (name, value) in options.items() if name not in IGNORED_OPTIONS}
+        data = json.dumps(
+            [command.full_name, list(args), normalized_options, stdin_hash],
+            sort_keys=True,
+            cls=DjangoJSONEncoder,
+            default=repr,
+        )
+        return f"{self.key_prefix}:result:{hashlib.sha256(data.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[ExecutionResult]:
+        data = caches[self.alias].get(key)
+        if not data:
+            return None
+        return ExecutionResult(**data)
+
+    def set(self, key: str, result: ExecutionResult, timeout: float) -> bool:
+        """
+        Cache the result, if it's cacheable; return whether it was cached.
+        """
+        if result.error or result.stdout_log or result.stderr_log:
+            return False
+        if len(result.stdout) + len(result.stderr) > self.max_size:
+            return False
+        data = dataclasses.asdict(result)
+        data.update(error=None, error_tb=None, cached_at=time.time())
+        caches[self.alias].set(key, data, timeout=timeout)
+        return True
@@ -0,0 +1,52 @@
+import getpass
+import os
+import stat
+import tempfile
+from typing import IO
+
+from django.conf import settings
+
+
+def get_default_runtime_dir() -> str:
+    """
+    Get the default runtime directory: a per-user directory in the system's temporary directory,
+    so it's shared by the user's processes (web workers, worker processes, the scheduler) but no one else's.
+    """
+    user = str(os.getuid()) if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f"django-managerie-{user}")
+
+
+def _ensure_private_dir(path: str) -> None:
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        raise PermissionError(f"{path} must be owned by the current user and not accessible by others (mode 0700)")
+
+
+def get_runtime_dir(*subdirs: str) -> str:
+    """
+    Get (creating it, if needed) a private directory for Managerie's files (e.g. artifacts and locks).
+
+    The base directory is the `MANAGERIE_RUNTIME_DIR` setting (by default, see `get_default_runtime_dir`).
+    It and the subdirectories are created with mode 0700, and `PermissionError` is raised if they
+    are owned by another user or accessible by others (e.g. when someone else created them first).
+    """
+    path = getattr(settings, "MANAGERIE_RUNTIME_DIR", None) or get_default_runtime_dir()
+    _ensure_private_dir(path)
+    for subdir in subdirs:
+        path = os.path.join(path, subdir)
+        _ensure_private_dir(path)
+    return path
+
+
+def create_private_file(path: str, mode: str = "w+b", **kwargs) -> IO:
+    """
+    Create and open a new file that's only readable by the current user; fail if it already exists.
+    """
+    flags = os.O_CREAT | os.O_EXCL | (os.O_RDWR if "+" in mode else os.O_WRONLY) | getattr(os, "O_BINARY", 0)
+    return os.fdopen(os.open(path, flags, 0o600), mode, **kwargs)
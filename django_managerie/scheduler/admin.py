@@ -0,0 +1,56 @@
+from django import forms
+from django.contrib import admin, messages
+from django.utils import timezone
+
+from django_managerie.api import get_options_form
+from django_managerie.scheduler.models import ScheduledCommand
+from django_managerie.scheduler.runner import get_default_managerie
+
+
+class ScheduledCommandForm(forms.ModelForm):
+    class Meta:
+        model = ScheduledCommand
+        fields = ("name", "command", "options", "interval", "enabled", "next_run_at")
+
+    def __init__(self, *args, managerie, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.managerie = managerie
+        names = sorted(name for (name, entry) in managerie.registry.entries.items() if entry.enabled)
+        self.fields["command"].widget = forms.Select(choices=[("", "---------")] + [(name, name) for name in names])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        entry = self.managerie.registry.get(cleaned_data.get("command") or "")
+        options = cleaned_data.get("options")
+        if entry and entry.enabled and isinstance(options, dict):
+            options_form = get_options_form(entry.command, options)
+            if not options_form.is_valid():
+                self.add_error("options", options_form.errors.as_text())
+        elif entry and entry.enabled:
+            self.add_error("options", "Options must be an object.")
+        return cleaned_data
+
+
+@admin.register(ScheduledCommand)
+class ScheduledCommandAdmin(admin.ModelAdmin):
+    form = ScheduledCommandForm
+    list_display = ("name", "command", "interval", "enabled", "next_run_at", "last_run_at", "last_status")
+    list_filter = ("enabled", "last_status")
+    search_fields = ("name", "command")
+    readonly_fields = ("last_run_at", "last_status", "last_duration")
+    actions = ["run_now"]
+
+    def get_form(self, request, obj=None, change=False, **kwargs):
+        form_class = super().get_form(request, obj, change, **kwargs)
+        managerie = getattr(self.admin_site, "managerie", None) or get_default_managerie()
+
+        class BoundScheduledCommandForm(form_class):  # type: ignore[valid-type,misc]
+            def __init__(self, *args, **kwargs) -> None:
+                super().__init__(*args, managerie=managerie, **kwargs)
+
+        return BoundScheduledCommandForm
+
+    @admin.action(description="Run selected scheduled commands as soon as possible")
+    def run_now(self, request, queryset) -> None:
+        count = queryset.update(next_run_at=timezone.now())
+        self.message_user(request, f"{count} scheduled commands will be run shortly.", messages.SUCCESS)
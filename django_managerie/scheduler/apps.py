@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ManagerieSchedulerConfig(AppConfig):
+    name = "django_managerie.scheduler"
+    label = "managerie_scheduler"
+    verbose_name = "Managerie Scheduler"
+    default_auto_field = "django.db.models.BigAutoField"
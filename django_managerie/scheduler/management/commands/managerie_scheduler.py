@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+
+from django_managerie.scheduler.runner import Scheduler, get_default_managerie
+
+
+class Command(BaseCommand):
+    help = "Run scheduled Managerie commands (until interrupted)."
+    disable_managerie = True  # This runs until interrupted
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run the commands that are due, then exit")
+        parser.add_argument("--poll-interval", type=float, default=10.0, help="Check for due runs this often")
+        parser.add_argument("--max-workers", type=int, default=2, help="Run at most this many commands at once")
+
+    def handle(self, *, once, poll_interval, max_workers, **options):
+        scheduler = Scheduler(get_default_managerie(), poll_interval=poll_interval, max_workers=max_workers)
+        if once:
+            for future in scheduler.run_pending():
+                future.result()
+            scheduler.stop()
+            return
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            scheduler.stop()
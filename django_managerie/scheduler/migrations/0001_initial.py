@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledCommand",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=200)),
+                (
+                    "command",
+                    models.CharField(help_text="The full name (app label and name) of the command", max_length=200),
+                ),
+                (
+                    "options",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text='Options as they would be entered in the command\'s form, e.g. {"verbosity": "2"}',
+                    ),
+                ),
+                ("interval", models.DurationField(help_text="How often to run the command (e.g. 01:00:00 for hourly)")),
+                ("enabled", models.BooleanField(default=True)),
+                (
+                    "next_run_at",
+                    models.DateTimeField(blank=True, help_text="Leave empty to run as soon as possible", null=True),
+                ),
+                ("last_run_at", models.DateTimeField(blank=True, editable=False, null=True)),
+                ("last_status", models.CharField(blank=True, editable=False, max_length=64)),
+                ("last_duration", models.FloatField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                "ordering": ("name",),
+                "indexes": [models.Index(fields=["enabled", "next_run_at"], name="managerie_schedule_due_idx")],
+            },
+        ),
+    ]
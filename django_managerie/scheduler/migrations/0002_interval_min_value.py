@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:31
+
+import datetime
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("managerie_scheduler", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="scheduledcommand",
+            name="interval",
+            field=models.DurationField(
+                help_text="How often to run the command (e.g. 01:00:00 for hourly)",
+                validators=[django.core.validators.MinValueValidator(datetime.timedelta(seconds=1))],
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.validators import MinValueValidator
+from django.db import models
+
+#: The shortest interval a command can be scheduled at.
+MIN_INTERVAL = timedelta(seconds=1)
+
+
+class ScheduledCommand(models.Model):
+    name = models.CharField(max_length=200)
+    command = models.CharField(max_length=200, help_text="The full name (app label and name) of the command")
+    options = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Options as they would be entered in the command\'s form, e.g. {"verbosity": "2"}',
+    )
+    interval = models.DurationField(
+        validators=[MinValueValidator(MIN_INTERVAL)],
+        help_text="How often to run the command (e.g. 01:00:00 for hourly)",
+    )
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(null=True, blank=True, help_text="Leave empty to run as soon as possible")
+    last_run_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_status = models.CharField(max_length=64, blank=True, editable=False)
+    last_duration = models.FloatField(null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ("name",)
+        indexes = [
+            models.Index(fields=["enabled", "next_run_at"], name="managerie_schedule_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
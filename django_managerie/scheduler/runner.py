@@ -0,0 +1,159 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Set
+
+from django.apps import apps
+from django.contrib import admin
+from django.db import close_old_connections
+from django.db.models import Q
+from django.urls import get_resolver
+from django.utils import timezone
+
+from django_managerie.api import get_options_form
+from django_managerie.concurrency import ConcurrencyLimitReached, concurrency_slots
+from django_managerie.execution import ExecutionResult, prepare_execution
+from django_managerie.managerie import Managerie
+from django_managerie.scheduler.models import MIN_INTERVAL, ScheduledCommand
+
+log = logging.getLogger(__name__)
+
+
+def get_default_managerie() -> Managerie:
+    """
+    Get the Managerie that has patched the default admin site (or a plain one, if none has).
+    """
+    get_resolver().url_patterns  # Importing the URLconf patches the admin site(s)
+    return getattr(admin.site, "managerie", None) or Managerie(admin.site)
+
+
+def get_next_run_at(schedule: ScheduledCommand, now: datetime) -> datetime:
+    """
+    Get the first run time after `now` on the schedule's interval grid.
+
+    Missed runs (e.g. while no scheduler was running) are skipped, not caught up on.
+    Intervals shorter than `MIN_INTERVAL` (e.g. saved without validation) are treated as `MIN_INTERVAL`.
+    """
+    interval = max(schedule.interval, MIN_INTERVAL)
+    if schedule.next_run_at is None or schedule.next_run_at > now:
+        return now + interval
+    missed = (now - schedule.next_run_at) // interval
+    return schedule.next_run_at + (missed + 1) * interval
+
+
+class Scheduler:
+    """
+    Runs due `ScheduledCommand`s in-process with a `Managerie`, in a pool of threads.
+
+    Each due run is claimed by atomically advancing the schedule's `next_run_at`, so any number of
+    schedulers (e.g. one per web process) can run against the same database without duplicating runs.
+    A schedule's runs never overlap: a run is skipped if the previous one is still going
+    (in any process on the host).
+
+    Call `start()` to poll for due runs on a background thread, or `run_pending()` to run them once.
+    """
+
+    def __init__(self, managerie: Managerie, *, poll_interval: float = 10.0, max_workers: int = 2) -> None:
+        self.managerie = managerie
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="managerie-scheduler")
+        self._running: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="managerie-scheduler-poll", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=wait)
+
+    def run_forever(self) -> None:
+        """
+        Poll for due runs in the current thread until `stop()` is called.
+        """
+        self._poll()
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception:
+                log.exception("Failed to run scheduled commands")
+            finally:
+                close_old_connections()
+            self._stop.wait(self.poll_interval)
+
+    def run_pending(self, now: Optional[datetime] = None) -> List[Future]:
+        """
+        Start the runs that are due; return futures for their `ExecutionResult`s.
+        """
+        now = now or timezone.now()
+        due = ScheduledCommand.objects.filter(Q(next_run_at__isnull=True) | Q(next_run_at__lte=now), enabled=True)
+        futures = []
+        for schedule in due:
+            with self._lock:
+                if schedule.pk in self._running:
+                    continue
+            if not self._claim(schedule, now):
+                continue  # Another scheduler got to it first
+            with self._lock:
+                self._running.add(schedule.pk)
+            futures.append(self._executor.submit(self._run, schedule, now))
+        return futures
+
+    def _claim(self, schedule: ScheduledCommand, now: datetime) -> bool:
+        updated = ScheduledCommand.objects.filter(pk=schedule.pk, next_run_at=schedule.next_run_at).update(
+            next_run_at=get_next_run_at(schedule, now),
+        )
+        return updated == 1
+
+    def _run(self, schedule: ScheduledCommand, started_at: datetime) -> ExecutionResult:
+        # Pool threads aren't covered by Django's request lifecycle signals.
+        close_old_connections()
+        try:
+            try:
+                limits = [(f"schedule.{schedule.pk}", 1, schedule.name)]
+                with concurrency_slots(limits, namespace=self.managerie.get_concurrency_namespace()):
+                    result = self.run_schedule(schedule)
+            except ConcurrencyLimitReached as clr:
+                log.warning("Skipping scheduled run of %s: %s", schedule.name, clr)
+                result = ExecutionResult(stdout="", stderr="", duration=0, error=clr)
+            ScheduledCommand.objects.filter(pk=schedule.pk).update(
+                last_run_at=started_at,
+                last_status=("skipped" if isinstance(result.error, ConcurrencyLimitReached) else result.status),
+                last_duration=result.duration,
+            )
+            if apps.is_installed("django_managerie.history"):
+                from django_managerie.history.recorder import recorder
+
+                recorder.flush()
+            return result
+        finally:
+            with self._lock:
+                self._running.discard(schedule.pk)
+            close_old_connections()
+
+    def run_schedule(self, schedule: ScheduledCommand) -> ExecutionResult:
+        """
+        Run the schedule's command with its options (validated with the command's form).
+        """
+        entry = self.managerie.registry.get(schedule.command)
+        if not (entry and entry.enabled):
+            log.error("Scheduled command %s (%s) is not available", schedule.name, schedule.command)
+            return ExecutionResult(stdout="", stderr="", duration=0, error=LookupError(schedule.command))
+        form = get_options_form(entry.command, schedule.options)
+        if not form.is_valid():
+            log.error("Scheduled command %s has invalid options: %s", schedule.name, form.errors.as_text())
+            return ExecutionResult(stdout="", stderr="", duration=0, error=ValueError(form.errors.as_text()))
+        args, options, stdin_binary = prepare_execution(form.cleaned_data)
+        return self.managerie.execute(entry.command, args=args, options=options, stdin_binary=stdin_binary)
@@ -0,0 +1,121 @@
+import ast
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+#: Class attributes that can be read from a command module's source without importing it.
+STATIC_ATTRIBUTES = {
+    "help",
+    "disable_managerie",
+    "managerie_accepts_stdin",
+}
+
+#: Base classes whose attributes we know don't affect `STATIC_ATTRIBUTES`
+#: (other than `help`, which defaults to an empty string).
+KNOWN_BASE_CLASSES = {
+    "BaseCommand",
+    "AppCommand",
+    "LabelCommand",
+    "ProgressMixin",  # django_managerie.progress
+}
+
+
+def _get_base_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _get_bound_names(node: ast.stmt) -> List[str]:
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [(alias.asname or alias.name) for alias in node.names]
+    if isinstance(node, ast.Assign):
+        return [target.id for target in node.targets if isinstance(target, ast.Name)]
+    if isinstance(node, (ast.AnnAssign, ast.AugAssign)) and isinstance(node.target, ast.Name):
+        return [node.target.id]
+    if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+        return [node.name]
+    return []
+
+
+def _is_command_attribute(node: ast.expr) -> bool:
+    return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "Command"
+
+
+def _modifies_command_class(tree: ast.Module) -> bool:
+    # e.g. `Command.disable_managerie = True` or `setattr(Command, "help", ...)` outside the class body
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and any(_is_command_attribute(target) for target in node.targets):
+            return True
+        if isinstance(node, (ast.AnnAssign, ast.AugAssign)) and _is_command_attribute(node.target):
+            return True
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in ("setattr", "delattr")
+            and node.args
+            and isinstance(node.args[0], ast.Name)
+            and node.args[0].id == "Command"
+        ):
+            return True
+    return False
+
+
+def _find_command_class(tree: ast.Module) -> Optional[ast.ClassDef]:
+    command_class: Optional[ast.ClassDef] = None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Command":
+            command_class = node
+        elif command_class and "Command" in _get_bound_names(node):
+            # `Command` is rebound after the class definition; bail out to be safe.
+            return None
+    return command_class
+
+
+def _get_assignments(class_def: ast.ClassDef) -> Iterable[Tuple[str, ast.expr]]:
+    for stmt in class_def.body:
+        if isinstance(stmt, ast.Assign):
+            for target in stmt.targets:
+                if isinstance(target, ast.Name):
+                    yield (target.id, stmt.value)
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.value:
+            yield (stmt.target.id, stmt.value)
+
+
+def read_command_metadata(source: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the literal values of `STATIC_ATTRIBUTES` from the `Command` class in the given module source.
+
+    Returns None if the metadata can't be reliably determined without importing the module,
+    e.g. if there is no top-level `Command` class (it may be imported from elsewhere),
+    if it derives from a class that may define those attributes itself, if any of the attributes is
+    assigned something other than a literal, or if the class is modified after its definition.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    command_class = _find_command_class(tree)
+    if not command_class or _modifies_command_class(tree):
+        return None
+    if any(_get_base_name(base) not in KNOWN_BASE_CLASSES for base in command_class.bases):
+        return None
+    metadata: Dict[str, Any] = {}
+    for name, value in _get_assignments(command_class):
+        if name not in STATIC_ATTRIBUTES:
+            continue
+        try:
+            metadata[name] = ast.literal_eval(value)
+        except Exception:
+            # Not a literal (e.g. `disable_managerie = not settings.DEBUG`); only importing can tell.
+            return None
+    return metadata
+
+
+def read_command_metadata_from_file(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    return read_command_metadata(source)
@@ -0,0 +1,88 @@
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Optional
+
+
+class MmapReader(io.RawIOBase):
+    """
+    A seekable, read-only raw stream over a memory-mapped file.
+
+    The memory map is available as the `mmap` attribute, for commands that want to access
+    the data directly (e.g. `sys.stdin.buffer.raw.mmap`).
+    """
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        super().__init__()
+        self.mmap = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        data = self.mmap[self._pos : self._pos + len(buffer)]
+        n = len(data)
+        buffer[:n] = data
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self.mmap)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self.mmap.close()
+        super().close()
+
+
+def _get_fileno(fileobj) -> Optional[int]:  # type: ignore[no-untyped-def]
+    try:
+        return fileobj.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def open_uploaded_stdin(uploaded_file, use_mmap: bool = False) -> BinaryIO:  # type: ignore[no-untyped-def]
+    """
+    Get a binary stream for an uploaded file to be used as standard input, without copying it.
+
+    If `use_mmap` is set and the file is on disk (see `TemporaryFileUploadHandler`), it's memory-mapped.
+    """
+    fileobj = uploaded_file.file
+    fileobj.seek(0)
+    if use_mmap and _get_fileno(fileobj) is not None and uploaded_file.size:
+        return io.BufferedReader(MmapReader(fileobj))  # type: ignore[return-value]
+    return fileobj
+
+
+def detach_stdin(stdin_binary: BinaryIO, max_memory_size: int = 1024 * 1024) -> BinaryIO:
+    """
+    Get a stdin stream that outlives the request it came from (e.g. for background jobs).
+
+    Streams backed by a file (such as uploads spooled to disk) get a duplicated file descriptor,
+    so the data isn't copied, and remains readable even after the upload's temporary file is deleted.
+    Other streams are copied into a spooled temporary file.
+    """
+    fileno = _get_fileno(stdin_binary)
+    if fileno is not None:
+        detached = os.fdopen(os.dup(fileno), "rb")
+        detached.seek(stdin_binary.tell())
+        return detached
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+    shutil.copyfileobj(stdin_binary, spooled)
+    spooled.seek(0)
+    return spooled  # type: ignore[return-value]
@@ -0,0 +1,72 @@
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, TextIO
+
+_stdin_var: ContextVar[Optional[TextIO]] = ContextVar("managerie_stdin", default=None)
+_stdout_var: ContextVar[Optional[TextIO]] = ContextVar("managerie_stdout", default=None)
+_stderr_var: ContextVar[Optional[TextIO]] = ContextVar("managerie_stderr", default=None)
+_install_lock = threading.Lock()
+
+
+class ContextStream:
+    """
+    A proxy for a standard stream that dispatches to the stream set for the current execution context,
+    or to the original stream if none is set.
+
+    Since context variables are local to threads (and asyncio tasks), concurrent command executions
+    each see their own streams, and unrelated threads keep writing to the original streams.
+    """
+
+    def __init__(self, var: ContextVar[Optional[TextIO]], fallback: TextIO) -> None:
+        self._var = var
+        self._fallback = fallback
+
+    def _get_target(self) -> TextIO:
+        return self._var.get() or self._fallback
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_target(), name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_target())
+
+    def __repr__(self) -> str:
+        return f"<ContextStream {self._var.name} -> {self._get_target()!r}>"
+
+
+def install() -> None:
+    """
+    Install the context-dispatching proxies as `sys.stdin`, `sys.stdout` and `sys.stderr`, if not already installed.
+    """
+    with _install_lock:
+        for name, var in (("stdin", _stdin_var), ("stdout", _stdout_var), ("stderr", _stderr_var)):
+            current = getattr(sys, name)
+            if not isinstance(current, ContextStream):
+                setattr(sys, name, ContextStream(var, current))
+
+
+@contextmanager
+def capture_stdio(
+    *,
+    stdin: Optional[TextIO] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+):
+    """
+    Redirect `sys.stdin`, `sys.stdout` and `sys.stderr` to the given streams in the current execution context only.
+
+    Note that threads started within the context won't see the redirected streams.
+    """
+    install()
+    tokens = [
+        (var, var.set(stream))
+        for (var, stream) in ((_stdin_var, stdin), (_stdout_var, stdout), (_stderr_var, stderr))
+        if stream is not None
+    ]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
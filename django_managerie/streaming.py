@@ -0,0 +1,149 @@
+import io
+import json
+import queue
+import threading
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Sequence, TextIO, Tuple, cast
+
+from django.db import close_old_connections
+from django.http import HttpRequest, StreamingHttpResponse
+
+from django_managerie.cancellation import CancelFlag
+from django_managerie.commands import ManagementCommand
+from django_managerie.execution import ExecutionResult, execute_command
+
+_END = object()
+
+
+class QueueStream(io.TextIOBase):
+    """
+    A write-only text stream that puts written chunks into a bounded queue, tagged with a stream name.
+
+    Writes block while the queue is full, so a slow reader slows the writer down instead of
+    letting buffered output grow without bounds.  Once `reader_gone` is set, writes are discarded.
+    """
+
+    def __init__(self, chunk_queue: "queue.Queue[Any]", name: str, reader_gone: threading.Event) -> None:
+        super().__init__()
+        self.chunk_queue = chunk_queue
+        self.stream_name = name
+        self.reader_gone = reader_gone
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if s:
+            _put(self.chunk_queue, (self.stream_name, s), self.reader_gone)
+        return len(s)
+
+
+def _put(chunk_queue: "queue.Queue[Any]", item: Any, reader_gone: threading.Event) -> None:
+    while not reader_gone.is_set():
+        try:
+            chunk_queue.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+
+def stream_command_output(
+    command: ManagementCommand,
+    *,
+    args: Sequence[Any],
+    options: Dict[str, Any],
+    stdin_binary: BinaryIO,
+    request: Optional[HttpRequest] = None,
+    max_queued_chunks: int = 256,
+    on_result: Optional[Callable[[ExecutionResult], None]] = None,
+    execute: Callable[..., ExecutionResult] = execute_command,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Execute a command in a separate thread, yielding `(stream name, chunk)` tuples as output is written.
+
+    The command is run with the `execute` callable (by default, `execute_command`), which is passed
+    the output streams as `stdout` and `stderr`.
+
+    The last item yielded is `("end", ExecutionResult)`.  If given, `on_result` is called with the result
+    in the executing thread, even if the client has gone away.  The run is cancelled (see `CancelFlag`)
+    when the client goes away.
+    """
+    chunk_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queued_chunks)
+    reader_gone = threading.Event()
+    cancel_flag = CancelFlag()
+
+    def run() -> None:
+        close_old_connections()
+        try:
+            result = execute(
+                command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=request,
+                stdout=cast(TextIO, QueueStream(chunk_queue, "stdout", reader_gone)),
+                stderr=cast(TextIO, QueueStream(chunk_queue, "stderr", reader_gone)),
+                cancel_flag=cancel_flag,
+            )
+            if on_result:
+                on_result(result)
+            _put(chunk_queue, ("end", result), reader_gone)
+        finally:
+            close_old_connections()
+            _put(chunk_queue, _END, reader_gone)
+
+    thread = threading.Thread(target=run, name=f"managerie-stream-{command.full_name}", daemon=True)
+    thread.start()
+    try:
+        while (item := chunk_queue.get()) is not _END:
+            yield item
+    finally:
+        reader_gone.set()
+        cancel_flag.set()
+
+
+def _format_end(result: ExecutionResult) -> Dict[str, Any]:
+    return {
+        "status": result.status,
+        "duration": round(result.duration, 6),
+        "error": (str(result.error) if result.error else None),
+        "error_tb": result.error_tb,
+    }
+
+
+def format_text(items: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+    for name, chunk in items:
+        if name == "end":
+            end = _format_end(chunk)
+            if end["error_tb"]:
+                yield f"\n{end['error_tb']}"
+            yield f"\n--- {end['status']} in {end['duration']:.3f} seconds ---\n"
+        else:
+            yield chunk
+
+
+def format_sse(items: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+    for name, chunk in items:
+        data = json.dumps(_format_end(chunk)) if name == "end" else chunk
+        data_lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+        yield f"event: {name}\n{data_lines}\n"
+
+
+def format_ndjson(items: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+    for name, chunk in items:
+        data = _format_end(chunk) if name == "end" else {"data": chunk}
+        yield json.dumps({"stream": name, **data}) + "\n"
+
+
+def create_streaming_response(request: HttpRequest, items: Iterator[Tuple[str, Any]]) -> StreamingHttpResponse:
+    """
+    Create a streaming response for the output items.
+
+    Server-sent events are used if the client accepts them, otherwise the output is streamed as plain text.
+    """
+    if "text/event-stream" in request.headers.get("Accept", ""):
+        response = StreamingHttpResponse(format_sse(items), content_type="text/event-stream")
+    else:
+        response = StreamingHttpResponse(format_text(items), content_type="text/plain; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Ask nginx & co. not to buffer the response
+    return response
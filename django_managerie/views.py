@@ -1,38 +1,79 @@
-import io
-import sys
-import time
-import traceback
-from contextlib import contextmanager, redirect_stderr, redirect_stdout
+import functools
+from datetime import datetime, timezone
 from itertools import chain
-from typing import Any, BinaryIO, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from django import forms
 from django.apps import apps
 from django.apps.config import AppConfig
 from django.contrib.auth.mixins import AccessMixin
-from django.http import Http404, HttpResponse
+from django.core.exceptions import PermissionDenied
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.core.management import BaseCommand
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.generic import FormView, TemplateView
 
+from django_managerie import metrics
+from django_managerie.artifacts import get_artifact_path
 from django_managerie.commands import ManagementCommand
-from django_managerie.forms import ArgumentParserForm
-from django_managerie.managerie import Managerie
+from django_managerie.concurrency import ConcurrencyLimitReached
+from django_managerie.execution import ExecutionResult, prepare_execution, redirect_stdin_binary  # noqa: F401
+from django_managerie.forms import ArgumentParserForm, get_command_schema
+from django_managerie.jobs import Job, JobQueueFull
+from django_managerie.managerie import Managerie, user_is_superuser
+from django_managerie.profiling import PROFILE_CHOICES, PROFILE_CPU_MEMORY, Profiler, ProfilerBusy
+from django_managerie.streaming import create_streaming_response, stream_command_output
+from django_managerie.types import CommandMap
 
 
-@contextmanager
-def redirect_stdin_binary(input_bin_stream: BinaryIO):
-    old_stdin = sys.stdin
-    try:
-        sys.stdin = io.TextIOWrapper(input_bin_stream, encoding="UTF-8")
-        assert sys.stdin.buffer is input_bin_stream
-        yield
-    finally:
-        sys.stdin = old_stdin
+def get_artifact_url(name: Optional[str]) -> Optional[str]:
+    return reverse("admin:managerie_artifact", args=(name,)) if name else None
+
+
+def get_result_context(result: ExecutionResult) -> Dict[str, Any]:
+    """
+    Get the template context for displaying an execution result.
+    """
+    return {
+        "error": result.error,
+        "error_tb": result.error_tb,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "duration": result.duration,
+        "stdout_log_url": get_artifact_url(result.stdout_log),
+        "stderr_log_url": get_artifact_url(result.stderr_log),
+        "cached_at": (datetime.fromtimestamp(result.cached_at, tz=timezone.utc) if result.cached_at else None),
+    }
+
+
+def get_job_for_request(
+    managerie: Managerie,
+    request: HttpRequest,
+    job_id: str,
+    *,
+    with_output: bool = False,
+) -> Optional[Job]:
+    """
+    Get a job, if it exists and the request's user may see it (it's theirs, or they're a superuser).
+    """
+    job = managerie.jobs.get(job_id, with_output=with_output)
+    if not job or not (job.user_id == request.user.pk or user_is_superuser(request)):
+        return None
+    return job
 
 
 class ManagerieBaseMixin:
     managerie: Optional[Managerie] = None
+    request: HttpRequest
     kwargs: Dict[str, Any]
     _app: Optional[AppConfig]
+    _command_map: Dict[AppConfig, CommandMap]
+    _app_command_map: CommandMap
 
     def get_app(self) -> Optional[AppConfig]:
         if hasattr(self, "_app"):
@@ -42,6 +83,28 @@ class ManagerieBaseMixin:
             return self._app
         return None
 
+    def get_command_map(self) -> Dict[AppConfig, CommandMap]:
+        """
+        Get the map of all commands allowed for the current request (memoized for the request).
+        """
+        if not hasattr(self, "_command_map"):
+            assert self.managerie
+            self._command_map = self.managerie.get_commands(request=self.request)
+        return self._command_map
+
+    def get_app_command_map(self) -> CommandMap:
+        """
+        Get the map of commands allowed for the current request in the current app (memoized for the request).
+        """
+        if not hasattr(self, "_app_command_map"):
+            app = self.get_app()
+            assert app and self.managerie
+            self._app_command_map = self.managerie.get_commands_for_app_label(
+                request=self.request,
+                app_label=app.label,
+            )
+        return self._app_command_map
+
 
 class StaffRequiredMixin(AccessMixin):
     """
@@ -63,48 +126,66 @@ class ManagerieListView(ManagerieBaseMixin, StaffRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context["app"] = app = self.get_app()
         context["title"] = f"{app.verbose_name if app else 'All Apps'} – Commands"
-        managerie = self.managerie
-        assert managerie
         commands: Iterable[ManagementCommand]
         if app:
-            commands = managerie.get_commands_for_app_label(
-                request=self.request,
-                app_label=app.label,
-            ).values()
+            commands = self.get_app_command_map().values()
         else:
-            commands = chain(
-                *(app_commands.values() for app_commands in managerie.get_commands(request=self.request).values()),
-            )
+            commands = chain(*(app_commands.values() for app_commands in self.get_command_map().values()))
         context["commands"] = sorted(commands, key=lambda cmd: cmd.full_title)
         return context
 
 
 class ManagerieCommandView(ManagerieBaseMixin, StaffRequiredMixin, FormView):
     template_name = "django_managerie/admin/command.html"
+    _command_object: ManagementCommand
+    _command_instance: BaseCommand
 
     @property
     def command_name(self) -> str:
         return self.kwargs["command"]
 
-    def get_command_object(self) -> ManagementCommand:
-        app = self.get_app()
-        managerie = self.managerie
-        assert app and managerie
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        # Uploads for commands accepting standard input are streamed straight to disk (never into memory),
+        # so they can be passed to the command as-is.  Upload handlers can't be changed after the
+        # request body has been parsed, so CSRF protection (which reads POST data) is applied here instead.
+        if request.method == "POST" and self._accepts_stdin_leniently():
+            request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+    def _accepts_stdin_leniently(self) -> bool:
+        # Not raising errors here; they'll be raised (after permission checks) later.
         try:
-            return managerie.get_commands_for_app_label(
-                request=self.request,
-                app_label=app.label,
-            )[self.command_name]
-        except KeyError:
-            raise Http404(
-                f"Command {self.command_name} not found in {app.label} (or you don't have permission to run it)",
-            )
+            command = self.get_app_command_map().get(self.command_name)
+        except LookupError:
+            return False
+        return bool(command and getattr(command.get_command_class(), "managerie_accepts_stdin", False))
+
+    def get_command_object(self) -> ManagementCommand:
+        if not hasattr(self, "_command_object"):
+            try:
+                self._command_object = self.get_app_command_map()[self.command_name]
+            except KeyError:
+                app = self.get_app()
+                assert app
+                raise Http404(
+                    f"Command {self.command_name} not found in {app.label} (or you don't have permission to run it)",
+                )
+        return self._command_object
+
+    def get_command_instance(self) -> BaseCommand:
+        """
+        Get the command instance for this request (memoized for the request).
+        """
+        if not hasattr(self, "_command_instance"):
+            self._command_instance = self.get_command_object().get_command_instance()
+        return self._command_instance
 
     def get_form(self, form_class=None) -> ArgumentParserForm:
-        cmd = self.get_command_object().get_command_instance()
-        parser = cmd.create_parser("django", self.command_name)
-        form = ArgumentParserForm(parser=parser, **self.get_form_kwargs())
-        if getattr(cmd, "managerie_accepts_stdin", False):
+        command = self.get_command_object()
+        with metrics.form_build_seconds.time(command=command.full_name):
+            form = ArgumentParserForm(schema=get_command_schema(command), **self.get_form_kwargs())
+        if getattr(command.get_command_class(), "managerie_accepts_stdin", False):
             form.fields["_managerie_stdin_file"] = forms.FileField(
                 label="Input file",
                 required=False,
@@ -115,6 +196,19 @@ class ManagerieCommandView(ManagerieBaseMixin, StaffRequiredMixin, FormView):
                 help_text="Used only if input file is not set",
                 required=False,
             )
+        if self.managerie and self.managerie.get_result_cache_ttl(command):
+            form.fields["_managerie_refresh_cache"] = forms.BooleanField(
+                label="Refresh cached result",
+                required=False,
+                help_text="Run the command even if a cached result is available",
+            )
+        if user_is_superuser(self.request):
+            form.fields["_managerie_profile"] = forms.ChoiceField(
+                label="Profile this run",
+                choices=PROFILE_CHOICES,
+                required=False,
+                help_text="Profiled runs are always run in-process, in the foreground and without streaming",
+            )
         return form
 
     def get_context_data(self, **kwargs) -> Dict[str, Any]:
@@ -123,58 +217,165 @@ class ManagerieCommandView(ManagerieBaseMixin, StaffRequiredMixin, FormView):
         context.update(
             app=self.get_app(),
             command=command,
-            command_help=command.get_command_instance().help,
+            command_help=command.get_command_class().help,
             title=command.full_title,
             has_file_field=context["form"].is_multipart(),
         )
         return context
 
     def form_valid(self, form: ArgumentParserForm) -> HttpResponse:
-        # This mimics BaseCommand.run_from_argv():
-        options = dict(form.cleaned_data)
-        # "Move positional args out of options to mimic legacy optparse"
-        args = options.pop("args", ())
-
-        # Handle input
-        if stdin_file := form.cleaned_data.pop("_managerie_stdin_file", None):
-            stdin_binary = stdin_file.file
-        elif stdin_content := form.cleaned_data.pop("_managerie_stdin_content", None):
-            stdin_binary = io.BytesIO(stdin_content.encode("UTF-8"))
-        else:
-            stdin_binary = io.BytesIO()
-
-        stdout = io.StringIO()
-        stderr = io.StringIO()
-        error = None
-        error_tb = None
-        t0 = time.time()
-        co = self.get_command_object()
-        with redirect_stdin_binary(stdin_binary), redirect_stdout(stdout), redirect_stderr(stderr):
-            options.update(
-                {
-                    "traceback": True,
-                    "no_color": True,
-                    "force_color": False,
-                    "stdout": stdout,
-                    "stderr": stderr,
-                },
-            )
-            cmd = co.get_command_instance()
+        try:
+            return self.run_command(form)
+        except ConcurrencyLimitReached as clr:
+            form.add_error(None, str(clr))
+            return self.render_to_response(self.get_context_data(form=form), status=429)
+        except ProfilerBusy as pb:
+            form.add_error(None, str(pb))
+            return self.render_to_response(self.get_context_data(form=form), status=409)
+
+    def run_command(self, form: ArgumentParserForm) -> HttpResponse:
+        managerie = self.managerie
+        assert managerie
+        command = self.get_command_object()
+        profile_mode = form.cleaned_data.pop("_managerie_profile", None)
+        refresh_cache = form.cleaned_data.pop("_managerie_refresh_cache", False)
+        args, options, stdin_binary = prepare_execution(
+            form.cleaned_data,
+            stdin_encoding=managerie.get_stdin_encoding(command),
+            stdin_mmap=managerie.get_command_attribute(command, "managerie_stdin_mmap", False),
+        )
+        if profile_mode:
+            profiler = Profiler(trace_memory=(profile_mode == PROFILE_CPU_MEMORY))
+            with profiler:
+                result = managerie.execute(
+                    command,
+                    args=args,
+                    options=options,
+                    stdin_binary=stdin_binary,
+                    request=self.request,
+                    instance=self.get_command_instance(),
+                    isolate=False,
+                    use_result_cache=False,  # Profile the command, not the cache lookup
+                )
+            return self.render_result(form, result, profile=profiler.report)
+        if managerie.should_run_in_background(command):
             try:
-                cmd._managerie_request = self.request
-                cmd.execute(*args, **options)
-            except SystemExit as se:  # We don't want any stray sys.exit()s to quit the app server
-                stderr.write(f"<exit: {se}>")
-            except Exception as exc:
-                error = exc
-                error_tb = traceback.format_exc()
-        context = self.get_context_data(
-            executed=True,
-            form=form,
-            error=error,
-            error_tb=error_tb,
-            stdout=stdout.getvalue(),
-            stderr=stderr.getvalue(),
-            duration=(time.time() - t0),
+                job = managerie.jobs.submit(
+                    command,
+                    args=args,
+                    options=options,
+                    stdin_binary=stdin_binary,
+                    request=self.request,
+                )
+            except JobQueueFull as jqf:
+                form.add_error(None, str(jqf))
+                return self.render_to_response(self.get_context_data(form=form), status=503)
+            return redirect(
+                reverse("admin:managerie_job", kwargs={"job_id": job.id}, current_app=managerie.admin_site.name),
+            )
+        if managerie.should_stream_output(command):
+            items = stream_command_output(
+                command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                request=self.request,
+                on_result=functools.partial(self._finish_streamed_run, command, options),
+                execute=managerie.execute_streamed,
+            )
+            return create_streaming_response(self.request, items)  # type: ignore[return-value]
+        result = managerie.execute(
+            command,
+            args=args,
+            options=options,
+            stdin_binary=stdin_binary,
+            request=self.request,
+            instance=self.get_command_instance(),
+            refresh_cache=refresh_cache,
         )
-        return self.render_to_response(context=context, status=(400 if error else 200))
+        return self.render_result(form, result)
+
+    def render_result(self, form: ArgumentParserForm, result: ExecutionResult, **kwargs) -> HttpResponse:
+        context = self.get_context_data(executed=True, form=form, **get_result_context(result), **kwargs)
+        return self.render_to_response(context=context, status=(400 if result.error else 200))
+
+    def _finish_streamed_run(
+        self,
+        command: ManagementCommand,
+        options: Dict[str, Any],
+        result: ExecutionResult,
+    ) -> None:
+        assert self.managerie
+        self.managerie.on_run_finished(command, options=options, result=result, request=self.request)
+
+
+class ManagerieJobView(ManagerieBaseMixin, StaffRequiredMixin, TemplateView):
+    template_name = "django_managerie/admin/job.html"
+    #: How often (in seconds) the job page polls for new output while the job is unfinished.
+    refresh_interval = 2
+
+    def get_job(self) -> Job:
+        managerie = self.managerie
+        assert managerie
+        job = get_job_for_request(managerie, self.request, self.kwargs["job_id"], with_output=True)
+        if not job:
+            raise Http404("Job not found")
+        return job
+
+    def post(self, request: HttpRequest, job_id: str) -> HttpResponse:
+        """
+        Cancel the job (the page's "Cancel" button).
+        """
+        assert self.managerie
+        job = self.get_job()
+        if "cancel" in request.POST:
+            self.managerie.jobs.cancel(job)
+        return redirect(request.get_full_path())
+
+    def get_context_data(self, **kwargs) -> Dict[str, Any]:
+        assert self.managerie
+        context = super().get_context_data(**kwargs)
+        job = self.get_job()
+        result = job.result
+        context.update(
+            app=job.command.app_config,
+            command=job.command,
+            job=job,
+            title=f"{job.command.full_title} – Job {job.id}",
+            refresh_interval=(None if job.is_finished else self.refresh_interval),
+            job_api_url=reverse(
+                "admin:managerie_api_job",
+                kwargs={"job_id": job.id},
+                current_app=self.managerie.admin_site.name,
+            ),
+            executed=job.is_finished,
+            duration=job.duration,
+        )
+        if result:
+            context.update(get_result_context(result), duration=job.duration)
+        return context
+
+
+class ManagerieArtifactView(StaffRequiredMixin, View):
+    """
+    Serve an artifact (e.g. a complete output log) for download.
+
+    Artifact names are unguessable random tokens, only shown to the user who ran the command.
+    """
+
+    def get(self, request: HttpRequest, name: str) -> FileResponse:
+        path = get_artifact_path(name)
+        if not path:
+            raise Http404("Artifact not found")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
+
+
+class ManagerieMetricsView(StaffRequiredMixin, View):
+    """
+    Expose Managerie's metrics in the Prometheus text format (to superusers only).
+    """
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        if not user_is_superuser(request):
+            raise PermissionDenied("Metrics are only available to superusers")
+        return HttpResponse(metrics.registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
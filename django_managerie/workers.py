@@ -0,0 +1,286 @@
+import io
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import warnings
+from multiprocessing.connection import Connection
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence
+
+from django_managerie.cancellation import CancelFlag, RunCancelled
+from django_managerie.capture import OutputLimits
+from django_managerie.commands import ManagementCommand
+from django_managerie.execution import ExecutionResult, execute_command
+from django_managerie.progress import ProgressReporter
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+class WorkerError(Exception):
+    """
+    An error that occurred in a worker process (or while communicating with it).
+    """
+
+
+class WorkerTimeout(WorkerError):
+    pass
+
+
+def _apply_memory_limit(memory_limit: Optional[int]) -> None:
+    if not memory_limit:
+        return
+    if resource is None:
+        warnings.warn("Memory limits are not supported on this platform")
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+#: The signal sent to a worker process to cancel its current run (where supported).
+CANCEL_SIGNAL = getattr(signal, "SIGUSR1", None)
+
+#: The cancel flag of the run in progress in this (worker) process.
+_current_cancel_flag: Optional[CancelFlag] = None
+
+
+def _handle_cancel_signal(signum: int, frame: Any) -> None:
+    if _current_cancel_flag:
+        _current_cancel_flag.set()
+
+
+def _worker_main(conn: Connection, memory_limit: Optional[int]) -> None:
+    global _current_cancel_flag
+    import django
+
+    django.setup()
+    from django.apps import apps
+
+    _apply_memory_limit(memory_limit)
+    if CANCEL_SIGNAL is not None:
+        signal.signal(CANCEL_SIGNAL, _handle_cancel_signal)
+    conn.send("ready")
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        app_label, command_name, args, options, stdin, output_limits, stdin_encoding, progress = message
+        command = ManagementCommand(apps.get_app_config(app_label), command_name)
+        # `stdin` is either the path of a file to read, or the data itself.
+        stdin_binary = open(stdin, "rb") if isinstance(stdin, str) else io.BytesIO(stdin)
+        _current_cancel_flag = CancelFlag()
+        with stdin_binary:
+            result = execute_command(
+                command,
+                args=args,
+                options=options,
+                stdin_binary=stdin_binary,
+                output_limits=output_limits,
+                stdin_encoding=stdin_encoding,
+                cancel_flag=_current_cancel_flag,
+                progress=progress,
+            )
+        _current_cancel_flag = None
+        if result.error and not result.cancelled:
+            # The original exception may not be picklable.
+            result.error = WorkerError(f"{type(result.error).__name__}: {result.error}")
+        conn.send(result)
+
+
+def _get_stdin_path(stdin_binary: BinaryIO) -> Optional[str]:
+    name = getattr(stdin_binary, "name", None)
+    if isinstance(name, str) and os.path.isfile(name) and stdin_binary.tell() == 0:
+        return name
+    return None
+
+
+class Worker:
+    def __init__(self, context: Any, memory_limit: Optional[int]) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit),
+            name="managerie-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.runs = 0
+
+    def wait_ready(self) -> None:
+        if not self.ready:
+            if self.conn.recv() != "ready":
+                raise WorkerError("Worker failed to start")
+            self.ready = True
+
+    def cancel(self) -> None:
+        """
+        Ask the worker to cancel its current run (cooperatively; see `CancelFlag`).
+        """
+        if CANCEL_SIGNAL is not None and self.process.pid:
+            os.kill(self.process.pid, CANCEL_SIGNAL)
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+
+class WorkerPool:
+    """
+    A pool of pre-started worker processes (with Django already set up) that run commands in isolation.
+
+    * `size` is the number of worker processes.
+    * `timeout` is the default wall-clock timeout for a run, in seconds; a worker exceeding it is killed and replaced.
+    * `memory_limit` is the address space limit of each worker process, in bytes (where supported).
+    * `max_runs_per_worker` (if set) has workers replaced after that many runs, to contain leaks.
+
+    Workers are started with the "spawn" start method by default (so the Django settings must be configured via
+    the `DJANGO_SETTINGS_MODULE` environment variable), and start up when the pool is first used
+    (or when `start()` is called).
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = 2,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        max_runs_per_worker: Optional[int] = None,
+        start_method: str = "spawn",
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_runs_per_worker = max_runs_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._condition = threading.Condition()
+        self._idle: List[Worker] = []
+        self._started = False
+
+    def _create_worker(self) -> Worker:
+        return Worker(self._context, self.memory_limit)
+
+    def start(self) -> None:
+        with self._condition:
+            if not self._started:
+                self._idle.extend(self._create_worker() for _ in range(self.size))
+                self._started = True
+
+    def _acquire(self) -> Worker:
+        self.start()
+        with self._condition:
+            while not self._idle:
+                self._condition.wait()
+            return self._idle.pop()
+
+    def _release(self, worker: Optional[Worker]) -> None:
+        with self._condition:
+            self._idle.append(worker or self._create_worker())
+            self._condition.notify()
+
+    def run(
+        self,
+        command: ManagementCommand,
+        *,
+        args: Sequence[Any],
+        options: Dict[str, Any],
+        stdin_binary: BinaryIO,
+        timeout: Optional[float] = None,
+        output_limits: Optional[OutputLimits] = None,
+        stdin_encoding: str = "utf-8",
+        cancel_flag: Optional[CancelFlag] = None,
+        cancel_grace_period: float = 10.0,
+        progress: Optional[ProgressReporter] = None,
+    ) -> ExecutionResult:
+        """
+        Run the command in a worker process, and return its result.
+
+        If `stdin_binary` is a file on disk (e.g. an upload spooled to disk), the worker reads it directly
+        instead of it being sent over to the worker.
+
+        When `cancel_flag` is set, the command in the worker is asked to stop (see `CancelFlag`);
+        if it hasn't stopped in `cancel_grace_period` seconds, the worker is killed.
+
+        Progress reported by the command goes to `progress` (whose store must be shared between processes).
+        """
+        stdin = _get_stdin_path(stdin_binary) or stdin_binary.read()
+        message = (
+            command.app_config.label,
+            command.name,
+            tuple(args),
+            options,
+            stdin,
+            output_limits,
+            stdin_encoding,
+            progress,
+        )
+        timeout = timeout if timeout is not None else self.timeout
+        worker = self._acquire()
+        t0 = time.perf_counter()
+        try:
+            worker.wait_ready()
+            t0 = time.perf_counter()
+            worker.conn.send(message)
+            self._wait_for_result(worker, t0=t0, timeout=timeout, cancel_flag=cancel_flag, grace=cancel_grace_period)
+            result = worker.conn.recv()
+        except Exception as exc:
+            worker.kill()
+            self._release(None)
+            if isinstance(exc, EOFError):  # The worker died (e.g. due to running out of memory)
+                exc = WorkerError(f"Worker process died (exit code {worker.process.exitcode})")
+            return ExecutionResult(stdout="", stderr="", duration=(time.perf_counter() - t0), error=exc)
+        worker.runs += 1
+        if self.max_runs_per_worker and worker.runs >= self.max_runs_per_worker:
+            worker.stop()
+            self._release(None)
+        else:
+            self._release(worker)
+        return result
+
+    def _wait_for_result(
+        self,
+        worker: Worker,
+        *,
+        t0: float,
+        timeout: Optional[float],
+        cancel_flag: Optional[CancelFlag],
+        grace: float,
+    ) -> None:
+        if cancel_flag is None:
+            if not worker.conn.poll(timeout):
+                raise WorkerTimeout(f"Command did not finish in {timeout} seconds; the worker was killed")
+            return
+        deadline = (t0 + timeout) if timeout is not None else None
+        kill_at: Optional[float] = None
+        while not worker.conn.poll(0.1):
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                raise WorkerTimeout(f"Command did not finish in {timeout} seconds; the worker was killed")
+            if kill_at is None and cancel_flag.is_set():
+                worker.cancel()
+                kill_at = now + grace
+            elif kill_at is not None and now >= kill_at:
+                raise RunCancelled(f"The run was cancelled, and did not stop in {grace} seconds; the worker was killed")
+
+    def shutdown(self) -> None:
+        with self._condition:
+            workers, self._idle = self._idle, []
+            self._started = False
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    managerie_background = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--message", default="hello from the background")
+
+    def handle(self, message, **options):
+        self.stdout.write(message)
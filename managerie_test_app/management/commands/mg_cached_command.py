@@ -0,0 +1,20 @@
+import time
+
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Reports the time (and its input); results are cached."
+    managerie_cache_ttl = 60
+    managerie_accepts_stdin = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--label", default="now")
+
+    def handle(self, label, **options):
+        self.stdout.write(f"{label}: {time.time()!r} {self.stdin_text()!r}")
+
+    def stdin_text(self):
+        import sys
+
+        return sys.stdin.read()
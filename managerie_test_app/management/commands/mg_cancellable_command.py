@@ -0,0 +1,19 @@
+import time
+
+from django.core.management import BaseCommand
+
+from django_managerie.cancellation import check_cancelled
+
+
+class Command(BaseCommand):
+    help = "Counts slowly until cancelled."
+    managerie_background = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--steps", type=int, default=600)
+
+    def handle(self, steps, **options):
+        for step in range(steps):
+            check_cancelled(self)
+            self.stdout.write(f"step {step}")
+            time.sleep(0.05)
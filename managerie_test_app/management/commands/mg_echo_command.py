@@ -0,0 +1,17 @@
+import time
+
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Prints the given text a number of times, sleeping in between."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--text", default="echo")
+        parser.add_argument("--times", type=int, default=1)
+        parser.add_argument("--sleep", type=float, default=0)
+
+    def handle(self, text, times, sleep, **options):
+        for _ in range(times):
+            print(text)
+            time.sleep(sleep)
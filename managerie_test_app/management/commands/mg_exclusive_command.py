@@ -0,0 +1,9 @@
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Can only be run once at a time."
+    managerie_max_concurrency = 1
+
+    def handle(self, **options):
+        self.stdout.write("Ran exclusively")
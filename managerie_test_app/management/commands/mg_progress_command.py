@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand
+
+from django_managerie.progress import ProgressMixin
+
+
+class Command(ProgressMixin, BaseCommand):
+    help = "Processes some rows, reporting progress."
+    managerie_background = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+
+    def handle(self, rows, **options):
+        for row in range(1, rows + 1):
+            self.managerie_progress(row, rows, "rows")
+        self.stdout.write(f"Processed {rows} rows")
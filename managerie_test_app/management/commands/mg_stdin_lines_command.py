@@ -0,0 +1,16 @@
+import sys
+
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    managerie_accepts_stdin = True
+    managerie_stdin_encoding = "latin-1"
+    managerie_stdin_mmap = True
+
+    def handle(self, **options):
+        n_lines = sum(1 for _ in sys.stdin)
+        sys.stdin.seek(0)
+        first_line = sys.stdin.readline().strip()
+        mmapped = hasattr(sys.stdin.buffer, "raw") and hasattr(sys.stdin.buffer.raw, "mmap")
+        self.stdout.write(f"lines={n_lines} first={first_line} mmapped={mmapped}")
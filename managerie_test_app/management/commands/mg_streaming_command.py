@@ -0,0 +1,15 @@
+import sys
+
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    managerie_streaming = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=3)
+
+    def handle(self, lines, **options):
+        for i in range(lines):
+            self.stdout.write(f"line {i}")
+        print("to stderr", file=sys.stderr)
@@ -14,6 +14,8 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django_managerie",
+    "django_managerie.history",
+    "django_managerie.scheduler",
     "managerie_test_app",
 ]
 
@@ -19,3 +19,16 @@ m.patch()
 urlpatterns = [
     path("admin/", admin.site.urls),
 ]
+
+
+class AsyncManagerie(CustomManagerie):
+    async_views = True
+
+
+async_admin_site = admin.AdminSite(name="async_admin")
+am = AsyncManagerie(async_admin_site)
+am.patch()
+
+urlpatterns += [
+    path("async-admin/", async_admin_site.urls),
+]
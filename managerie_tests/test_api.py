@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+
+def _post_json(client, url, data):
+    return client.post(url, json.dumps(data), content_type="application/json")
+
+
+@pytest.mark.django_db
+def test_batch(admin_client):
+    url = "/admin/managerie/-/batch/"
+    resp = _post_json(
+        admin_client,
+        url,
+        {
+            "command": "managerie_test_app.mg_echo_command",
+            "option_sets": [{"text": f"tenant {i}", "sleep": 0.1} for i in range(4)],
+            "parallelism": 4,
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "succeeded"
+    assert [item["stdout"] for item in data["items"]] == [f"tenant {i}\n" for i in range(4)]
+    assert data["duration"] < 0.35  # Ran in parallel
+
+    resp = _post_json(
+        admin_client,
+        url,
+        {
+            "items": [
+                {"command": "managerie_test_app.mg_test_command", "options": {"string_option": "x"}},
+                {"command": "managerie_test_app.mg_echo_command", "options": {"times": "many"}},
+            ],
+        },
+    )
+    assert resp.status_code == 400
+    assert resp.json()["items"][0]["index"] == 1
+    assert "times" in resp.json()["items"][0]["errors"]
+
+
+@pytest.mark.django_db
+def test_batch_permissions(staff_client):
+    url = "/admin/managerie/-/batch/"
+    resp = _post_json(staff_client, url, {"items": [{"command": "managerie_test_app.mg_test_command"}]})
+    assert resp.status_code == 404
+    resp = _post_json(staff_client, url, {"items": [{"command": "managerie_test_app.mg_unprivileged_command"}]})
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["status"] == "succeeded"
+    assert _post_json(staff_client, url, []).status_code == 400
+
+
+@pytest.mark.django_db
+def test_api_list(admin_client, staff_client):
+    commands = admin_client.get("/admin/managerie/-/api/commands/").json()["commands"]
+    by_name = {c["command"]: c for c in commands}
+    assert "managerie_test_app.mg_disabled_command" not in by_name
+    test_command = by_name["managerie_test_app.mg_test_command"]
+    assert test_command["execute_url"] == "/admin/managerie/-/api/commands/managerie_test_app/mg_test_command/execute/"
+    staff_commands = staff_client.get("/admin/managerie/-/api/commands/").json()["commands"]
+    assert [c["command"] for c in staff_commands] == ["managerie_test_app.mg_unprivileged_command"]
+
+
+@pytest.mark.django_db
+def test_api_schema(admin_client):
+    url = "/admin/managerie/-/api/commands/managerie_test_app/mg_echo_command/schema/"
+    resp = admin_client.get(url)
+    assert resp.status_code == 200
+    arguments = {arg["name"]: arg for arg in resp.json()["arguments"]}
+    assert arguments["times"]["type"] == "integer"
+    assert arguments["times"]["default"] == 1
+    assert resp["Last-Modified"]
+    assert admin_client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code == 304
+    assert admin_client.get(url, HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"]).status_code == 304
+    assert admin_client.get(url, HTTP_IF_NONE_MATCH='"nope"').status_code == 200
+    assert admin_client.get(url.replace("mg_echo", "mg_disabled")).status_code == 404
+
+
+@pytest.mark.django_db
+def test_api_execute(admin_client):
+    url = "/admin/managerie/-/api/commands/managerie_test_app/mg_echo_command/execute/"
+    resp = _post_json(admin_client, url, {"options": {"text": "hi", "times": 2}})
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "succeeded"
+    assert resp.json()["stdout"] == "hi\nhi\n"
+    resp = _post_json(admin_client, url, {"options": {"times": "x"}})
+    assert resp.status_code == 400
+    assert "times" in resp.json()["errors"]
+
+    resp = _post_json(admin_client, url, {"options": {"text": "hi", "times": 3}, "stream": True})
+    assert resp["Content-Type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+    assert "".join(line["data"] for line in lines if line["stream"] == "stdout") == "hi\nhi\nhi\n"
+    assert lines[-1]["stream"] == "end"
+    assert lines[-1]["status"] == "succeeded"
+
+    stdin_url = "/admin/managerie/-/api/commands/managerie_test_app/mg_stdin_command/execute/"
+    resp = _post_json(admin_client, stdin_url, {"options": {"operation": "uppercase"}, "stdin": "shout"})
+    assert "SHOUT" in resp.json()["stdout"]
+
+
+@pytest.mark.django_db
+def test_api_execute_background(admin_client):
+    url = "/admin/managerie/-/api/commands/managerie_test_app/mg_background_command/execute/"
+    resp = _post_json(admin_client, url, {"options": {"message": "later"}})
+    assert resp.status_code == 202
+    assert resp.json()["job_id"]
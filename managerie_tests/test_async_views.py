@@ -0,0 +1,51 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+
+@pytest.fixture()
+def async_admin_client(admin_user):
+    client = AsyncClient()
+    client.force_login(admin_user)
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views(async_admin_client):
+    list_content = async_to_sync(async_admin_client.get)("/async-admin/managerie/").content.decode()
+    assert "Mg Test Command" in list_content
+    url = "/async-admin/managerie/managerie_test_app/mg_echo_command/"
+    resp = async_to_sync(async_admin_client.post)(url, {"text": "async hello", "times": "1", "sleep": "0"})
+    content = resp.content.decode()
+    assert "Command executed successfully." in content
+    assert "async hello" in content
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_streaming(async_admin_client):
+    url = "/async-admin/managerie/managerie_test_app/mg_streaming_command/"
+
+    async def get_content():
+        resp = await async_admin_client.post(url, {"lines": "3"})
+        assert resp.is_async
+        return b"".join([chunk async for chunk in resp.streaming_content]).decode()
+
+    content = async_to_sync(get_content)()
+    assert "line 2\n" in content
+    assert "--- succeeded in" in content
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_no_access():
+    resp = async_to_sync(AsyncClient().get)("/async-admin/managerie/managerie_test_app/mg_test_command/")
+    assert resp.status_code == 302
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_batch(async_admin_client):
+    resp = async_to_sync(async_admin_client.post)(
+        "/async-admin/managerie/-/batch/",
+        {"command": "managerie_test_app.mg_echo_command", "option_sets": [{"text": "a"}, {"text": "b"}]},
+        content_type="application/json",
+    )
+    assert [item["stdout"] for item in resp.json()["items"]] == ["a\n", "b\n"]
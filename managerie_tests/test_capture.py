@@ -0,0 +1,63 @@
+import os
+import re
+import stat
+
+import pytest
+
+from django_managerie.artifacts import get_artifact_path
+from django_managerie.capture import BoundedCapture, OutputLimits
+
+
+def test_bounded_capture_small():
+    capture = BoundedCapture(OutputLimits(head_size=10, tail_size=10))
+    capture.write("hello ")
+    capture.write("world")
+    assert capture.getvalue() == "hello world"
+    assert not capture.truncated
+    assert capture.log_name is None
+
+
+def test_bounded_capture_truncated():
+    capture = BoundedCapture(OutputLimits(head_size=10, tail_size=10))
+    data = "".join(f"{i:04d}\n" for i in range(1000))
+    for i in range(0, len(data), 7):
+        capture.write(data[i : i + 7])
+    capture.close()
+    value = capture.getvalue()
+    assert value.startswith(data[:10])
+    assert value.endswith(data[-10:])
+    assert f"[... {len(data) - 20} characters omitted ...]" in value
+    assert capture.log_name
+    with open(get_artifact_path(capture.log_name)) as f:
+        assert f.read() == data
+
+
+@pytest.mark.django_db
+def test_truncated_output_download(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_echo_command/"
+    text = "x" * 99
+    content = admin_client.post(url, {"text": text, "times": "2000", "sleep": "0"}).content.decode()
+    assert "The output was truncated." in content
+    assert len(content) < 150_000
+    log_url = re.search(r'href="(/admin/managerie/-/artifacts/[^"]+)"', content).group(1)
+    resp = admin_client.get(log_url)
+    assert b"".join(resp.streaming_content).decode() == f"{text}\n" * 2000
+    assert admin_client.get("/admin/managerie/-/artifacts/../../etc/passwd").status_code == 404
+
+
+def test_artifacts_are_private(tmp_path, settings):
+    from django_managerie.artifacts import create_artifact
+
+    settings.MANAGERIE_RUNTIME_DIR = str(tmp_path / "runtime")
+    name, f = create_artifact("log", mode="w")
+    with f:
+        f.write("secret")
+    path = get_artifact_path(name)
+    assert path and path.startswith(settings.MANAGERIE_RUNTIME_DIR)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(settings.MANAGERIE_RUNTIME_DIR).st_mode) == 0o700
+    # A directory others can access (e.g. created by someone else first) is refused.
+    os.chmod(settings.MANAGERIE_RUNTIME_DIR, 0o777)
+    with pytest.raises(PermissionError):
+        create_artifact("log")
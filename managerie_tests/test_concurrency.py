@@ -0,0 +1,89 @@
+import json
+import stat
+import threading
+
+import pytest
+
+from django_managerie.concurrency import ConcurrencyLimitReached, concurrency_slots
+from managerie_test_app.urls import m
+
+URL = "/admin/managerie/managerie_test_app/mg_exclusive_command/"
+
+
+def get_command():
+    return m.registry.entries["managerie_test_app.mg_exclusive_command"].command
+
+
+@pytest.mark.django_db
+def test_command_concurrency_limit(admin_client):
+    with m.limit_concurrency(get_command()):
+        resp = admin_client.post(URL, {})
+        assert resp.status_code == 429
+        assert "Too many concurrent runs of managerie_test_app.mg_exclusive_command (max 1)" in resp.content.decode()
+        resp = admin_client.post(
+            "/admin/managerie/-/api/commands/managerie_test_app/mg_exclusive_command/execute/",
+            json.dumps({}),
+            content_type="application/json",
+        )
+        assert resp.status_code == 429
+    assert "Ran exclusively" in admin_client.post(URL, {}).content.decode()
+
+
+@pytest.mark.django_db
+def test_site_concurrency_limit(admin_client, monkeypatch):
+    monkeypatch.setattr(m, "max_concurrent_runs", 1)
+    with concurrency_slots([("site", 1, "commands")], namespace=m.get_concurrency_namespace()):
+        resp = admin_client.post("/admin/managerie/managerie_test_app/mg_test_command/", {"string_option": "x"})
+        assert resp.status_code == 429
+        assert "Too many concurrent runs of commands" in resp.content.decode()
+
+
+def test_concurrency_slots_wait():
+    limits = [("test.wait", 2, "waiting")]
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with concurrency_slots(limits):
+            acquired.set()
+            release.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        assert acquired.wait(5)
+        acquired.clear()
+    with pytest.raises(ConcurrencyLimitReached):
+        with concurrency_slots(limits, timeout=0.2):
+            pass
+    threading.Timer(0.2, release.set).start()
+    with concurrency_slots(limits, timeout=5):
+        pass
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrency_slots_namespaces():
+    limits = [("test.namespaced", 1, "namespaced")]
+    with concurrency_slots(limits, namespace="project-a"):
+        with concurrency_slots(limits, namespace="project-b"):
+            pass
+        with pytest.raises(ConcurrencyLimitReached):
+            with concurrency_slots(limits, namespace="project-a"):
+                pass
+
+
+def test_managerie_concurrency_namespace(monkeypatch):
+    assert m.get_concurrency_namespace() == "managerie_test_app.settings.admin"
+    monkeypatch.setattr(m, "concurrency_namespace", "custom")
+    assert m.get_concurrency_namespace() == "custom"
+
+
+def test_lock_files_are_private(tmp_path, settings):
+    settings.MANAGERIE_RUNTIME_DIR = str(tmp_path / "runtime")
+    with concurrency_slots([("test.private", 1, "private")], namespace="project"):
+        lock_dir = tmp_path / "runtime" / "locks" / "project"
+        (lock_file,) = lock_dir.iterdir()
+        assert stat.S_IMODE(lock_file.stat().st_mode) == 0o600
+        assert stat.S_IMODE(lock_dir.stat().st_mode) == 0o700
+        assert stat.S_IMODE(lock_dir.parent.stat().st_mode) == 0o700
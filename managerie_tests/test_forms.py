@@ -0,0 +1,73 @@
+import argparse
+import time
+
+import pytest
+from django.contrib import admin
+
+from django_managerie import Managerie
+from django_managerie.forms import ArgumentParserForm, PrecomputedChoices, get_command_schema, schema_cache
+
+
+def test_schema_cache(monkeypatch):
+    m = Managerie(admin.site)
+    command = m.registry.get("managerie_test_app.mg_stdin_command").command
+    command_class = command.get_command_class()
+    schema_cache.invalidate()
+    assert command_class not in schema_cache
+    m.warm_form_schemas()
+    assert command_class in schema_cache
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should not be called")
+
+    monkeypatch.setattr(ArgumentParserForm, "build_schema", fail)
+    schema = get_command_schema(command)
+    form = ArgumentParserForm(schema=schema, data={"operation": "reverse"})
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data["operation"] == "reverse"
+    # Fields are not shared between forms
+    assert ArgumentParserForm(schema=schema).fields["operation"] is not form.fields["operation"]
+
+    schema_cache.invalidate(command_class)
+    assert command_class not in schema_cache
+
+
+def test_form_requires_parser_or_schema():
+    with pytest.raises(ValueError):
+        ArgumentParserForm()
+
+
+def test_cached_schema_choices_are_not_rebuilt():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--choice", choices=[f"choice-{i}" for i in range(10000)], default="choice-0")
+
+    def build_form(schema=None):
+        return ArgumentParserForm(
+            schema=(schema or ArgumentParserForm.build_schema(parser)),
+            data={"choice": "choice-9"},
+        )
+
+    schema = ArgumentParserForm.build_schema(parser)
+    (spec,) = schema
+    choices = spec.field_kwargs["choices"]
+    assert isinstance(choices, PrecomputedChoices)
+    iterations = []
+
+    class CountingList(list):
+        def __iter__(self):
+            iterations.append(1)
+            return super().__iter__()
+
+    choices.choices = CountingList(choices.choices)
+    form = build_form(schema)
+    assert not iterations  # Building the field doesn't touch the choices...
+    assert form.is_valid(), form.errors  # ... but they're used for validation
+    assert form.cleaned_data["choice"] == "choice-9"
+
+    def measure(func):
+        start = time.perf_counter()
+        for _ in range(5):
+            func()
+        return time.perf_counter() - start
+
+    assert measure(lambda: build_form(schema).fields) * 10 < measure(lambda: build_form().fields)
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from django_managerie.history.models import CommandRun
+from django_managerie.history.recorder import recorder
+
+
+@pytest.mark.django_db
+def test_runs_are_recorded(admin_client, admin_user):
+    resp = admin_client.post(
+        "/admin/managerie/managerie_test_app/mg_echo_command/",
+        {"text": "history!", "times": "2", "sleep": "0"},
+    )
+    assert resp.status_code == 200
+    # The run is written once the request has finished.
+    run = CommandRun.objects.get(command="managerie_test_app.mg_echo_command")
+    assert run.user_id == admin_user.pk
+    assert run.status == "succeeded"
+    assert run.options["text"] == "history!"
+    assert "history!" in run.stdout
+    assert admin_client.get(f"/admin/managerie_history/commandrun/{run.pk}/change/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_prune_runs():
+    now = timezone.now()
+    for days in reversed(range(10)):
+        recorder.record(
+            CommandRun(command="x.y", started_at=now - timedelta(days=days), duration=0, status="succeeded"),
+        )
+    recorder.flush()
+    call_command("managerie_prune_runs", older_than_days=7.5, batch_size=3)
+    assert CommandRun.objects.count() == 8
+    call_command("managerie_prune_runs", keep=3, batch_size=2)
+    assert sorted((now - run.started_at).days for run in CommandRun.objects.all()) == [0, 1, 2]
+
+
+@pytest.mark.django_db
+def test_run_list_status_filter(admin_client):
+    now = timezone.now()
+    for status in ("succeeded", "failed", "exit: 3"):
+        recorder.record(CommandRun(command=f"x.{status[:4]}", started_at=now, duration=0, status=status))
+    recorder.flush()
+    url = "/admin/managerie_history/commandrun/"
+
+    def get_statuses(status):
+        return [run.status for run in admin_client.get(url, {"status": status}).context["cl"].result_list]
+
+    assert get_statuses("exited") == ["exit: 3"]
+    assert get_statuses("failed") == ["failed"]
+
+
+@pytest.mark.django_db
+def test_run_list_command_and_time_filters(admin_client):
+    now = timezone.now()
+    for command, hours_ago in [("managerie_test_app.mg_echo_command", 0), ("managerie_test_app.mg_test_command", 30)]:
+        recorder.record(
+            CommandRun(command=command, started_at=now - timedelta(hours=hours_ago), duration=0, status="succeeded"),
+        )
+    recorder.flush()
+    url = "/admin/managerie_history/commandrun/"
+
+    def get_commands(**params):
+        return [run.command for run in admin_client.get(url, params).context["cl"].result_list]
+
+    assert get_commands(started_within="day") == ["managerie_test_app.mg_echo_command"]
+    assert len(get_commands(started_within="week")) == 2
+    assert get_commands(command="managerie_test_app.mg_test_command") == ["managerie_test_app.mg_test_command"]
+    # The command choices come from the registry
+    assert "?command=managerie_test_app.mg_stdin_command" in admin_client.get(url).content.decode()
@@ -0,0 +1,125 @@
+import io
+from unittest.mock import Mock
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_background_job(admin_client, staff_client):
+    from managerie_test_app.urls import m
+
+    url = "/admin/managerie/managerie_test_app/mg_background_command/"
+    resp = admin_client.post(url, {"message": "hello, job"})
+    assert resp.status_code == 302
+    job_url = resp.url
+    job_id = job_url.rstrip("/").rsplit("/", 1)[-1]
+    m.jobs.shutdown()  # Wait for the job to finish
+    job = m.jobs.get(job_id)
+    assert job and job.is_finished
+    content = admin_client.get(job_url).content.decode()
+    assert "succeeded" in content
+    assert "Command executed successfully." in content
+    assert "hello, job" in content
+    # Other users can't see the job
+    assert staff_client.get(job_url).status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_database_job_store(admin_client, staff_client, monkeypatch, django_assert_num_queries):
+    from django_managerie.history.jobs import DatabaseJobStore
+    from managerie_test_app.urls import m
+
+    store = DatabaseJobStore(get_command=m._get_registered_command)
+    monkeypatch.setattr(m.jobs, "store", store)
+    resp = admin_client.post("/admin/managerie/managerie_test_app/mg_background_command/", {"message": "stored"})
+    job_id = resp.url.rstrip("/").rsplit("/", 1)[-1]
+    m.jobs.shutdown()
+    # Pretend another node is serving the following requests
+    m.jobs._jobs.pop(job_id)
+    with django_assert_num_queries(1):
+        job = store.load(job_id)
+    assert job and job.status == "succeeded" and job.result and job.result.stdout == ""
+    content = admin_client.get(resp.url).content.decode()
+    assert "Command executed successfully." in content
+    assert "stored" in content
+    api_url = f"/admin/managerie/-/api/jobs/{job_id}/"
+    data = admin_client.get(api_url).json()
+    assert data["status"] == "succeeded" and data["finished"]
+    assert "stdout" not in data
+    data = admin_client.get(api_url, {"stdout_offset": "2", "stderr_offset": "0"}).json()
+    assert data["stdout"] == {"data": "ored\n", "offset": 7}
+    assert data["stderr"] == {"data": "", "offset": 0}
+    assert staff_client.get(api_url).status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chunk_writer():
+    from django_managerie.history.jobs import ChunkWriter, DatabaseJobStore
+    from django_managerie.history.models import JobOutputChunk, JobRecord
+    from django_managerie.jobs import Job
+    from managerie_test_app.urls import m
+
+    store = DatabaseJobStore(get_command=m._get_registered_command)
+    store.job_submitted(Job(command=m._get_registered_command("managerie_test_app.mg_echo_command"), user_id=None))
+    job_id = JobRecord.objects.get().id
+    writer = ChunkWriter(job_id, "stdout", chunk_size=10, flush_interval=60, max_size=25)
+    writer.write("hello ")
+    assert not JobOutputChunk.objects.exists()
+    writer.write("world, ")
+    assert store.read_output(job_id, "stdout", 0) == ("hello world, ", 13)
+    writer.write("this is a long line")
+    writer.close()
+    assert JobOutputChunk.objects.count() == 2
+    assert store.read_output(job_id, "stdout", 8) == ("rld, this is a lo\n<output truncated>\n", 45)
+    assert store.read_output(job_id, "stdout", 45) == ("", 45)
+
+
+@pytest.mark.django_db
+def test_cancel_job(admin_client):
+    import time
+
+    from managerie_test_app.urls import m
+
+    resp = admin_client.post("/admin/managerie/managerie_test_app/mg_cancellable_command/", {"steps": "600"})
+    job_url = resp.url
+    job = m.jobs.get(job_url.rstrip("/").rsplit("/", 1)[-1])
+    assert job
+    while not (job.status == "running" and job.duration and job.duration > 0.2):
+        time.sleep(0.05)
+    assert 'name="cancel"' in admin_client.get(job_url).content.decode()
+    assert admin_client.post(job_url, {"cancel": "Cancel"}).status_code == 302
+    m.jobs.shutdown()
+    assert job.status == "cancelled"
+    content = admin_client.get(job_url).content.decode()
+    assert "The run was cancelled" in content
+    assert "step 0" in content
+    api_url = f"/admin/managerie/-/api/jobs/{job.id}/"
+    assert admin_client.delete(api_url).status_code == 409  # Already finished
+
+
+def test_full_job_queue_closes_stdin(monkeypatch):
+    from django_managerie import jobs
+    from django_managerie.jobs import Job, JobManager, JobQueueFull
+    from managerie_test_app.urls import m
+
+    command = m._get_registered_command("managerie_test_app.mg_echo_command")
+    request = Mock(user=Mock(pk=None))
+    manager = JobManager(max_pending=1)
+    manager._jobs["pending"] = Job(command=command, user_id=None)
+    detach_stdin = Mock(wraps=jobs.detach_stdin)
+    monkeypatch.setattr(jobs, "detach_stdin", detach_stdin)
+    with pytest.raises(JobQueueFull):
+        manager.submit(command, args=(), options={}, stdin_binary=io.BytesIO(b"x"), request=request)
+    assert not detach_stdin.called
+    # If the queue fills up while stdin is being detached, the detached stream is closed.
+    del manager._jobs["pending"]
+    detached = io.BytesIO(b"x")
+
+    def detach_and_fill_queue(stdin_binary):
+        manager._jobs["pending"] = Job(command=command, user_id=None)
+        return detached
+
+    detach_stdin.side_effect = detach_and_fill_queue
+    with pytest.raises(JobQueueFull):
+        manager.submit(command, args=(), options={}, stdin_binary=io.BytesIO(b"x"), request=request)
+    assert detached.closed
@@ -107,3 +107,64 @@ def test_outsider_no_access(client):
         url = f"/admin/managerie/managerie_test_app/{command}/"
         resp = client.get(url)
         assert resp.status_code == 302  # Redirect to login
+
+
+@pytest.mark.django_db
+def test_command_lookup_memoized(admin_client, monkeypatch):
+    from django_managerie.commands import ManagementCommand
+    from django_managerie.managerie import Managerie
+
+    calls = []
+    original_get_commands_for_app_label = Managerie.get_commands_for_app_label
+    original_get_command_instance = ManagementCommand.get_command_instance
+
+    def get_commands_for_app_label(self, *args, **kwargs):
+        calls.append("lookup")
+        return original_get_commands_for_app_label(self, *args, **kwargs)
+
+    def get_command_instance(self):
+        calls.append("instance")
+        return original_get_command_instance(self)
+
+    monkeypatch.setattr(Managerie, "get_commands_for_app_label", get_commands_for_app_label)
+    monkeypatch.setattr(ManagementCommand, "get_command_instance", get_command_instance)
+    url = "/admin/managerie/managerie_test_app/mg_test_command/"
+    content = admin_client.post(url, {"string_option": "hello"}).content.decode()
+    assert "Command executed successfully." in content
+    assert sorted(calls) == ["instance", "lookup"]
+
+
+@pytest.mark.django_db
+def test_mg_stdin_large_upload(admin_client):
+    # Being memory-mapped means the upload went straight to disk (it'd normally be kept in memory at this size)
+    url = "/admin/managerie/managerie_test_app/mg_stdin_lines_command/"
+    data = "".join(f"r\xe4iv\xe4 {i}\n" for i in range(10000)).encode("latin-1")
+    content = admin_client.post(url, {"_managerie_stdin_file": io.BytesIO(data)}).content.decode()
+    assert "lines=10000 first=r\xe4iv\xe4 0 mmapped=True" in content
+    content = admin_client.post(url, {"_managerie_stdin_content": "\xe5\n\xe4\n"}).content.decode()
+    assert "lines=2 first=\xe5 mmapped=False" in content
+
+
+@pytest.mark.django_db
+def test_mg_stdin_csrf(admin_user):
+    from django.test import Client
+
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(admin_user)
+    url = "/admin/managerie/managerie_test_app/mg_stdin_lines_command/"
+    assert client.post(url, {"_managerie_stdin_content": "x"}).status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)  # The async views access the database from other threads
+@pytest.mark.parametrize("admin_prefix", ["/admin/", "/async-admin/"])
+def test_mg_stdin_csrf_valid_token(admin_user, admin_prefix):
+    from django.test import Client
+
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(admin_user)
+    url = f"{admin_prefix}managerie/managerie_test_app/mg_stdin_lines_command/"
+    assert client.get(url).status_code == 200
+    token = client.cookies["csrftoken"].value
+    resp = client.post(url, {"_managerie_stdin_file": io.BytesIO(b"a\nb\n"), "csrfmiddlewaretoken": token})
+    assert resp.status_code == 200
+    assert "lines=2 first=a" in resp.content.decode()
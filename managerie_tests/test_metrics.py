@@ -0,0 +1,59 @@
+import pytest
+
+from django_managerie import metrics
+
+
+def test_prometheus_rendering():
+    registry = metrics.MetricsRegistry()
+    histogram = registry.histogram("h_seconds", "A histogram.", ["command"], buckets=(0.1, 1))
+    counter = registry.counter("c_total", "A counter.", ["command"])
+    seen = []
+    registry.add_hook(lambda metric, value, labels: seen.append((metric.name, value, labels)))
+    histogram.observe(0.05, command='a"b')
+    histogram.observe(0.5, command='a"b')
+    counter.inc(command="x")
+    assert registry.render() == (
+        "# HELP h_seconds A histogram.\n"
+        "# TYPE h_seconds histogram\n"
+        'h_seconds_bucket{command="a\\"b",le="0.1"} 1\n'
+        'h_seconds_bucket{command="a\\"b",le="1"} 2\n'
+        'h_seconds_bucket{command="a\\"b",le="+Inf"} 2\n'
+        'h_seconds_sum{command="a\\"b"} 0.55\n'
+        'h_seconds_count{command="a\\"b"} 2\n'
+        "# HELP c_total A counter.\n"
+        "# TYPE c_total counter\n"
+        'c_total{command="x"} 1\n'
+    )
+    assert seen[-1] == ("c_total", 1, {"command": "x"})
+    with pytest.raises(ValueError):
+        counter.inc(wrong="label")
+
+
+def test_failing_hooks_are_logged(caplog):
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter("c_total", "A counter.")
+    seen = []
+    registry.add_hook(lambda metric, value, labels: 1 / 0)
+    registry.add_hook(lambda metric, value, labels: seen.append(value))
+    counter.inc()
+    assert seen == [1]
+    assert registry.render().endswith("c_total 1\n")
+    assert "Metric hook" in caplog.text
+    assert "ZeroDivisionError" in caplog.text
+
+
+@pytest.mark.django_db
+def test_execution_metrics(admin_client, staff_client):
+    labels = {"command": "managerie_test_app.mg_test_command"}
+    runs = metrics.runs_total.get(**labels)
+    executions = metrics.execution_seconds.get_count(**labels)
+    url = "/admin/managerie/managerie_test_app/mg_test_command/"
+    admin_client.get(url)
+    assert "Command executed successfully." in admin_client.post(url, {"string_option": "x"}).content.decode()
+    assert metrics.runs_total.get(**labels) == runs + 1
+    assert metrics.execution_seconds.get_count(**labels) == executions + 1
+    assert metrics.form_build_seconds.get_count(**labels) >= 2
+    resp = admin_client.get("/admin/managerie/-/metrics/")
+    assert resp["Content-Type"].startswith("text/plain")
+    assert 'managerie_runs_total{command="managerie_test_app.mg_test_command"}' in resp.content.decode()
+    assert staff_client.get("/admin/managerie/-/metrics/").status_code == 403
@@ -0,0 +1,70 @@
+import marshal
+import re
+from unittest.mock import Mock
+
+import pytest
+
+from django_managerie.profiling import Profiler, ProfilerBusy
+
+
+@pytest.mark.django_db
+def test_profiled_run(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_echo_command/"
+    assert "Profile this run" in admin_client.get(url).content.decode()
+    content = admin_client.post(
+        url,
+        {"text": "profiled", "times": "3", "sleep": "0", "_managerie_profile": "cpu+memory"},
+    ).content.decode()
+    assert "Command executed successfully." in content
+    assert "profiled" in content
+    assert "Top functions by cumulative time" in content
+    assert "Top allocation sites" in content
+    prof_url = re.search(r'href="(/admin/managerie/-/artifacts/[0-9a-f]+\.prof)"', content).group(1)
+    stats = marshal.loads(b"".join(admin_client.get(prof_url).streaming_content))
+    assert any(func_name == "handle" for (_, _, func_name) in stats)
+
+
+@pytest.mark.django_db
+def test_profiling_is_superuser_only(staff_client):
+    url = "/admin/managerie/managerie_test_app/mg_unprivileged_command/"
+    resp = staff_client.get(url)
+    assert resp.status_code == 200
+    assert "Profile this run" not in resp.content.decode()
+
+
+@pytest.mark.django_db
+def test_profiled_run_bypasses_result_cache(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_cached_command/"
+    # A profiled run doesn't store its result in the cache...
+    profiled = admin_client.post(url, {"label": "profiled", "_managerie_profile": "cpu"}).content.decode()
+    assert "Top functions by cumulative time" in profiled
+    assert "This is a cached result" not in admin_client.post(url, {"label": "profiled"}).content.decode()
+    # ... nor is it served from the cache.
+    profiled = admin_client.post(url, {"label": "profiled", "_managerie_profile": "cpu"}).content.decode()
+    assert "This is a cached result" not in profiled
+    assert "Top functions by cumulative time" in profiled
+
+
+@pytest.mark.django_db
+def test_concurrent_profiling_is_refused(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_echo_command/"
+    data = {"text": "profiled", "times": "1", "sleep": "0", "_managerie_profile": "cpu"}
+    with Profiler():
+        resp = admin_client.post(url, data)
+    assert resp.status_code == 409
+    assert "Another run is being profiled" in resp.content.decode()
+    assert admin_client.post(url, data).status_code == 200
+
+
+def test_profiler_refuses_external_profiler(monkeypatch):
+    profiler = Profiler()
+    monkeypatch.setattr(
+        profiler._profile,
+        "enable",
+        Mock(side_effect=ValueError("Another profiling tool is already active")),
+    )
+    with pytest.raises(ProfilerBusy):
+        profiler.__enter__()
+    with Profiler() as other:  # The lock was released
+        pass
+    assert other.report
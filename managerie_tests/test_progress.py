@@ -0,0 +1,38 @@
+import pytest
+from django.core.management import BaseCommand
+
+from django_managerie.progress import Progress, ProgressStore, report_progress
+
+
+def test_progress_estimates():
+    progress = Progress(done=250, total=1000, message="rows", started_at=100, updated_at=110)
+    assert progress.fraction == 0.25
+    assert progress.rate == 25
+    assert progress.eta == 30
+    assert progress.to_json()["percent"] == 25
+    assert Progress(done=5, total=None, message="", started_at=100, updated_at=100).eta is None
+
+
+def test_progress_reporting_is_throttled():
+    store = ProgressStore(interval=60, key_prefix="test-progress:")
+    command = BaseCommand()
+    report_progress(command, 1, 10)  # Not running under Managerie; does nothing
+    command._managerie_progress = store.get_reporter("run")
+    for done in range(1, 10):
+        report_progress(command, done, 10, "items")
+    assert store.get("run").done == 1  # Only the first report within the interval was stored...
+    report_progress(command, 10, 10, "items")
+    assert store.get("run").done == 10  # ...and the final one
+
+
+@pytest.mark.django_db
+def test_job_progress(admin_client):
+    from managerie_test_app.urls import m
+
+    resp = admin_client.post("/admin/managerie/managerie_test_app/mg_progress_command/", {"rows": "5000"})
+    job_id = resp.url.rstrip("/").rsplit("/", 1)[-1]
+    m.jobs.shutdown()
+    progress = admin_client.get(f"/admin/managerie/-/api/jobs/{job_id}/").json()["progress"]
+    assert progress["done"] == progress["total"] == 5000
+    assert progress["percent"] == 100
+    assert progress["message"] == "rows"
@@ -0,0 +1,119 @@
+import os
+import uuid
+
+import pytest
+from django.apps import apps
+from django.contrib import admin
+
+from django_managerie import Managerie
+from django_managerie.commands import ManagementCommand
+
+
+@pytest.mark.django_db
+def test_registry_is_precomputed(admin_client, monkeypatch):
+    from managerie_test_app.urls import m as site_managerie
+
+    site_managerie.registry.entries  # The admin site's registry must be built too
+    m = Managerie(admin.site)
+    entry = m.registry.get("managerie_test_app.mg_disabled_command")
+    assert entry and not entry.enabled
+    assert entry.command_class is not None
+    assert m.registry.get("managerie_test_app.mg_test_command").enabled
+
+    def fail(self):
+        raise AssertionError("should not be called once the registry is built")
+
+    monkeypatch.setattr(ManagementCommand, "get_command_class", fail)
+    request = admin_client.get("/admin/").wsgi_request
+    commands = m.get_commands_for_app_label(request, "managerie_test_app")
+    assert "mg_test_command" in commands
+    assert "mg_disabled_command" not in commands
+
+
+def test_registry_rebuild():
+    class TogglingManagerie(Managerie):
+        enable_test_command = False
+
+        def is_command_enabled(self, command: ManagementCommand) -> bool:
+            if command.full_name == "managerie_test_app.mg_test_command":
+                return self.enable_test_command
+            return super().is_command_enabled(command)
+
+    m = TogglingManagerie(admin.site)
+    assert not m.registry.get("managerie_test_app.mg_test_command").enabled
+    m.enable_test_command = True
+    assert not m.registry.get("managerie_test_app.mg_test_command").enabled
+    m.rebuild_registry()
+    assert m.registry.get("managerie_test_app.mg_test_command").enabled
+
+
+def test_discovery_notices_new_commands(monkeypatch):
+    from django_managerie.commands import discovery
+
+    m = Managerie(admin.site)
+    m.registry.entries  # Build the registry
+    monkeypatch.setattr(discovery, "check_interval", 0)
+    commands_dir = os.path.join(apps.get_app_config("managerie_test_app").path, "management", "commands")
+    name = f"mg_runtime_{uuid.uuid4().hex[:8]}"
+    path = os.path.join(commands_dir, f"{name}.py")
+    old_commands = discovery.get_commands()
+    other_app_commands = {
+        app_config: commands
+        for (app_config, commands) in old_commands.items()
+        if app_config.label != "managerie_test_app"
+    }
+    try:
+        with open(path, "w") as f:
+            f.write("from django.core.management import BaseCommand\n\n\nclass Command(BaseCommand):\n    pass\n")
+        # Make sure the directory's mtime changes, even on filesystems with coarse timestamps
+        stat = os.stat(commands_dir)
+        os.utime(commands_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert m.registry.get(f"managerie_test_app.{name}")
+        new_commands = discovery.get_commands()
+        # Only the changed app was rescanned
+        for app_config, commands in other_app_commands.items():
+            assert new_commands[app_config] is commands
+    finally:
+        os.unlink(path)
+        discovery.invalidate()
+    assert not m.registry.get(f"managerie_test_app.{name}")
+
+
+def _get_names(commands):
+    return {app_config.label: list(app_commands) for (app_config, app_commands) in commands.items() if app_commands}
+
+
+@pytest.mark.django_db
+def test_command_list_caching(admin_client, admin_user, staff_client):
+    from managerie_test_app.urls import CustomManagerie
+
+    calls = []
+
+    class CachingManagerie(CustomManagerie):
+        command_cache_timeout = 60
+
+        def is_command_allowed(self, request, command):
+            calls.append(request.user.pk)
+            return super().is_command_allowed(request, command)
+
+    m = CachingManagerie(admin.site)
+    admin_request = admin_client.get("/admin/").wsgi_request
+    staff_request = staff_client.get("/admin/").wsgi_request
+    commands = m.get_commands(admin_request)
+    n_calls = len(calls)
+    assert n_calls
+    assert m.get_commands(admin_request) == commands
+    assert len(calls) == n_calls  # Cached
+    # Per-user
+    staff_commands = m.get_commands(staff_request)
+    assert len(calls) > n_calls
+    assert _get_names(staff_commands) == {"managerie_test_app": ["mg_unprivileged_command"]}
+    # Versioned
+    n_calls = len(calls)
+    m.command_cache_version += 1
+    assert m.get_commands(admin_request) == commands
+    assert len(calls) > n_calls
+    # Permission changes are reflected in the key
+    admin_user.is_superuser = False
+    admin_user.save()
+    assert _get_names(m.get_commands(admin_client.get("/admin/").wsgi_request)) == _get_names(staff_commands)
@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_result_caching(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_cached_command/"
+
+    def run(**data):
+        content = admin_client.post(url, {"label": "report", **data}).content.decode()
+        assert "Command executed successfully." in content
+        return content[content.index("report: ") :].split("</pre>")[0], "This is a cached result" in content
+
+    assert "Refresh cached result" in admin_client.get(url).content.decode()
+    output, cached = run()
+    assert not cached
+    assert run() == (output, True)
+    other_output, cached = run(_managerie_stdin_content="different input")
+    assert not cached and other_output != output
+    refreshed_output, cached = run(_managerie_refresh_cache="on")
+    assert not cached and refreshed_output != output
+    assert run() == (refreshed_output, True)
+
+
+def test_result_cache_size_limit():
+    from django_managerie.execution import ExecutionResult
+    from django_managerie.result_cache import ResultCache
+
+    cache = ResultCache(max_size=10)
+    assert not cache.set("k", ExecutionResult(stdout="x" * 11, stderr="", duration=0), timeout=60)
+    assert not cache.set("k", ExecutionResult(stdout="", stderr="", duration=0, error=ValueError()), timeout=60)
+    assert cache.set("k", ExecutionResult(stdout="x" * 10, stderr="", duration=0), timeout=60)
+    assert cache.get("k").cached_at
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from django_managerie.history.models import CommandRun
+from django_managerie.scheduler.models import ScheduledCommand
+from django_managerie.scheduler.runner import Scheduler, get_next_run_at
+from managerie_test_app.urls import m
+
+
+def test_next_run_at_skips_missed_runs():
+    now = timezone.now()
+    schedule = ScheduledCommand(interval=timedelta(minutes=10), next_run_at=now - timedelta(minutes=25))
+    assert get_next_run_at(schedule, now) == now + timedelta(minutes=5)
+    schedule.next_run_at = None
+    assert get_next_run_at(schedule, now) == now + timedelta(minutes=10)
+
+
+@pytest.mark.parametrize("interval", [timedelta(0), timedelta(seconds=-5)])
+def test_next_run_at_with_invalid_interval(interval):
+    now = timezone.now()
+    schedule = ScheduledCommand(interval=interval, next_run_at=now - timedelta(minutes=1))
+    assert get_next_run_at(schedule, now) > now
+    schedule.next_run_at = None
+    assert get_next_run_at(schedule, now) > now
+
+
+@pytest.mark.django_db(transaction=True)
+def test_scheduler_runs_due_commands():
+    schedule = ScheduledCommand.objects.create(
+        name="Test",
+        command="managerie_test_app.mg_echo_command",
+        options={"text": "scheduled"},
+        interval=timedelta(hours=1),
+    )
+    not_due = ScheduledCommand.objects.create(
+        name="Not due",
+        command="managerie_test_app.mg_echo_command",
+        options={"text": "x"},
+        interval=timedelta(hours=1),
+        next_run_at=timezone.now() + timedelta(minutes=5),
+    )
+    scheduler = Scheduler(m)
+    try:
+        now = timezone.now()
+        futures = scheduler.run_pending(now)
+        assert [future.result().status for future in futures] == ["succeeded"]
+        assert not scheduler.run_pending(now)  # Already claimed for this interval
+    finally:
+        scheduler.stop()
+    schedule.refresh_from_db()
+    assert schedule.last_status == "succeeded"
+    assert schedule.next_run_at == now + timedelta(hours=1)
+    run = CommandRun.objects.get()
+    assert run.command == "managerie_test_app.mg_echo_command"
+    assert run.options["text"] == "scheduled"
+    not_due.refresh_from_db()
+    assert not not_due.last_run_at
+
+
+@pytest.mark.django_db
+def test_scheduled_command_admin_validates_options(admin_client):
+    url = "/admin/managerie_scheduler/scheduledcommand/add/"
+    data = {
+        "name": "Test",
+        "command": "managerie_test_app.mg_echo_command",
+        "options": '{"times": "many"}',
+        "interval": "01:00:00",
+        "enabled": "on",
+    }
+    resp = admin_client.post(url, data)
+    assert resp.status_code == 200
+    assert "times" in resp.content.decode()
+    resp = admin_client.post(url, dict(data, options='{"text": "x"}'))
+    assert resp.status_code == 302
+    assert ScheduledCommand.objects.get().options == {"text": "x"}
+    resp = admin_client.post(url, dict(data, options='{"text": "x"}', interval="00:00:00"))
+    assert resp.status_code == 200
+    assert ScheduledCommand.objects.count() == 1
@@ -0,0 +1,66 @@
+from django.contrib import admin
+
+from django_managerie import Managerie
+from django_managerie.commands import ManagementCommand
+from django_managerie.static_discovery import read_command_metadata
+
+SOURCE = """
+from django.core.management import BaseCommand
+
+HELP = "not literal"
+
+class Command(BaseCommand):
+    help = "Does things"
+    disable_managerie: bool = True
+    managerie_accepts_stdin = True
+"""
+
+NON_LITERAL_SOURCE = """
+from django.conf import settings
+from django.core.management import BaseCommand
+
+class Command(BaseCommand):
+    help = "Does things"
+    disable_managerie = not settings.DEBUG
+"""
+
+
+def test_read_command_metadata():
+    assert read_command_metadata(SOURCE) == {
+        "help": "Does things",
+        "disable_managerie": True,
+        "managerie_accepts_stdin": True,
+    }
+    # Non-literal values can only be determined by importing the module
+    assert read_command_metadata(NON_LITERAL_SOURCE) is None
+    assert read_command_metadata(SOURCE.replace("= True\n", "= HELP\n")) is None
+    assert read_command_metadata("class Command(BaseCommand):\n    help = {[1]: 2}\n") is None
+    # The class is modified or rebound after its definition
+    assert read_command_metadata(SOURCE + "\nCommand.disable_managerie = False\n") is None
+    assert read_command_metadata(SOURCE + "\nsetattr(Command, 'disable_managerie', False)\n") is None
+    assert read_command_metadata(SOURCE + "\nCommand: type = object\n") is None
+    # Can't know what a custom base class defines
+    assert read_command_metadata("class Command(MyBaseCommand):\n    help = 'x'\n") is None
+    # Command imported from elsewhere
+    assert read_command_metadata("from foo import Command\n") is None
+    assert read_command_metadata(SOURCE + "\nCommand = object\n") is None
+    assert read_command_metadata("class Command(:") is None
+
+
+def test_static_discovery_does_not_import(monkeypatch):
+    original_get_command_class = ManagementCommand.get_command_class
+
+    def get_command_class(self):
+        assert self.app_config.label != "managerie_test_app", f"{self.full_name} should not be imported"
+        return original_get_command_class(self)
+
+    monkeypatch.setattr(ManagementCommand, "get_command_class", get_command_class)
+
+    class StaticManagerie(Managerie):
+        static_discovery = True
+
+    m = StaticManagerie(admin.site)
+    assert not m.registry.get("managerie_test_app.mg_disabled_command").enabled
+    assert m.registry.get("managerie_test_app.mg_test_command").enabled
+    stdin_command = m.registry.get("managerie_test_app.mg_stdin_command").command
+    assert m.get_command_attribute(stdin_command, "managerie_accepts_stdin") is True
@@ -0,0 +1,47 @@
+import io
+import sys
+import threading
+
+from django.contrib import admin
+
+from django_managerie import Managerie
+from django_managerie.execution import execute_command
+from django_managerie.stdio import capture_stdio
+
+
+def test_capture_stdio_is_context_local():
+    buf = io.StringIO()
+    other_thread_output = []
+
+    def other_thread():
+        other_thread_output.append(sys.stdout._get_target())
+
+    with capture_stdio(stdout=buf):
+        print("captured")
+        t = threading.Thread(target=other_thread)
+        t.start()
+        t.join()
+    print("not captured")
+    assert buf.getvalue() == "captured\n"
+    assert other_thread_output[0] is not buf
+
+
+def test_concurrent_executions_are_isolated():
+    command = Managerie(admin.site).registry.get("managerie_test_app.mg_echo_command").command
+    results = {}
+
+    def run(text):
+        results[text] = execute_command(
+            command,
+            args=(),
+            options={"text": text, "times": 20, "sleep": 0.001, "skip_checks": True},
+            stdin_binary=io.BytesIO(),
+        )
+
+    threads = [threading.Thread(target=run, args=(text,)) for text in ("foo", "bar", "baz")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for text, result in results.items():
+        assert result.stdout == f"{text}\n" * 20
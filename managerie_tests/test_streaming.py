@@ -0,0 +1,25 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_streaming_text(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_streaming_command/"
+    resp = admin_client.post(url, {"lines": "500"})
+    assert resp.streaming
+    assert resp["Content-Type"].startswith("text/plain")
+    content = b"".join(resp.streaming_content).decode()
+    assert "line 0\nline 1\n" in content
+    assert "line 499\n" in content
+    assert "to stderr" in content
+    assert "--- succeeded in" in content
+
+
+@pytest.mark.django_db
+def test_streaming_sse(admin_client):
+    url = "/admin/managerie/managerie_test_app/mg_streaming_command/"
+    resp = admin_client.post(url, {"lines": "1"}, HTTP_ACCEPT="text/event-stream")
+    assert resp["Content-Type"] == "text/event-stream"
+    content = b"".join(resp.streaming_content).decode()
+    assert "event: stdout\ndata: line 0\n" in content
+    assert "event: stderr\ndata: to stderr\n" in content
+    assert 'event: end\ndata: {"status": "succeeded"' in content
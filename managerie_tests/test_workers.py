@@ -0,0 +1,72 @@
+import io
+import threading
+import time
+
+import pytest
+from django.contrib import admin
+
+from django_managerie import Managerie
+from django_managerie.cancellation import CancelFlag
+from django_managerie.workers import WorkerPool, WorkerTimeout
+
+
+@pytest.fixture(scope="module")
+def worker_pool():
+    pool = WorkerPool(size=1, timeout=10)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def get_echo_command():
+    return Managerie(admin.site).registry.get("managerie_test_app.mg_echo_command").command
+
+
+def test_worker_pool_run(worker_pool):
+    options = {"text": "from a worker", "times": 2, "sleep": 0, "skip_checks": True}
+    for _ in range(2):
+        result = worker_pool.run(get_echo_command(), args=(), options=options, stdin_binary=io.BytesIO())
+        assert result.succeeded, result.error_tb
+        assert result.stdout == "from a worker\n" * 2
+
+
+def test_worker_pool_timeout(worker_pool):
+    options = {"text": "slow", "times": 1, "sleep": 30, "skip_checks": True}
+    result = worker_pool.run(get_echo_command(), args=(), options=options, stdin_binary=io.BytesIO(), timeout=0.5)
+    assert isinstance(result.error, WorkerTimeout)
+    # The killed worker is replaced
+    options = {"text": "fast", "times": 1, "sleep": 0, "skip_checks": True}
+    result = worker_pool.run(get_echo_command(), args=(), options=options, stdin_binary=io.BytesIO())
+    assert result.stdout == "fast\n"
+
+
+def _cancel_soon(flag, delay=0.5):
+    threading.Timer(delay, flag.set).start()
+
+
+def test_worker_pool_cancel(worker_pool):
+    command = Managerie(admin.site).registry.get("managerie_test_app.mg_cancellable_command").command
+    flag = CancelFlag()
+    _cancel_soon(flag)
+    options = {"steps": 600, "skip_checks": True}
+    result = worker_pool.run(command, args=(), options=options, stdin_binary=io.BytesIO(), cancel_flag=flag)
+    assert result.status == "cancelled"
+    assert "step 0\n" in result.stdout  # The partial output is kept
+
+
+def test_worker_pool_cancel_kill(worker_pool):
+    flag = CancelFlag()
+    _cancel_soon(flag)
+    options = {"text": "stubborn", "times": 1, "sleep": 30, "skip_checks": True}
+    t0 = time.monotonic()
+    result = worker_pool.run(
+        get_echo_command(),
+        args=(),
+        options=options,
+        stdin_binary=io.BytesIO(),
+        cancel_flag=flag,
+        cancel_grace_period=0.5,
+    )
+    assert result.status == "cancelled"
+    assert "the worker was killed" in str(result.error)
+    assert time.monotonic() - t0 < 10